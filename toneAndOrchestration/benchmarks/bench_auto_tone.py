@@ -0,0 +1,59 @@
+# benchmarks/bench_auto_tone.py
+"""
+Cost of tone_mode="auto" against a fixed mode: mean PART and END_GRAMMAR
+latency for utterances of growing length. The auto decision is made while
+PARTs stream in, so END_GRAMMAR should stay flat as utterances grow.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_auto_tone
+"""
+import random
+import time
+
+from mocks.mock_asr import VOCABULARY
+from orchestrator.latency_logger import LatencyLogger
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import FastMessage
+
+UTTERANCES = 200
+CHUNKS = [2, 8, 32]
+WORDS_PER_CHUNK = 8
+
+
+def _run(mode: str, chunks: int, seed: int = 3):
+    rng = random.Random(seed)
+    orch = PipelineOrchestrator(tone_mode=mode)
+    part_ns = end_ns = 0
+    for u in range(UTTERANCES):
+        utt_id = f"u{u}"
+        for i in range(chunks):
+            text = " ".join(rng.choices(VOCABULARY, k=WORDS_PER_CHUNK))
+            msg = FastMessage(id=utt_id, chunk_index=i, text=text, event="PART", is_final=False)
+            t0 = time.perf_counter_ns()
+            orch.process_message(msg)
+            part_ns += time.perf_counter_ns() - t0
+        end = FastMessage(id=utt_id, chunk_index=0, text="", event="END_GRAMMAR",
+                          is_final=True, end_of_speech_time=time.time())
+        t0 = time.perf_counter_ns()
+        orch.process_message(end)
+        end_ns += time.perf_counter_ns() - t0
+    return part_ns / (UTTERANCES * chunks) / 1e3, end_ns / UTTERANCES / 1e3, orch
+
+
+def main():
+    LatencyLogger.verbose = False
+    print(f"{'mode':>8} {'chunks':>7} {'PART us':>9} {'END us':>8}  decisions")
+    for chunks in CHUNKS:
+        for mode in ("formal", "auto"):
+            part_us, end_us, orch = _run(mode, chunks)
+            picked = ""
+            if orch.auto_tone is not None:
+                counts = {}
+                for _, d in orch.auto_tone.history:
+                    counts[d["mode"]] = counts.get(d["mode"], 0) + 1
+                picked = " ".join(f"{m}={n}" for m, n in sorted(counts.items()))
+            print(f"{mode:>8} {chunks:>7} {part_us:>9.1f} {end_us:>8.1f}  {picked}")
+
+
+if __name__ == "__main__":
+    main()
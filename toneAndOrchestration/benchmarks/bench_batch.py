@@ -0,0 +1,58 @@
+# benchmarks/bench_batch.py
+"""
+Batch API vs a loop over tone_transform / process_chunk.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_batch [n_texts]
+"""
+import os
+import random
+import sys
+import time
+
+from schemas.pipeline_message import PipelineMessage
+from tone_module.transformer import ToneTransformer
+
+PHRASES = [
+    "thanks, i'm gonna go now",
+    "I think this is really very good",
+    "we do not need any assistance",
+    "it is kind of important to be honest",
+    "yeah ok I'll be there",
+]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(0)
+    texts = [" ".join(rng.sample(PHRASES, 2)) for _ in range(n)]
+    tt = ToneTransformer()
+
+    print(f"{n} texts")
+    print(f"{'mode':>8} {'variant':>22} {'texts/s':>10}")
+    for mode in ["formal", "casual", "concise"]:
+        def chunk_loop():
+            t = ToneTransformer(mode=mode)
+            for i, text in enumerate(texts):
+                t.process_chunk(PipelineMessage(id=f"u{i}", chunk_index=0, text=text, event="PART"))
+
+        variants = [
+            ("process_chunk loop", chunk_loop),
+            ("tone_transform loop", lambda: [tt.tone_transform(t, mode=mode) for t in texts]),
+            ("transform_many", lambda: tt.transform_many(texts, mode=mode)),
+        ]
+        workers = os.cpu_count() or 1
+        if workers > 1:
+            variants.append((f"transform_many x{workers}", lambda: tt.transform_many(texts, mode=mode, workers=workers)))
+        for name, fn in variants:
+            print(f"{mode:>8} {name:>22} {n / _timed(fn):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_cache.py
+"""
+Tone transform cache on a Zipf-distributed synthetic transcript corpus:
+a few phrases ("Thank you.", "Yes.") make up most chunks, with a long tail
+of rare ones. Prints hit rate and per-chunk latency with and without cache.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_cache
+"""
+import random
+import time
+
+from tone_module.cache import TransformCache
+from tone_module.transformer import ToneTransformer
+
+CHUNKS = 200_000
+VOCABULARY = 20_000
+ZIPF_S = 1.1
+CACHE_SIZES = [256, 4096]
+HEAD = [
+    "Thank you.",
+    "Yes.",
+    "Can you help me.",
+    "i'm gonna check that",
+    "I think it is kind of really important",
+    "we do not need assistance",
+]
+WORDS = ["please", "thanks", "gonna", "really", "very", "maybe", "order", "call", "the", "now", "later", "help"]
+
+
+def zipf_corpus(rng: random.Random):
+    phrases = HEAD + [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8))) + f" {i}"
+        for i in range(VOCABULARY - len(HEAD))
+    ]
+    weights = [1 / (rank + 1) ** ZIPF_S for rank in range(len(phrases))]
+    return rng.choices(phrases, weights=weights, k=CHUNKS)
+
+
+def _run(tt: ToneTransformer, corpus) -> float:
+    start = time.perf_counter()
+    for text in corpus:
+        tt.transform_chunk(text)
+    return (time.perf_counter() - start) / len(corpus) * 1e6
+
+
+def main():
+    corpus = zipf_corpus(random.Random(11))
+    print(f"{'mode':>8} {'cache':>7} {'hit rate':>9} {'us/chunk':>9} {'speedup':>8}")
+    for mode in ["formal", "concise"]:
+        base = _run(ToneTransformer(mode=mode), corpus)
+        print(f"{mode:>8} {'off':>7} {'-':>9} {base:>9.2f} {'1.0x':>8}")
+        for size in CACHE_SIZES:
+            tt = ToneTransformer(mode=mode, cache=TransformCache(max_size=size))
+            us = _run(tt, corpus)
+            rate = tt.cache.stats()["hit_rate"]
+            print(f"{mode:>8} {size:>7} {rate:>8.1%} {us:>9.2f} {base / us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
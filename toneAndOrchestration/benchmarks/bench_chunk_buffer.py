@@ -0,0 +1,64 @@
+# benchmarks/bench_chunk_buffer.py
+"""
+Chunk assembly for long dictations (10k chunks, 5% arriving out of order):
+the old dict + sorted() join vs ChunkBuffer, both for one final assembly
+and for a running transcript requested after every chunk.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_chunk_buffer
+"""
+import random
+import time
+
+from tone_module.chunk_buffer import ChunkBuffer
+
+CHUNKS = 10_000
+RUNNING_EVERY = 1  # running transcript after every chunk
+
+
+def _arrival_order(rng):
+    order = list(range(CHUNKS))
+    for i in range(0, CHUNKS - 1):
+        if rng.random() < 0.05:
+            order[i], order[i + 1] = order[i + 1], order[i]
+    return order
+
+
+def _dict_sorted(order, texts, running):
+    chunks = {}
+    for i in order:
+        chunks[i] = texts[i]
+        if running:
+            " ".join(chunks[k] for k in sorted(chunks.keys())).strip()
+    return " ".join(chunks[k] for k in sorted(chunks.keys())).strip()
+
+
+def _buffer(order, texts, running):
+    buf = ChunkBuffer()
+    for i in order:
+        buf.add(i, texts[i])
+        if running:
+            buf.prefix_text()
+    return buf.joined().strip()
+
+
+def main():
+    rng = random.Random(3)
+    texts = [f"chunk number {i} of a long dictation" for i in range(CHUNKS)]
+    order = _arrival_order(rng)
+
+    print(f"{'workload':>10} {'dict+sort ms':>13} {'buffer ms':>10} {'speedup':>8}")
+    for running in (False, True):
+        start = time.perf_counter()
+        a = _dict_sorted(order, texts, running)
+        old_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        b = _buffer(order, texts, running)
+        new_ms = (time.perf_counter() - start) * 1000
+        assert a == b
+        label = "running" if running else "final"
+        print(f"{label:>10} {old_ms:>13.1f} {new_ms:>10.1f} {old_ms / new_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
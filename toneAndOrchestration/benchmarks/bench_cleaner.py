@@ -0,0 +1,89 @@
+# benchmarks/bench_cleaner.py
+"""
+Cleaner stage throughput on long interleaved sessions: the per-chunk mock
+(mocks.mock_cleaner.clean_stream, as before and with its regexes compiled
+once) vs cleaner_module.StreamingCleaner, which also removes repetitions
+and fillers across chunk joins. Also counts utterances whose cleaned text
+still differs from cleaning the whole utterance at once, and the largest
+per-utterance tail the streaming cleaner held.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_cleaner [--utterances 2000]
+"""
+import argparse
+import re
+import time
+from typing import Dict, Iterable, Iterator, List
+
+from cleaner_module.streaming_cleaner import StreamingCleaner
+from mocks import mock_cleaner
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from schemas.pipeline_message import AnyMessage, FastMessage
+
+# cross-boundary disfluencies are what this is about: make them common
+VOCABULARY = ("I", "I", "you", "you", "know", "um", "uh", "like", "really", "really", "the", "order",
+              "call", "later", "we", "need", "help", "thanks", "to", "go")
+
+
+def legacy_clean_stream(messages: Iterable[AnyMessage]) -> Iterator[AnyMessage]:
+    """mock_cleaner.clean_stream with its regexes built per message, as before."""
+    for msg in messages:
+        if msg.event == "PART":
+            pattern = re.compile(r"\b(" + "|".join(re.escape(w) for w in mock_cleaner.FILLERS) + r")\b",
+                                 flags=re.IGNORECASE)
+            t = pattern.sub("", msg.text).replace("  ", " ").strip()
+            t = re.sub(r"\b(\w+)\s+\1\b", r"\1", t, flags=re.IGNORECASE)
+            yield type(msg)(id=msg.id, chunk_index=msg.chunk_index, text=t.strip(), event="PART")
+        elif msg.event == "END_ASR":
+            yield type(msg)(id=msg.id, chunk_index=-1, text="", event="END_CLEAN", is_final=True)
+
+
+def _joined(messages: Iterable[AnyMessage]) -> Dict[str, str]:
+    parts: Dict[str, List[str]] = {}
+    for m in messages:
+        if m.event == "PART" and m.text:
+            parts.setdefault(m.id, []).append(m.text)
+    return {k: " ".join(v) for k, v in parts.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    config = WorkloadConfig(utterances=args.utterances, chunks_per_utterance=(10, 40), words_per_chunk=(2, 8),
+                            vocabulary=VOCABULARY, interleave=True, seed=21)
+    msgs = synthetic_asr_stream(config, FastMessage)
+    parts = sum(m.event == "PART" for m in msgs)
+    reference = StreamingCleaner()
+    expected = {k: reference.clean_text(v) for k, v in _joined(msgs).items()}
+
+    stages = [
+        ("mock (per message)", legacy_clean_stream),
+        ("mock (compiled)", mock_cleaner.clean_stream),
+        ("streaming", StreamingCleaner().stream),
+    ]
+    print(f"{len(msgs)} messages, {parts} chunks, {args.utterances} interleaved utterances")
+    print(f"{'cleaner':>20} {'ms':>8} {'msgs/s':>10} {'unclean utts':>13}")
+    for name, stage in stages:
+        start = time.perf_counter()
+        out = list(stage(msgs))
+        ms = (time.perf_counter() - start) * 1000
+        got = _joined(out)
+        unclean = sum(got.get(k, "") != v for k, v in expected.items())
+        print(f"{name:>20} {ms:>8.1f} {len(msgs) / ms * 1000:>10.0f} {unclean:>13}")
+
+    # untimed pass: how much state the streaming cleaner carries
+    streaming = StreamingCleaner()
+    live = held = 0
+    for m in msgs:
+        streaming.process(m)
+        live = max(live, len(streaming.tails))
+        tail = streaming.tails.get(m.id)
+        if tail is not None:
+            held = max(held, len(tail.held))
+    print(f"streaming tails: {live} utterances live at most, {held} held words at most")
+
+
+if __name__ == "__main__":
+    main()
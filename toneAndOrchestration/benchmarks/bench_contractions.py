@@ -0,0 +1,61 @@
+# benchmarks/bench_contractions.py
+"""
+Contraction expansion per chunk: contractions.fix (the library formal mode
+used to call) vs the compiled ContractionExpander, with and without the
+library fallback, on short streaming chunks and on longer utterances.
+Without the contractions package only the compiled engine is timed.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_contractions
+"""
+import random
+import time
+from typing import Callable, List
+
+from mocks.mock_asr import VOCABULARY
+from tone_module.rule_engine import ContractionExpander
+from tone_module.tone_rules import CONTRACTIONS
+
+N_TEXTS = 5000
+LENGTHS = [(2, 6), (8, 16), (40, 60)]  # words per text (min, max)
+
+
+def _texts(lo: int, hi: int, rng: random.Random) -> List[str]:
+    words = list(VOCABULARY) + list(CONTRACTIONS)[:40]
+    return [" ".join(rng.choices(words, k=rng.randint(lo, hi))) for _ in range(N_TEXTS)]
+
+
+def _per_call_us(fn: Callable[[str], str], texts: List[str]) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+
+def main():
+    rng = random.Random(11)
+    start = time.perf_counter()
+    compiled = ContractionExpander()
+    build_ms = (time.perf_counter() - start) * 1000
+    try:
+        import contractions
+    except ImportError:
+        contractions = None
+    fallback = ContractionExpander(fallback=True) if contractions is not None else None
+    print(f"compiled table: {len(compiled)} keys, built in {build_ms:.1f} ms")
+
+    print(f"{'words':>8} {'library us':>11} {'compiled us':>12} {'+fallback us':>13} {'speedup':>8}")
+    for lo, hi in LENGTHS:
+        texts = _texts(lo, hi, rng)
+        compiled_us = _per_call_us(compiled.sub, texts)
+        if contractions is None:
+            print(f"{f'{lo}-{hi}':>8} {'-':>11} {compiled_us:>12.2f} {'-':>13} {'-':>8}")
+            continue
+        library_us = _per_call_us(contractions.fix, texts)
+        fallback_us = _per_call_us(fallback.sub, texts)
+        print(f"{f'{lo}-{hi}':>8} {library_us:>11.2f} {compiled_us:>12.2f} {fallback_us:>13.2f} "
+              f"{library_us / compiled_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
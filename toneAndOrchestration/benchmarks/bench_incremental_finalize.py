@@ -0,0 +1,57 @@
+# benchmarks/bench_incremental_finalize.py
+"""
+END_GRAMMAR cost with and without incremental finalize, as utterances grow.
+"full" re-transforms the joined utterance; "incr" is ToneAssembly.result()
+after the chunks were folded in during their PARTs.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_incremental_finalize
+"""
+import random
+import time
+
+from tone_module.transformer import ToneTransformer
+
+CHUNK_COUNTS = [10, 100, 1000]
+REPEATS = 20
+PHRASES = [
+    "thanks i'm gonna join later",
+    "it is kind of really important",
+    "we do not need assistance",
+    "thank you for coming",
+    "i think this is very good",
+]
+
+
+def main():
+    rng = random.Random(7)
+    print(f"{'mode':>8} {'chunks':>7} {'full ms':>9} {'incr ms':>9} {'speedup':>8}")
+    for mode in ["formal", "casual", "concise"]:
+        t = ToneTransformer(mode=mode)
+        for n in CHUNK_COUNTS:
+            chunks = [rng.choice(PHRASES) for _ in range(n)]
+            tones = [t.transform_chunk(c) for c in chunks]  # done during PARTs
+
+            start = time.perf_counter()
+            for _ in range(REPEATS):
+                full = t._tone_transform(" ".join(chunks))
+            full_ms = (time.perf_counter() - start) / REPEATS * 1000
+
+            # chunks are folded into the assembly as PARTs arrive; only
+            # result() runs at END_GRAMMAR
+            incr_ms = 0.0
+            for _ in range(REPEATS):
+                assembly = t.start_assembly()
+                for i, tone in enumerate(tones):
+                    assembly.add(i, tone)
+                start = time.perf_counter()
+                incr = assembly.result()
+                incr_ms += time.perf_counter() - start
+            incr_ms = incr_ms / REPEATS * 1000
+
+            assert full == incr
+            print(f"{mode:>8} {n:>7} {full_ms:>9.3f} {incr_ms:>9.3f} {full_ms / incr_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
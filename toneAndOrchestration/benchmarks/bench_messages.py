@@ -0,0 +1,46 @@
+# benchmarks/bench_messages.py
+"""
+Construction cost of PipelineMessage (pydantic, validating) vs FastMessage
+(slotted dataclass): messages built per second and bytes held per message.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_messages
+"""
+import time
+import tracemalloc
+
+from schemas.pipeline_message import FastMessage, PipelineMessage
+
+N = 100_000
+
+
+def _build(cls, n):
+    return [
+        cls(id="utt_42", chunk_index=i, text="thank you for coming", event="PART")
+        for i in range(n)
+    ]
+
+
+def _rate(cls) -> float:
+    start = time.perf_counter()
+    _build(cls, N)
+    return N / (time.perf_counter() - start)
+
+
+def _bytes_per_message(cls) -> float:
+    tracemalloc.start()
+    msgs = _build(cls, N)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del msgs
+    return size / N
+
+
+def main():
+    print(f"{'type':>16} {'msgs/s':>12} {'bytes/msg':>10}")
+    for cls in [PipelineMessage, FastMessage]:
+        print(f"{cls.__name__:>16} {_rate(cls):>12,.0f} {_bytes_per_message(cls):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
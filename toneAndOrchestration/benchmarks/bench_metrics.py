@@ -0,0 +1,59 @@
+# benchmarks/bench_metrics.py
+"""
+Cost of latency instrumentation on the orchestrator hot path: messages/s
+with metrics off (None), with LatencyMetrics histograms, and with the old
+print-per-utterance LatencyLogger (output sent to /dev/null).
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_metrics
+"""
+import contextlib
+import os
+import time
+
+from orchestrator.latency_logger import LatencyLogger, LatencyMetrics
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import FastMessage
+
+UTTERANCES = 20_000
+CHUNKS = ["thanks i'm gonna", "join the call later", "it is really important"]
+
+
+def _messages():
+    eos = time.time()
+    for u in range(UTTERANCES):
+        for i, text in enumerate(CHUNKS):
+            yield FastMessage(f"utt_{u}", i, text, "PART")
+        yield FastMessage(f"utt_{u}", -1, "", "END_GRAMMAR", True, eos)
+
+
+def _run(metrics=None) -> float:
+    orch = PipelineOrchestrator(tone_mode="formal", metrics=metrics)
+    msgs = list(_messages())
+    start = time.perf_counter()
+    for msg in msgs:
+        orch.process_message(msg)
+    return len(msgs) / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'instrumentation':>18} {'msg/s':>10}")
+    print(f"{'off':>18} {_run():>10.0f}")
+    metrics = LatencyMetrics()
+    print(f"{'histograms':>18} {_run(metrics):>10.0f}")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        LatencyLogger.verbose = True
+        try:
+            rate = _run()
+        finally:
+            LatencyLogger.verbose = False
+    print(f"{'print per utt':>18} {rate:>10.0f}")
+
+    print()
+    for stage, snap in metrics.snapshot().items():
+        print(f"{stage:>18} n={snap['count']:<7} p50={snap['p50_ms']:.4f} ms "
+              f"p95={snap['p95_ms']:.4f} ms p99={snap['p99_ms']:.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/bench_overload.py
+"""
+Load test: finalize latency when grammar messages arrive faster than the
+orchestrator can process them. Capacity (messages/s, FIFO with all
+messages already queued) is measured first; then messages arrive
+open-loop at 1x, 2x and 3x capacity (END_GRAMMAR stamped with its arrival
+time as end_of_speech_time), processed either in arrival order (FIFO,
+plain PipelineOrchestrator) or through orchestrator.scheduler.OverloadScheduler.
+
+Reports END_GRAMMAR arrival -> END_TONE latency, previews delivered,
+previews shed and deadline misses (finals later than --deadline). Shedding
+every preview leaves the final transforms, so the scheduler can only keep
+latency bounded up to the "finals only" rate printed first; past it finals
+queue too (earliest deadline first) and misses are counted.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_overload [--seconds 2] [--loads 1,2,3]
+"""
+import argparse
+import dataclasses
+import time
+from collections import deque
+from typing import List
+
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from mocks.mock_cleaner import mock_cleaner_stage
+from mocks.mock_grammar import mock_grammar_stage
+from orchestrator.latency_logger import LatencyHistogram
+from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.scheduler import OverloadScheduler
+from schemas.pipeline_message import AnyMessage, FastMessage
+
+MODE = "formal"
+LIVE_UTTERANCES = 50
+
+
+def _messages(utterances: int) -> List[AnyMessage]:
+    """Grammar messages of about LIVE_UTTERANCES interleaved sessions at a time."""
+    out: List[AnyMessage] = []
+    for block in range(0, utterances, LIVE_UTTERANCES):
+        config = WorkloadConfig(utterances=min(LIVE_UTTERANCES, utterances - block), chunks_per_utterance=(2, 8),
+                                words_per_chunk=(3, 12), seed=block)
+        asr = synthetic_asr_stream(config, FastMessage)
+        out += (dataclasses.replace(m, id=f"{block}_{m.id}")
+                for m in mock_grammar_stage(mock_cleaner_stage(asr)))
+    return out
+
+
+class _Fifo:
+    """Arrival order, every preview computed."""
+
+    def __init__(self):
+        self.orchestrator = PipelineOrchestrator(tone_mode=MODE)
+        self.queue = deque()
+        self.shed = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self.queue)
+
+    def submit(self, msg):
+        self.queue.append(msg)
+
+    def step(self):
+        out = self.orchestrator.process_message(self.queue.popleft())
+        return [] if out is None else [out]
+
+
+def _throughput(msgs: List[AnyMessage], server) -> float:
+    """Messages/s through server when everything has already arrived."""
+    start = time.perf_counter()
+    _simulate(msgs, float("inf"), server, float("inf"))
+    return len(msgs) / (time.perf_counter() - start)
+
+
+def _simulate(msgs: List[AnyMessage], rate: float, server, deadline: float):
+    latency = LatencyHistogram()
+    previews = misses = 0
+    n = len(msgs)
+    start = time.time()
+    i = 0
+    while i < n or server.pending:
+        now = time.time()
+        while i < n and start + i / rate <= now:
+            msg = msgs[i]
+            if msg.event == "END_GRAMMAR":
+                msg = dataclasses.replace(msg, end_of_speech_time=start + i / rate)
+            server.submit(msg)
+            i += 1
+        if not server.pending:
+            continue  # idle until the next arrival
+        for out in server.step():
+            if out.event == "END_TONE":
+                late = time.time() - out.end_of_speech_time
+                latency.record(int(late * 1e9))
+                misses += late > deadline
+            else:
+                previews += 1
+    return latency.snapshot(), previews, misses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=2.0, help="length of the offered load")
+    parser.add_argument("--loads", default="1,2,3", help="offered load as multiples of capacity")
+    parser.add_argument("--stale-after", type=float, default=0.05)
+    parser.add_argument("--deadline", type=float, default=0.2, help="final deadline after end of speech (s)")
+    args = parser.parse_args(argv)
+
+    sample = _messages(2000)
+    capacity = _throughput(sample, _Fifo())
+    # every preview shed: only finals cost tone work
+    ceiling = _throughput(sample, OverloadScheduler(PipelineOrchestrator(tone_mode=MODE), stale_after=-1.0))
+    print(f"capacity ~{capacity:.0f} msgs/s ({MODE}); finals only ~{ceiling:.0f} msgs/s "
+          f"({ceiling / capacity:.1f}x, the most any preview shedding can sustain)")
+    print(f"deadline {args.deadline * 1000:.0f} ms, stale after {args.stale_after * 1000:.0f} ms")
+    print(f"{'load':>5} {'policy':>10} {'finals':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'previews':>9} {'shed':>7} {'missed':>7}")
+    for load in (float(x) for x in args.loads.split(",")):
+        rate = load * capacity
+        msgs = _messages(max(1, int(rate * args.seconds / 6)))  # ~6 messages per utterance
+        for name, server in [
+            ("fifo", _Fifo()),
+            ("scheduler", OverloadScheduler(PipelineOrchestrator(tone_mode=MODE), stale_after=args.stale_after,
+                                            final_deadline=args.deadline)),
+        ]:
+            snap, previews, misses = _simulate(msgs, rate, server, args.deadline)
+            print(f"{load:>5.1f} {name:>10} {snap['count']:>7} {snap['p50_ms']:>8.1f} {snap['p99_ms']:>8.1f} "
+                  f"{snap['max_ms']:>8.1f} {previews:>9} {server.shed:>7} {misses:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_previews.py
+"""
+Downstream preview volume: per-chunk PREVIEW_TONE vs stable-prefix deltas,
+with and without a coalescing window. The ASR stream has bursts (chunks
+5-60 ms apart), 10% of chunks swapped with their neighbour, 10% resent
+unchanged and 5% revised.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_previews
+"""
+import random
+
+from mocks.mock_asr import VOCABULARY
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import FastMessage
+
+UTTERANCES = 500
+WINDOWS = [0.0, 0.05, 0.1]
+
+
+class SimClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _workload(rng):
+    """(arrival time, message) pairs, utterance after utterance."""
+    events = []
+    t = 0.0
+    for u in range(UTTERANCES):
+        texts = [" ".join(rng.choices(VOCABULARY, k=rng.randint(3, 8))) for _ in range(rng.randint(4, 12))]
+        order = list(range(len(texts)))
+        for i in range(len(order) - 1):
+            if rng.random() < 0.1:
+                order[i], order[i + 1] = order[i + 1], order[i]
+        sent = []
+        for i in order:
+            sent.append((i, texts[i]))
+            r = rng.random()
+            if r < 0.1:
+                sent.append((i, texts[i]))
+            elif r < 0.15:
+                sent.append((i, texts[i] + " please"))
+        for i, text in sent:
+            t += rng.uniform(0.005, 0.06)
+            events.append((t, FastMessage(f"utt_{u}", i, text, "PART")))
+        t += 0.5
+        events.append((t, FastMessage(f"utt_{u}", -1, "", "END_GRAMMAR", True, None)))
+    return events
+
+
+def _run(events, stable, window):
+    clock = SimClock()
+    orch = PipelineOrchestrator(tone_mode="formal", stable_previews=stable, preview_window=window, clock=clock)
+    count = chars = 0
+    for t, msg in events:
+        clock.now = t
+        outs = orch.flush_previews(FastMessage) if stable else []
+        out = orch.process_message(msg)
+        if out is not None:
+            outs.append(out)
+        for out in outs:
+            if out.event != "END_TONE":
+                count += 1
+                chars += len(out.text)
+    return count, chars
+
+
+def main():
+    events = _workload(random.Random(4))
+    parts = sum(1 for _, m in events if m.event == "PART")
+    print(f"{parts} PARTs in {UTTERANCES} utterances\n")
+    print(f"{'previews':>22} {'messages':>9} {'text chars':>11}")
+    base, base_chars = _run(events, stable=False, window=0.0)
+    print(f"{'per chunk':>22} {base:>9} {base_chars:>11}")
+    for window in WINDOWS:
+        count, chars = _run(events, stable=True, window=window)
+        label = f"stable, {window * 1000:.0f} ms window"
+        print(f"{label:>22} {count:>9} {chars:>11}  ({count / base:.0%} of messages)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_rule_engine.py
+"""
+Microbenchmark: per-rule re.sub loop (old _tone_transform) vs the compiled
+single-pass PhraseMatcher, as the rule table grows.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_rule_engine
+"""
+import random
+import re
+import time
+from typing import Dict, List
+
+from tone_module.rule_engine import PhraseMatcher
+from tone_module.tone_rules import FORMAL_EXPANSIONS
+
+TABLE_SIZES = [len(FORMAL_EXPANSIONS), 100, 1000, 5000]
+N_TEXTS = 200
+
+
+def _synthetic_table(size: int, rng: random.Random) -> Dict[str, str]:
+    table = dict(FORMAL_EXPANSIONS)
+    while len(table) < size:
+        n_words = rng.choice([1, 1, 2, 3])
+        key = " ".join(f"w{rng.randrange(size * 4)}" for _ in range(n_words))
+        table[key] = key.upper()
+    return table
+
+
+def _synthetic_texts(table: Dict[str, str], rng: random.Random) -> List[str]:
+    keys = list(table)
+    texts = []
+    for _ in range(N_TEXTS):
+        words = []
+        for _ in range(12):
+            words.append(rng.choice(keys) if rng.random() < 0.3 else "filler")
+        texts.append(" ".join(words))
+    return texts
+
+
+def legacy_sub(text: str, table: Dict[str, str]) -> str:
+    for k, v in table.items():
+        text = re.sub(rf"\b{re.escape(k)}\b", v, text, flags=re.IGNORECASE)
+    return text
+
+
+def _time_per_call(fn, texts: List[str]) -> float:
+    start = time.perf_counter()
+    for t in texts:
+        fn(t)
+    return (time.perf_counter() - start) / len(texts) * 1e6  # us per call
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'rules':>6} {'compile ms':>11} {'legacy us':>11} {'compiled us':>12} {'speedup':>8}")
+    for size in TABLE_SIZES:
+        table = _synthetic_table(size, rng)
+        texts = _synthetic_texts(table, rng)
+
+        t0 = time.perf_counter()
+        matcher = PhraseMatcher(table)
+        compile_ms = (time.perf_counter() - t0) * 1000
+
+        # legacy is slow for big tables: sample fewer texts
+        legacy_texts = texts if size <= 1000 else texts[:20]
+        legacy_us = _time_per_call(lambda t: legacy_sub(t, table), legacy_texts)
+        compiled_us = _time_per_call(matcher.sub, texts)
+        print(
+            f"{size:>6} {compile_ms:>11.2f} {legacy_us:>11.1f} "
+            f"{compiled_us:>12.1f} {legacy_us / compiled_us:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_rule_packs.py
+"""
+Rule packs with 10k+ phrases: cold load (parse + compile + cache write),
+warm load (pack read from the JSON disk cache: no trie build, the regex
+sources still go through re.compile), the hot swap into a
+transformer, and per-chunk matching cost against the built-in tables.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_rule_packs
+"""
+import json
+import os
+import random
+import re
+import tempfile
+import time
+
+from mocks.mock_asr import VOCABULARY
+from tone_module.rule_packs import load_rule_pack
+from tone_module.transformer import ToneTransformer
+
+SIZES = [10_000, 25_000]
+CHUNKS = 5000
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _pack(size: int, rng: random.Random) -> dict:
+    words = ["".join(rng.choices(ALPHABET, k=rng.randint(3, 9))) for _ in range(size // 3)]
+    words += VOCABULARY  # so some phrases actually occur in the chunks
+    table = {}
+    while len(table) < size:
+        table[" ".join(rng.choices(words, k=rng.randint(1, 3)))] = rng.choice(words)
+    return {"casual_simplifications": table, "hedges": list(table)[: size // 10]}
+
+
+def _per_chunk_us(tt: ToneTransformer, chunks, mode: str) -> float:
+    start = time.perf_counter()
+    for text in chunks:
+        tt._tone_transform(text, mode)
+    return (time.perf_counter() - start) / len(chunks) * 1e6
+
+
+def main():
+    rng = random.Random(4)
+    chunks = [" ".join(rng.choices(VOCABULARY, k=rng.randint(4, 14))) for _ in range(CHUNKS)]
+    builtin = ToneTransformer(mode="casual")
+    print(f"{'phrases':>8} {'cold ms':>9} {'warm ms':>9} {'swap ms':>8} {'cache KB':>9} "
+          f"{'casual us':>10} {'concise us':>11}")
+    print(f"{'builtin':>8} {'-':>9} {'-':>9} {'-':>8} {'-':>9} "
+          f"{_per_chunk_us(builtin, chunks, 'casual'):>10.2f} {_per_chunk_us(builtin, chunks, 'concise'):>11.2f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = os.path.join(tmp, f"pack_{size}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(_pack(size, rng), f)
+
+            start = time.perf_counter()
+            load_rule_pack(path)
+            cold_ms = (time.perf_counter() - start) * 1000
+            re.purge()  # warm = a fresh process: re.compile's own cache is empty
+            start = time.perf_counter()
+            rules = load_rule_pack(path)
+            warm_ms = (time.perf_counter() - start) * 1000
+            cache_dir = os.path.join(tmp, "__rulecache__")
+            cache_kb = sum(os.path.getsize(os.path.join(cache_dir, n)) for n in os.listdir(cache_dir)) / 1024
+
+            tt = ToneTransformer(mode="casual")
+            start = time.perf_counter()
+            tt.rules = rules
+            swap_ms = (time.perf_counter() - start) * 1000
+            print(f"{size:>8} {cold_ms:>9.0f} {warm_ms:>9.1f} {swap_ms:>8.3f} {cache_kb:>9.0f} "
+                  f"{_per_chunk_us(tt, chunks, 'casual'):>10.2f} {_per_chunk_us(tt, chunks, 'concise'):>11.2f}")
+            for name in os.listdir(cache_dir):
+                os.remove(os.path.join(cache_dir, name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# benchmarks/bench_sentiment.py
+"""
+Per-call sentiment cost for each installed backend: first call (lazy
+import + lexicon load), steady-state uncached calls, and cached repeats.
+Backends that are not installed are reported as such.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_sentiment
+"""
+import random
+import time
+
+from mocks.mock_asr import VOCABULARY
+from tone_module.sentiment import BACKENDS, SentimentAnalyzer
+
+CALLS = 5000
+
+
+def main():
+    rng = random.Random(9)
+    texts = [" ".join(rng.choices(VOCABULARY, k=rng.randint(4, 14))) + f" {i}" for i in range(CALLS)]
+    print(f"{'backend':>10} {'first call ms':>14} {'uncached us':>12} {'cached us':>10}")
+    for backend in BACKENDS:
+        sa = SentimentAnalyzer(backend=backend, cache_size=CALLS)
+        start = time.perf_counter()
+        try:
+            sa.scores("first call")
+        except ImportError:
+            print(f"{backend:>10} {'not installed':>14}")
+            continue
+        first_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        sa.scores_many(texts)
+        uncached_us = (time.perf_counter() - start) / CALLS * 1e6
+
+        start = time.perf_counter()
+        sa.scores_many(texts)
+        cached_us = (time.perf_counter() - start) / CALLS * 1e6
+        print(f"{backend:>10} {first_ms:>14.2f} {uncached_us:>12.2f} {cached_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_sharded.py
+"""
+Scaling benchmark for ShardedOrchestrator: 1 .. os.cpu_count() worker
+processes vs the single-process PipelineOrchestrator.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_sharded [n_utterances]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+from mocks.mock_asr import mock_asr_stream
+from mocks.mock_cleaner import mock_cleaner_stage
+from mocks.mock_grammar import mock_grammar_stage
+from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.sharded_orchestrator import ShardedOrchestrator
+
+TONE_MODE = "formal"
+
+
+def _workload(n_utts: int):
+    per_utt = []
+    for i in range(n_utts):
+        asr_msgs = mock_asr_stream(f"utt_{i}")
+        for m in asr_msgs:
+            if m.event == "END_ASR":
+                m.end_of_speech_time = time.time()
+        per_utt.append(mock_grammar_stage(mock_cleaner_stage(asr_msgs)))
+    return [m for group in zip(*per_utt) for m in group]
+
+
+def main():
+    n_utts = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    messages = _workload(n_utts)
+    cpus = os.cpu_count() or 1
+
+    # LatencyLogger prints one line per utterance; keep it off the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        orch = PipelineOrchestrator(tone_mode=TONE_MODE)
+        start = time.perf_counter()
+        for m in messages:
+            orch.process_message(m)
+        baseline = time.perf_counter() - start
+
+        rows = []
+        for workers in sorted({1, 2, 4, 8, cpus} - {w for w in (2, 4, 8) if w > cpus}):
+            sharded = ShardedOrchestrator(tone_mode=TONE_MODE, num_workers=workers)
+            start = time.perf_counter()
+            n_out = sum(1 for _ in sharded.process_stream(messages))
+            rows.append((workers, time.perf_counter() - start, n_out))
+
+    print(f"{len(messages)} messages, {n_utts} utterances, {cpus} CPUs")
+    print(f"{'workers':>8} {'msgs/s':>10} {'vs 1 proc':>10}")
+    print(f"{'inproc':>8} {len(messages) / baseline:>10.0f} {1.0:>9.2f}x")
+    for workers, elapsed, _ in rows:
+        print(f"{workers:>8} {len(messages) / elapsed:>10.0f} {baseline / elapsed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
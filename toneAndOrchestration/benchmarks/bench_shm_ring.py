@@ -0,0 +1,160 @@
+# benchmarks/bench_shm_ring.py
+"""
+Moving small PART chunks between two processes: multiprocessing.Queue
+(one pickled message per put, and lists of 64 as ShardedOrchestrator
+sends them) vs orchestrator.shm_ring.ShmRing (one message per record, and
+put_many batches).
+
+  throughput   producer process -> this process, messages/s
+  round trip   ping-pong through an echo process, one message in flight,
+               p50 / p99 microseconds (ring under each wait policy)
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_shm_ring [--messages 200000] [--round-trips 5000]
+"""
+import argparse
+import multiprocessing as mp
+import time
+
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from orchestrator.latency_logger import LatencyHistogram
+from orchestrator.shm_ring import ShmRing
+from schemas.pipeline_message import FastMessage
+
+BATCH = 64
+
+
+def _chunks(n: int):
+    config = WorkloadConfig(utterances=n // 4, chunks_per_utterance=(3, 3), words_per_chunk=(3, 8), seed=9)
+    return synthetic_asr_stream(config, FastMessage)[:n]
+
+
+# -----------------------------------------
+# Producers / echo servers (child processes)
+# -----------------------------------------
+def _queue_producer(q, msgs, batch):
+    if batch == 1:
+        for m in msgs:
+            q.put(m)
+    else:
+        for i in range(0, len(msgs), batch):
+            q.put(msgs[i:i + batch])
+    q.put(None)
+
+
+def _ring_producer(ring, msgs, batch):
+    if batch == 1:
+        for m in msgs:
+            ring.put(m)
+    else:
+        ring.put_many(msgs)
+    ring.close()
+    ring.release()
+
+
+def _queue_echo(inbox, outbox):
+    for m in iter(inbox.get, None):
+        outbox.put(m)
+
+
+def _ring_echo(inbox, outbox):
+    for m in inbox:
+        outbox.put(m)
+    inbox.release()
+    outbox.release()
+
+
+# -----------------------------------------
+# Scenarios
+# -----------------------------------------
+def _queue_throughput(msgs, batch) -> float:
+    q = mp.Queue(maxsize=1024)
+    p = mp.Process(target=_queue_producer, args=(q, msgs, batch))
+    start = time.perf_counter()
+    p.start()
+    n = 0
+    for item in iter(q.get, None):
+        n += 1 if batch == 1 else len(item)
+    seconds = time.perf_counter() - start
+    p.join()
+    assert n == len(msgs)
+    return n / seconds
+
+
+def _ring_throughput(msgs, batch, wait) -> float:
+    ring = ShmRing(wait=wait, max_batch=batch)
+    p = mp.Process(target=_ring_producer, args=(ring, msgs, batch))
+    start = time.perf_counter()
+    p.start()
+    n = sum(1 for _ in ring)
+    seconds = time.perf_counter() - start
+    p.join()
+    ring.unlink()
+    assert n == len(msgs)
+    return n / seconds
+
+
+def _round_trips(put, get, msgs) -> LatencyHistogram:
+    hist = LatencyHistogram()
+    for m in msgs:
+        t0 = time.perf_counter_ns()
+        put(m)
+        get()
+        hist.record(time.perf_counter_ns() - t0)
+    return hist
+
+
+def _queue_latency(msgs) -> LatencyHistogram:
+    inbox, outbox = mp.Queue(), mp.Queue()
+    p = mp.Process(target=_queue_echo, args=(inbox, outbox))
+    p.start()
+    hist = _round_trips(inbox.put, outbox.get, msgs)
+    inbox.put(None)
+    p.join()
+    return hist
+
+
+def _ring_latency(msgs, wait) -> LatencyHistogram:
+    inbox, outbox = ShmRing(wait=wait), ShmRing(wait=wait)
+    p = mp.Process(target=_ring_echo, args=(inbox, outbox))
+    p.start()
+    hist = _round_trips(inbox.put, outbox.get, msgs)
+    inbox.close()
+    p.join()
+    inbox.unlink()
+    outbox.unlink()
+    return hist
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--round-trips", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    msgs = _chunks(args.messages)
+    print(f"throughput, {len(msgs)} messages")
+    print(f"{'transport':>24} {'msgs/s':>10}")
+    for name, run in [
+        ("queue, per message", lambda: _queue_throughput(msgs, 1)),
+        (f"queue, lists of {BATCH}", lambda: _queue_throughput(msgs, BATCH)),
+        ("ring, per message", lambda: _ring_throughput(msgs, 1, "block")),
+        (f"ring, batches of {BATCH}", lambda: _ring_throughput(msgs, BATCH, "block")),
+    ]:
+        print(f"{name:>24} {run():>10.0f}")
+
+    pings = _chunks(args.round_trips)
+    print(f"\nround trip, {len(pings)} messages one at a time")
+    print(f"{'transport':>24} {'p50 us':>8} {'p99 us':>8}")
+    for name, run in [
+        ("queue", lambda: _queue_latency(pings)),
+        ("ring, block", lambda: _ring_latency(pings, "block")),
+        ("ring, yield", lambda: _ring_latency(pings, "yield")),
+        ("ring, spin", lambda: _ring_latency(pings, "spin")),
+    ]:
+        snap = run().snapshot()
+        print(f"{name:>24} {snap['p50_ms'] * 1000:>8.1f} {snap['p99_ms'] * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start cost, each sample in a fresh interpreter:
+  - import time of the main modules, parsed from `python -X importtime`
+    (cumulative us of the module itself, plus the heaviest dependencies);
+  - time from the first import to the first PREVIEW_TONE, per tone mode
+    and message type.
+benchmarks.suite tracks the first-preview times (startup/* scenarios).
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_startup [--runs 7] [--top 8]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["schemas.pipeline_message", "tone_module.transformer", "orchestrator.orchestrator"]
+RUNS = 7
+
+# fields: self us | cumulative us | indented module name
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+FIRST_PREVIEW = """
+import time
+t0 = time.perf_counter()
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import {cls}
+orch = PipelineOrchestrator(tone_mode={mode!r})
+out = orch.process_message({cls}(id="u", chunk_index=0, text="thanks, i'm gonna be there", event="PART"))
+assert out.event == "PREVIEW_TONE"
+print((time.perf_counter() - t0) * 1000)
+"""
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def import_times(module: str) -> Tuple[int, Dict[str, int]]:
+    """(cumulative us of module, {dependency: cumulative us}) from one fresh import."""
+    stderr = _run(["-X", "importtime", "-c", f"import {module}"]).stderr
+    deps: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m is None:
+            continue
+        cumulative, depth, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        if depth == 0:
+            # children are listed before their parent
+            if name == module:
+                return cumulative, deps
+            deps = {}
+        elif depth == 2:
+            deps[name] = cumulative
+    return 0, {}
+
+
+def first_preview_ms(mode: str, message_cls: str = "FastMessage") -> float:
+    """Import + construct + first PART -> PREVIEW_TONE, in a fresh interpreter."""
+    return float(_run(["-c", FIRST_PREVIEW.format(cls=message_cls, mode=mode)]).stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=RUNS, help="samples per measurement (median shown)")
+    parser.add_argument("--top", type=int, default=8, help="heaviest direct imports to list")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':>28} {'import ms':>10}  heaviest direct imports (ms)")
+    for module in MODULES:
+        samples = [import_times(module) for _ in range(args.runs)]
+        total = statistics.median(t for t, _ in samples)
+        deps = samples[len(samples) // 2][1]
+        heavy = sorted(deps.items(), key=lambda kv: -kv[1])[: args.top]
+        print(f"{module:>28} {total / 1000:>10.1f}  " + ", ".join(f"{n} {us / 1000:.1f}" for n, us in heavy))
+
+    print(f"\n{'first PREVIEW_TONE':>28} {'ms':>10}")
+    for cls in ("FastMessage", "PipelineMessage"):
+        for mode in ("neutral", "formal"):
+            ms = statistics.median(first_preview_ms(mode, cls) for _ in range(args.runs))
+            print(f"{f'{mode} / {cls}':>28} {ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# benchmarks/bench_state_store.py
+"""
+Soak: a million utterances that send one PART and never finish (dropped
+connections). With max_utterances / utterance_ttl the orchestrator's state
+stays bounded; resident memory is printed as the stream goes on.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_state_store [utterances]
+"""
+import resource
+import sys
+import time
+
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import FastMessage
+
+MAX_UTTERANCES = 10_000
+TTL_SECONDS = 5.0
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    orch = PipelineOrchestrator(tone_mode="formal", max_utterances=MAX_UTTERANCES, utterance_ttl=TTL_SECONDS)
+    store = orch.state_by_id
+    step = max(1, total // 10)
+
+    print(f"{'utterances':>11} {'live':>7} {'evicted':>9} {'expired':>9} {'peak rss MB':>12} {'msg/s':>9}")
+    start = time.perf_counter()
+    for i in range(total):
+        orch.process_message(FastMessage(f"utt_{i}", 0, "thanks i'm gonna join later", "PART"))
+        if (i + 1) % step == 0:
+            stats = store.stats()
+            rate = (i + 1) / (time.perf_counter() - start)
+            print(f"{i + 1:>11} {stats['live']:>7} {stats['evicted']:>9} {stats['expired']:>9} "
+                  f"{_rss_mb():>12.1f} {rate:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_streaming.py
+"""
+List stages vs streaming generator stages on a long session: time until
+the first PREVIEW_TONE, per-stage time-to-first-output, and peak traced
+memory for the whole run (the ASR input list is counted in both).
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_streaming
+"""
+import time
+import tracemalloc
+
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from mocks.mock_cleaner import clean_stream, mock_cleaner_stage
+from mocks.mock_grammar import grammar_stream, mock_grammar_stage
+from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.pipeline import StreamPipeline
+from schemas.pipeline_message import FastMessage
+
+CONFIG = WorkloadConfig(utterances=5000, seed=2, end_of_speech_time=time.time())
+
+
+def _run(label, outputs_fn):
+    asr = synthetic_asr_stream(CONFIG, FastMessage)
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_ms = None
+    for out in outputs_fn(iter(asr)):
+        if first_ms is None:
+            first_ms = (time.perf_counter() - start) * 1000
+    total_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>10} {first_ms:>14.3f} {total_ms:>10.0f} {peak / 2**20:>12.1f}")
+
+
+def main():
+    print(f"{'stages':>10} {'first out ms':>14} {'total ms':>10} {'peak MiB':>12}")
+
+    def batch(asr):
+        orch = PipelineOrchestrator(tone_mode="formal")
+        return orch.stream(mock_grammar_stage(mock_cleaner_stage(list(asr))))
+
+    pipe = (StreamPipeline()
+            .stage("cleaner", clean_stream)
+            .stage("grammar", grammar_stream)
+            .stage("tone", PipelineOrchestrator(tone_mode="formal").stream))
+
+    _run("list", batch)
+    _run("streaming", pipe.run)
+    print("\nstreaming time-to-first-output per stage:")
+    for name, ms in pipe.first_output_ms.items():
+        print(f"  {name:>8}: {ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
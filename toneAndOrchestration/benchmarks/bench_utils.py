@@ -0,0 +1,95 @@
+# benchmarks/bench_utils.py
+"""
+Per-call cost of the tone_module.utils helpers: the old versions, which
+built (and sorted) their regex on every call, vs the current thin wrappers
+over memoized, precompiled matchers. Outputs are checked to be identical.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_utils
+"""
+import random
+import re
+import time
+from typing import Callable, Dict, List
+
+from mocks.mock_asr import VOCABULARY
+from tone_module import utils
+from tone_module.tone_rules import CASUAL_SIMPLIFICATIONS, FILLERS, FORMAL_EXPANSIONS, HEDGES, INTENSIFIERS
+
+N_TEXTS = 5000
+
+
+# -----------------------------------------
+# Old helpers (pattern built per call)
+# -----------------------------------------
+def legacy_apply_mapping(text: str, mapping: Dict[str, str]) -> str:
+    if not mapping:
+        return text
+    keys = sorted(mapping.keys(), key=lambda x: -len(x))
+
+    def repl(m):
+        k = m.group(0)
+        mapped = mapping.get(k, mapping.get(k.lower()))
+        if mapped is None:
+            return k
+        if k and k[0].isupper():
+            return mapped[0].upper() + mapped[1:]
+        return mapped
+
+    pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in keys) + r")\b", flags=re.IGNORECASE)
+    return pattern.sub(repl, text)
+
+
+def legacy_remove_words(text: str, words) -> str:
+    if not words:
+        return text
+    keys = sorted(words, key=lambda x: -len(x))
+    pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in keys) + r")\b", flags=re.IGNORECASE)
+    return pattern.sub("", text)
+
+
+def legacy_reduce_intensifiers(text: str, intensifiers) -> str:
+    if not intensifiers:
+        return text
+    pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in intensifiers) + r")\b\s*", flags=re.IGNORECASE)
+    return pattern.sub("", text)
+
+
+def legacy_safe_strip_punctuation(text: str) -> str:
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"[.]{2,}", ".", text)
+    return text.strip()
+
+
+def _per_call_us(fn: Callable[[str], str], texts: List[str]) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+
+def main():
+    rng = random.Random(20)
+    texts = [" ".join(rng.choices(VOCABULARY, k=rng.randint(4, 14))) + rng.choice(["", ".", "..."])
+             for _ in range(N_TEXTS)]
+    formal = {**FORMAL_EXPANSIONS, **CASUAL_SIMPLIFICATIONS}
+    big = {f"phrase {i}": f"p{i}" for i in range(500)}
+    cases = [
+        ("apply_mapping", lambda t: legacy_apply_mapping(t, formal), lambda t: utils.apply_mapping(t, formal)),
+        ("apply_mapping 500", lambda t: legacy_apply_mapping(t, big), lambda t: utils.apply_mapping(t, big)),
+        ("remove_words", lambda t: legacy_remove_words(t, HEDGES + FILLERS),
+         lambda t: utils.remove_words(t, HEDGES + FILLERS)),
+        ("reduce_intensifiers", lambda t: legacy_reduce_intensifiers(t, INTENSIFIERS),
+         lambda t: utils.reduce_intensifiers(t, INTENSIFIERS)),
+        ("safe_strip_punctuation", legacy_safe_strip_punctuation, utils.safe_strip_punctuation),
+    ]
+    print(f"{'helper':>24} {'before us':>10} {'after us':>9} {'speedup':>8}")
+    for name, before, after in cases:
+        assert all(before(t) == after(t) for t in texts[:500]), name
+        before_us = _per_call_us(before, texts)
+        after_us = _per_call_us(after, texts)
+        print(f"{name:>24} {before_us:>10.2f} {after_us:>9.2f} {before_us / after_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
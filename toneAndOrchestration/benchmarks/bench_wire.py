@@ -0,0 +1,68 @@
+# benchmarks/bench_wire.py
+"""
+Serialized size and encode/decode speed per message: pydantic JSON
+(model_dump_json / model_validate_json), pickle of PipelineMessage and of
+FastMessage, and the binary codec in schemas.wire (one message at a time,
+and framed batches).
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.bench_wire
+"""
+import pickle
+import time
+from typing import Callable, List
+
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from schemas import wire
+from schemas.pipeline_message import FastMessage, PipelineMessage
+
+N_UTTERANCES = 2000
+
+
+def _per_msg_us(fn: Callable[[], object], n: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    config = WorkloadConfig(utterances=N_UTTERANCES, end_of_speech_time=1760000000.5, tone_modes=("formal", "casual"))
+    models: List[PipelineMessage] = synthetic_asr_stream(config, PipelineMessage)
+    fast = [FastMessage.from_model(m) for m in models]
+    n = len(models)
+
+    jsons = [m.model_dump_json().encode() for m in models]
+    pickled_models = [pickle.dumps(m, pickle.HIGHEST_PROTOCOL) for m in models]
+    pickled_fast = [pickle.dumps(m, pickle.HIGHEST_PROTOCOL) for m in fast]
+    bodies = [wire.encode(m) for m in fast]
+    batch = wire.encode_batch(fast)
+    assert wire.decode_frames(batch, PipelineMessage)[0] == models
+
+    rows = [
+        ("pydantic json", sum(map(len, jsons)),
+         lambda: [m.model_dump_json() for m in models],
+         lambda: [PipelineMessage.model_validate_json(b) for b in jsons]),
+        ("pickle model", sum(map(len, pickled_models)),
+         lambda: [pickle.dumps(m, pickle.HIGHEST_PROTOCOL) for m in models],
+         lambda: [pickle.loads(b) for b in pickled_models]),
+        ("pickle fast", sum(map(len, pickled_fast)),
+         lambda: [pickle.dumps(m, pickle.HIGHEST_PROTOCOL) for m in fast],
+         lambda: [pickle.loads(b) for b in pickled_fast]),
+        ("wire -> model", sum(map(len, bodies)),
+         lambda: [wire.encode(m) for m in models],
+         lambda: [wire.decode(b, PipelineMessage) for b in bodies]),
+        ("wire -> fast", sum(map(len, bodies)),
+         lambda: [wire.encode(m) for m in fast],
+         lambda: [wire.decode(b) for b in bodies]),
+        ("wire batch", len(batch),
+         lambda: wire.encode_batch(fast),
+         lambda: wire.decode_frames(batch)),
+    ]
+    print(f"{n} messages")
+    print(f"{'format':>14} {'bytes/msg':>10} {'encode us':>10} {'decode us':>10}")
+    for name, size, enc, dec in rows:
+        print(f"{name:>14} {size / n:>10.1f} {_per_msg_us(enc, n):>10.2f} {_per_msg_us(dec, n):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# benchmarks/suite.py
+"""
+Reproducible benchmark suite for the tone / orchestration hot paths.
+
+Scenarios, per tone mode, on a synthetic workload (mocks.mock_asr.synthetic_asr_stream):
+  transform/<mode>  ToneTransformer._tone_transform of one grammar chunk
+  preview/<mode>    PipelineOrchestrator.process_message for a PART
+  finalize/<mode>   process_message for END_GRAMMAR (PARTs fed untimed)
+  pipeline/<mode>   mock ASR -> cleaner -> grammar -> orchestrator, per utterance
+plus assemble/full_text for UtteranceState.assemble_full_text, and
+  startup/<mode>    fresh interpreter: imports to first PREVIEW_TONE
+                    (see benchmarks.bench_startup), for neutral and formal.
+
+Each scenario reports throughput (ops/s) and per-op latency percentiles as
+JSON. Against a stored baseline, a scenario regresses when its throughput
+drops, or its p50 rises, by more than the threshold; the exit code is then 1.
+
+Run from toneAndOrchestration/:
+    python -m benchmarks.suite [--quick] [--out results.json]
+    python -m benchmarks.suite --baseline benchmarks/baseline.json [--threshold 0.25]
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from dataclasses import asdict
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from benchmarks.bench_startup import first_preview_ms
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from mocks.mock_grammar import mock_upstream_stages
+from orchestrator.latency_logger import LatencyHistogram, LatencyLogger
+from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.state import UtteranceState
+from schemas.pipeline_message import AnyMessage
+from tone_module.transformer import ToneTransformer
+
+MODES = ["neutral", "formal", "casual", "concise"]
+STARTUP_MODES = ["neutral", "formal"]
+STARTUP_RUNS = 5  # interpreters started per startup/* run
+REPEAT = 3
+FULL = WorkloadConfig(utterances=2000, chunks_per_utterance=(2, 8), words_per_chunk=(3, 12), seed=1)
+QUICK = WorkloadConfig(utterances=200, chunks_per_utterance=(2, 8), words_per_chunk=(3, 12), seed=1)
+
+# A run yields the operations to time: each is called once, in order
+Ops = List[Callable[[], object]]
+
+
+# -----------------------------------------
+# Scenarios (setup is untimed, returns the ops)
+# -----------------------------------------
+def _transform_ops(mode: str, msgs: Sequence[AnyMessage]) -> Ops:
+    tt = ToneTransformer(mode=mode)
+    return [lambda text=m.text: tt._tone_transform(text) for m in msgs if m.event == "PART"]
+
+
+def _preview_ops(mode: str, msgs: Sequence[AnyMessage]) -> Ops:
+    orch = PipelineOrchestrator(tone_mode=mode)
+    return [lambda m=m: orch.process_message(m) for m in msgs if m.event == "PART"]
+
+
+def _finalize_ops(mode: str, msgs: Sequence[AnyMessage]) -> Ops:
+    orch = PipelineOrchestrator(tone_mode=mode)
+    for m in msgs:
+        if m.event == "PART":
+            orch.process_message(m)
+    return [lambda m=m: orch.process_message(m) for m in msgs if m.event == "END_GRAMMAR"]
+
+
+def _pipeline_ops(mode: str, config: WorkloadConfig) -> Ops:
+    orch = PipelineOrchestrator(tone_mode=mode)
+    asr = synthetic_asr_stream(WorkloadConfig(**{**asdict(config), "interleave": False}))
+    per_utt: Dict[str, List[AnyMessage]] = {}
+    for m in asr:
+        per_utt.setdefault(m.id, []).append(m)
+
+    def run(utt_msgs):
+        for m in mock_upstream_stages(utt_msgs):
+            orch.process_message(m)
+
+    return [lambda u=u: run(u) for u in per_utt.values()]
+
+
+def _assemble_ops(msgs: Sequence[AnyMessage]) -> Ops:
+    states: Dict[str, UtteranceState] = {}
+    for m in msgs:
+        if m.event == "PART":
+            states.setdefault(m.id, UtteranceState()).add_chunk(m.chunk_index, m.text)
+    return [st.assemble_full_text for st in states.values()]
+
+
+def _startup_ops(mode: str) -> Ops:
+    return [lambda: first_preview_ms(mode) for _ in range(STARTUP_RUNS)]
+
+
+def scenarios(config: WorkloadConfig) -> List[Tuple[str, Callable[[], Ops]]]:
+    timed = WorkloadConfig(**{**asdict(config), "end_of_speech_time": time.time()})
+    msgs = mock_upstream_stages(synthetic_asr_stream(timed))
+    out: List[Tuple[str, Callable[[], Ops]]] = []
+    for mode in MODES:
+        out.append((f"transform/{mode}", lambda mode=mode: _transform_ops(mode, msgs)))
+        out.append((f"preview/{mode}", lambda mode=mode: _preview_ops(mode, msgs)))
+        out.append((f"finalize/{mode}", lambda mode=mode: _finalize_ops(mode, msgs)))
+        out.append((f"pipeline/{mode}", lambda mode=mode: _pipeline_ops(mode, config)))
+    out.append(("assemble/full_text", lambda: _assemble_ops(msgs)))
+    for mode in STARTUP_MODES:
+        out.append((f"startup/{mode}", lambda mode=mode: _startup_ops(mode)))
+    return out
+
+
+# -----------------------------------------
+# Measuring
+# -----------------------------------------
+def measure(make_ops: Callable[[], Ops], repeat: int = REPEAT) -> Dict[str, float]:
+    """Best of `repeat` runs (by throughput); latency percentiles in microseconds."""
+    best: Dict[str, float] = {}
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        ops = make_ops()
+        hist = LatencyHistogram()
+        start = clock()
+        for op in ops:
+            t0 = clock()
+            op()
+            hist.record(clock() - t0)
+        elapsed_ns = clock() - start
+        snap = hist.snapshot()
+        result = {
+            "ops": len(ops),
+            "ops_per_s": len(ops) / (elapsed_ns / 1e9) if elapsed_ns else 0.0,
+            "p50_us": snap.get("p50_ms", 0.0) * 1000,
+            "p95_us": snap.get("p95_ms", 0.0) * 1000,
+            "p99_us": snap.get("p99_ms", 0.0) * 1000,
+        }
+        if not best or result["ops_per_s"] > best["ops_per_s"]:
+            best = result
+    return best
+
+
+def run_suite(config: WorkloadConfig, repeat: int = REPEAT, only: str = "") -> Dict[str, object]:
+    LatencyLogger.verbose = False
+    results = {}
+    for name, make_ops in scenarios(config):
+        if only and only not in name:
+            continue
+        results[name] = measure(make_ops, repeat)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "workload": {k: v for k, v in asdict(config).items() if k != "vocabulary"},
+        },
+        "scenarios": results,
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """Names of scenarios slower than baseline by more than threshold (0.25 = 25%)."""
+    regressions = []
+    base = baseline["scenarios"]
+    for name, cur in current["scenarios"].items():
+        ref = base.get(name)
+        if ref is None:
+            continue
+        slower = cur["ops_per_s"] < ref["ops_per_s"] * (1 - threshold)
+        laggier = cur["p50_us"] > ref["p50_us"] * (1 + threshold)
+        if slower or laggier:
+            regressions.append(name)
+    return regressions
+
+
+def _print_table(current: Dict[str, object], baseline: Dict[str, object] = None):
+    base = baseline["scenarios"] if baseline else {}
+    print(f"{'scenario':>20} {'ops':>7} {'ops/s':>11} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'vs base':>8}")
+    for name, r in current["scenarios"].items():
+        ref = base.get(name)
+        delta = f"{r['ops_per_s'] / ref['ops_per_s']:>7.2f}x" if ref else f"{'-':>8}"
+        print(f"{name:>20} {r['ops']:>7} {r['ops_per_s']:>11.0f} {r['p50_us']:>9.1f} "
+              f"{r['p95_us']:>9.1f} {r['p99_us']:>9.1f} {delta}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="small workload (smoke run)")
+    parser.add_argument("--only", default="", help="run scenarios whose name contains this")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results as the new baseline")
+    args = parser.parse_args(argv)
+
+    current = run_suite(QUICK if args.quick else FULL, repeat=args.repeat, only=args.only)
+    for path in filter(None, [args.out, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_table(current, baseline)
+
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\nREGRESSION (> {args.threshold:.0%}): {', '.join(regressions)}")
+            return 1
+        print(f"\nno regressions (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
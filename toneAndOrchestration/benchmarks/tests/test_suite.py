@@ -0,0 +1,48 @@
+# benchmarks/tests/test_suite.py
+import json
+
+from benchmarks import suite
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from schemas.pipeline_message import FastMessage
+
+
+def test_synthetic_stream_is_reproducible_and_ordered_per_utterance():
+    config = WorkloadConfig(utterances=50, chunks_per_utterance=(1, 4), words_per_chunk=(2, 5), seed=3)
+    msgs = synthetic_asr_stream(config)
+    assert [(m.id, m.chunk_index, m.text) for m in msgs] == [
+        (m.id, m.chunk_index, m.text) for m in synthetic_asr_stream(config)
+    ]
+
+    per_utt = {}
+    for m in msgs:
+        per_utt.setdefault(m.id, []).append(m)
+    assert len(per_utt) == 50
+    for utt_msgs in per_utt.values():
+        assert [m.event for m in utt_msgs][-1] == "END_ASR"
+        assert [m.chunk_index for m in utt_msgs[:-1]] == list(range(len(utt_msgs) - 1))
+        # 2..5 vocabulary entries; some entries are two-word phrases
+        assert all(2 <= len(m.text.split()) <= 10 for m in utt_msgs[:-1])
+    # interleaved: not simply one utterance after another
+    assert [m.id for m in msgs] != sorted((m.id for m in msgs), key=lambda i: int(i.split("_")[1]))
+
+    fast = synthetic_asr_stream(WorkloadConfig(utterances=2, interleave=False), FastMessage)
+    assert all(type(m) is FastMessage for m in fast)
+    assert [m.id for m in fast] == sorted(m.id for m in fast)
+
+
+def test_run_suite_and_compare():
+    config = WorkloadConfig(utterances=5, chunks_per_utterance=(1, 2), words_per_chunk=(2, 4))
+    current = suite.run_suite(config, repeat=1, only="formal")
+    json.dumps(current)  # machine-readable
+    assert set(current["scenarios"]) == {
+        "transform/formal", "preview/formal", "finalize/formal", "pipeline/formal", "startup/formal"
+    }
+    for r in current["scenarios"].values():
+        assert r["ops"] > 0 and r["ops_per_s"] > 0
+        assert r["p50_us"] <= r["p95_us"] <= r["p99_us"]
+
+    assert suite.compare(current, current, threshold=0.1) == []
+    faster = {"scenarios": {
+        name: {**r, "ops_per_s": r["ops_per_s"] * 2} for name, r in current["scenarios"].items()
+    }}
+    assert suite.compare(current, faster, threshold=0.25) == list(current["scenarios"])
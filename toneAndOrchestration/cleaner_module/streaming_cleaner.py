@@ -0,0 +1,218 @@
+# cleaner_module/streaming_cleaner.py
+"""
+Streaming disfluency cleaner: the ASR -> cleaner stage, with the same
+message interface as mocks.mock_cleaner (PART -> cleaned PART, END_ASR ->
+END_CLEAN, other events dropped), but aware of chunk boundaries.
+
+Cleaning a chunk on its own misses disfluencies that straddle a join:
+"... I" + "I want" keeps both "I"s, and "... you" + "know ..." keeps a
+split "you know". Instead of buffering the utterance, each one carries a
+small tail between chunks:
+  - the last emitted word, so a repetition at the start of the next chunk
+    is dropped;
+  - held words: trailing words that could start a multi-word filler
+    ("you" for "you know", or a few nested ones). They are not emitted yet
+    but prepended to the next chunk, and flushed as one extra PART before
+    END_CLEAN.
+Chunks of an utterance are expected in chunk_index order (as ASR emits
+them); a chunk arriving out of order is cleaned on its own.
+
+The joined output of an utterance equals clean_text() of its joined input,
+so downstream stages (grammar, tone) see clean text without re-scanning.
+One exception: punctuation right after a word repeated across a join
+("I" + "I, want") is dropped with the repeat, since the word it belongs
+to was already sent ("I want", where clean_text gives "I, want").
+"""
+import re
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from schemas.pipeline_message import AnyMessage
+from tone_module.state_store import UtteranceStore
+
+# Same default list as mocks.mock_cleaner
+FILLERS: Tuple[str, ...] = ("um", "uh", "you know", "like")
+
+# "I I I" -> "I", "really really" -> "really" (first spelling kept)
+# (a word followed by an apostrophe is part of a contraction: "I I'm" stays)
+_REPEATS = re.compile(r"\b(\w+)(?:\s+\1\b(?!['\u2019]))+", flags=re.IGNORECASE)
+# with the punctuation right after it: left alone it would start the chunk
+_FIRST_WORD = re.compile(r"(\w+)\b(?!['\u2019])[^\w\s'\u2019]*\s*")
+_LAST_WORD = re.compile(r"\b(\w+)$")
+
+
+class _Tail:
+    """Per-utterance state carried from one chunk to the next."""
+
+    __slots__ = ("last_word", "held", "next_index")
+
+    def __init__(self):
+        self.last_word: Optional[str] = None  # lowercased, None after punctuation
+        self.held: List[str] = []
+        self.next_index = 0
+
+
+class StreamingCleaner:
+    """
+    fillers: words/phrases removed wherever they occur (case-insensitive).
+    max_utterances / utterance_ttl: bound the tails of utterances that never
+        get END_ASR (see tone_module.state_store.UtteranceStore); held words
+        of a dropped utterance are lost.
+
+        cleaner = StreamingCleaner()
+        pipe = StreamPipeline().stage("cleaner", cleaner.stream, cleaner.astream)...
+    """
+
+    def __init__(
+        self,
+        fillers: Sequence[str] = FILLERS,
+        max_utterances: Optional[int] = None,
+        utterance_ttl: Optional[float] = None,
+    ):
+        self.fillers = tuple(fillers)
+        # compiled once; longest first so "you know" wins over a shorter filler
+        keys = sorted(self.fillers, key=lambda x: -len(x))
+        self._filler_re: Optional[re.Pattern] = None
+        if keys:
+            self._filler_re = re.compile(
+                r"\b(?:" + "|".join(re.escape(k) for k in keys) + r")\b", flags=re.IGNORECASE
+            )
+        # word sequences that may continue into a multi-word filler
+        self._prefixes = {
+            tuple(words[:i])
+            for words in (f.lower().split() for f in self.fillers)
+            for i in range(1, len(words))
+        }
+        self._max_held = max((len(p) for p in self._prefixes), default=0)
+        self._held_ends = {p[-1] for p in self._prefixes}
+        self.tails: UtteranceStore[_Tail] = UtteranceStore(max_size=max_utterances, ttl=utterance_ttl)
+
+    # -----------------------------------------
+    # Text cleaning
+    # -----------------------------------------
+    def _remove_fillers(self, text: str) -> str:
+        text = " ".join(text.split())
+        pattern = self._filler_re
+        # repeated: removing one filler can join another ("you like know")
+        while pattern is not None:
+            text, removed = pattern.subn("", text)
+            if not removed:
+                break
+            text = " ".join(text.split())
+        return text
+
+    def clean_text(self, text: str) -> str:
+        """Clean a whole text at once: fillers, then repeated words."""
+        return _REPEATS.sub(r"\1", self._remove_fillers(text))
+
+    def _hold_count(self, words: List[str]) -> int:
+        """
+        Number of trailing words that a later chunk could still turn into
+        fillers: the longest suffix made of proper prefixes of multi-word
+        fillers ("you", or "you I" for "you [I mean] know").
+        """
+        n = len(words)
+        if not n or words[-1].lower() not in self._held_ends:
+            return 0
+        ok = [False] * n + [True]  # ok[j]: words[j:] splits into prefixes
+        start = n
+        for j in range(n - 1, -1, -1):
+            if j + self._max_held < start:
+                break  # no prefix reaches the held suffix any more
+            ok[j] = any(
+                ok[j + k] and tuple(w.lower() for w in words[j:j + k]) in self._prefixes
+                for k in range(1, min(self._max_held, n - j) + 1)
+            )
+            if ok[j]:
+                start = j
+        return n - start
+
+    def clean_chunk(self, tail: _Tail, text: str, final: bool = False) -> str:
+        """
+        Clean the next chunk of the utterance whose state is tail.
+        final: no more chunks follow, so nothing is held back.
+        """
+        if tail.held:
+            text = " ".join(tail.held) + " " + text
+        text = self._remove_fillers(text)
+        words = text.split(" ") if text else []
+        held = 0 if final else self._hold_count(words)
+        tail.held = words[len(words) - held:] if held else []
+        text = _REPEATS.sub(r"\1", " ".join(words[: len(words) - held]))
+
+        # a repetition across the join: drop the word already emitted, and
+        # its punctuation (it cannot be attached to the emitted one)
+        if tail.last_word is not None:
+            m = _FIRST_WORD.match(text)
+            if m is not None and m.group(1).lower() == tail.last_word:
+                text = text[m.end():]
+        if text:
+            m = _LAST_WORD.search(text)
+            tail.last_word = m.group(1).lower() if m is not None else None
+        return text
+
+    # -----------------------------------------
+    # Message API (same shape as mocks.mock_cleaner)
+    # -----------------------------------------
+    def process(self, msg: AnyMessage) -> List[AnyMessage]:
+        """
+        PART -> one cleaned PART; END_ASR -> a PART with any held words
+        (chunk_index after the last one), then END_CLEAN; anything else
+        -> nothing. Outputs have the same type as msg.
+        """
+        cls = type(msg)
+        if msg.event == "PART":
+            tail = self.tails.get(msg.id)
+            if tail is None:
+                tail = self.tails[msg.id] = _Tail()
+            if msg.chunk_index < tail.next_index:
+                text = self.clean_text(msg.text)  # late or repeated chunk: no context
+            else:
+                if msg.chunk_index > tail.next_index:
+                    tail.last_word = None  # chunk(s) missing: the join is unknown
+                tail.next_index = msg.chunk_index + 1
+                text = self.clean_chunk(tail, msg.text)
+            return [cls(
+                id=msg.id,
+                chunk_index=msg.chunk_index,
+                text=text,
+                event="PART",
+                is_final=msg.is_final,
+                end_of_speech_time=msg.end_of_speech_time,
+                tone_mode=msg.tone_mode,
+            )]
+        if msg.event == "END_ASR":
+            out: List[AnyMessage] = []
+            tail = self.tails.pop(msg.id, None)
+            if tail is not None and tail.held:
+                out.append(cls(
+                    id=msg.id,
+                    chunk_index=tail.next_index,
+                    text=self.clean_chunk(tail, "", final=True),
+                    event="PART",
+                    is_final=False,
+                    tone_mode=msg.tone_mode,
+                ))
+            out.append(cls(
+                id=msg.id,
+                chunk_index=-1,
+                text="",
+                event="END_CLEAN",
+                is_final=True,
+                end_of_speech_time=msg.end_of_speech_time,
+                tone_mode=msg.tone_mode,
+            ))
+            return out
+        return []
+
+    def stream(self, messages: Iterable[AnyMessage]) -> Iterator[AnyMessage]:
+        """Generator stage: yields cleaned messages as soon as their input arrives."""
+        process = self.process
+        for msg in messages:
+            yield from process(msg)
+
+    async def astream(self, messages: AsyncIterable[AnyMessage]) -> AsyncIterator[AnyMessage]:
+        """Async-generator version of stream."""
+        process = self.process
+        async for msg in messages:
+            for out in process(msg):
+                yield out
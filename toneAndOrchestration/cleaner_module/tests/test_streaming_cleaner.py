@@ -0,0 +1,107 @@
+# cleaner_module/tests/test_streaming_cleaner.py
+import asyncio
+import random
+import time
+
+import pytest
+
+from cleaner_module.streaming_cleaner import StreamingCleaner
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from mocks.mock_grammar import grammar_stream
+from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.pipeline import StreamPipeline
+from schemas.pipeline_message import FastMessage, PipelineMessage
+
+
+def _utterance(chunks, utt_id="u", cls=PipelineMessage):
+    msgs = [cls(id=utt_id, chunk_index=i, text=t, event="PART") for i, t in enumerate(chunks)]
+    return msgs + [cls(id=utt_id, chunk_index=-1, text="", event="END_ASR", is_final=True)]
+
+
+def _joined(out):
+    return " ".join(m.text for m in out if m.event == "PART" and m.text)
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    (["um I", "I want to", "go"], "I want to go"),
+    (["thank you for coming you", "know this is", "really really important"],
+     "thank you for coming this is really important"),
+    (["I I", "I", "i think"], "I think"),
+    (["so you", "know"], "so"),
+    (["said you", "you know it"], "said you it"),
+    (["you you", "know know"], ""),  # nested: "you [you know] know"
+    (["is it you"], "is it you"),  # held word flushed at the end
+    (["I said.", "said it"], "I said. said it"),  # punctuation breaks the repetition
+    # a repeat across the join takes its punctuation along: no stray ", ..."
+    (["I", "I, want to go"], "I want to go"),
+    (["yes", "yes. I am here"], "yes I am here"),
+    (["go go", "go! now"], "go now"),
+])
+def test_cross_boundary_disfluencies(chunks, expected):
+    out = list(StreamingCleaner().stream(_utterance(chunks)))
+    assert _joined(out) == expected
+    assert out[-1].event == "END_CLEAN"
+    parts = [m.chunk_index for m in out if m.event == "PART"]
+    assert parts == list(range(len(parts)))
+
+
+@pytest.mark.parametrize("fillers", [None, ("um", "you know", "i mean", "i mean you know")])
+def test_stream_equals_cleaning_the_whole_utterance(fillers):
+    rng = random.Random(3)
+    words = ["I", "i", "you", "know", "You", "mean", "um", "like", "really", "the", "go", "i'm", "said."]
+    cleaner = StreamingCleaner() if fillers is None else StreamingCleaner(fillers)
+    for n in range(500):
+        chunks = [" ".join(rng.choices(words, k=rng.randint(0, 5))) for _ in range(rng.randint(1, 5))]
+        out = list(cleaner.stream(_utterance(chunks, f"u{n}")))
+        assert _joined(out) == cleaner.clean_text(" ".join(chunks)), chunks
+    assert len(cleaner.tails) == 0
+
+
+def test_interleaved_utterances_keep_separate_tails():
+    cfg = WorkloadConfig(utterances=40, seed=5)
+    msgs = synthetic_asr_stream(cfg)
+    cleaner = StreamingCleaner()
+    got = {}
+    for m in cleaner.stream(msgs):
+        if m.event == "PART" and m.text:
+            got.setdefault(m.id, []).append(m.text)
+    reference = StreamingCleaner()
+    by_id = {}
+    for m in msgs:
+        if m.event == "PART":
+            by_id.setdefault(m.id, []).append(m.text)
+    for utt_id, chunks in by_id.items():
+        assert " ".join(got.get(utt_id, [])) == reference.clean_text(" ".join(chunks))
+
+
+def test_out_of_order_chunk_is_cleaned_alone():
+    cleaner = StreamingCleaner()
+    msgs = [PipelineMessage(id="u", chunk_index=i, text=t, event="PART")
+            for i, t in [(0, "I went"), (1, "went home"), (1, "um went home")]]
+    assert [m.text for m in cleaner.stream(msgs)] == ["I went", "home", "went home"]
+
+
+def test_async_stream_and_message_types():
+    async def source():
+        for m in _utterance(["um I", "I you", "know it"], cls=FastMessage):
+            yield m
+
+    async def collect():
+        return [m async for m in StreamingCleaner().astream(source())]
+
+    out = asyncio.run(collect())
+    assert all(type(m) is FastMessage for m in out)
+    assert _joined(out) == "I it"
+
+
+def test_pipeline_with_orchestrator():
+    msgs = _utterance(["um I", "I really want", "to go you", "know"])
+    msgs[-1].end_of_speech_time = time.time()
+    orch = PipelineOrchestrator(tone_mode="neutral")
+    cleaner = StreamingCleaner()
+    pipe = (StreamPipeline()
+            .stage("cleaner", cleaner.stream)
+            .stage("grammar", grammar_stream)
+            .stage("tone", orch.stream))
+    finals = [o for o in pipe.run(msgs) if o.event == "END_TONE"]
+    assert [f.text for f in finals] == ["I. Really want. To go."]
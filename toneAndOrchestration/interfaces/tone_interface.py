@@ -1,6 +1,11 @@
 # interfaces/tone_interface.py
 from abc import ABC, abstractmethod
-from schemas.pipeline_message import PipelineMessage
+from typing import TYPE_CHECKING
+
+from schemas.pipeline_message import AnyMessage
+
+if TYPE_CHECKING:
+    from schemas.pipeline_model import PipelineMessage
 
 
 class ToneInterface(ABC):
@@ -10,7 +15,7 @@ class ToneInterface(ABC):
     """
 
     @abstractmethod
-    def process_chunk(self, message: PipelineMessage) -> PipelineMessage:
+    def process_chunk(self, message: AnyMessage) -> AnyMessage:
         """
         Called for every PART chunk from the grammar module.
         Should optionally tone-transform and return a PipelineMessage.
@@ -18,7 +23,7 @@ class ToneInterface(ABC):
         pass
 
     @abstractmethod
-    def finalize(self, utterance_id: str) -> PipelineMessage:
+    def finalize(self, utterance_id: str) -> "PipelineMessage":
         """
         Called when END_GRAMMAR event arrives.
         Should assemble all chunks and produce a final END_TONE message.
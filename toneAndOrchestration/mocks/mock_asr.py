@@ -1,15 +1,33 @@
 # mocks/mock_asr.py
-from typing import List
-from schemas.pipeline_message import PipelineMessage
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Type
+from schemas.pipeline_message import AnyMessage, PipelineMessage
 
+# Default vocabulary for synthetic workloads: words the tone rules and the
+# mock cleaner act on, mixed with plain filler text
+VOCABULARY: Tuple[str, ...] = (
+    "um", "uh", "like", "you know", "I", "I", "really", "very", "kind of",
+    "i'm", "gonna", "wanna", "thanks", "thank you", "can't", "don't", "need",
+    "help", "assistance", "please", "the", "order", "call", "meeting", "today",
+    "tomorrow", "is", "was", "important", "this", "that", "we", "you", "to",
+    "for", "coming", "maybe", "I think", "just", "check", "account", "later",
+)
 
-def mock_asr_stream(utt_id: str) -> List[PipelineMessage]:
+
+def mock_asr_stream(
+    utt_id: str,
+    message_cls: Type[AnyMessage] = PipelineMessage,
+    end_of_speech_time: Optional[float] = None,
+) -> List[AnyMessage]:
     """
     Simulate ASR output for one utterance as streaming chunks.
     Includes a small repetition and fillers for downstream modules to fix.
+    message_cls picks PipelineMessage (default) or the slotted FastMessage;
+    end_of_speech_time is set on the END_ASR marker.
     """
     chunks = [
-        PipelineMessage(
+        message_cls(
             id=utt_id,
             chunk_index=0,
             text="um I I really want to",
@@ -17,7 +35,7 @@ def mock_asr_stream(utt_id: str) -> List[PipelineMessage]:
             is_final=False,
             end_of_speech_time=None,
         ),
-        PipelineMessage(
+        message_cls(
             id=utt_id,
             chunk_index=1,
             text="thank you for coming you know",
@@ -25,7 +43,7 @@ def mock_asr_stream(utt_id: str) -> List[PipelineMessage]:
             is_final=False,
             end_of_speech_time=None,
         ),
-        PipelineMessage(
+        message_cls(
             id=utt_id,
             chunk_index=2,
             text="this is like really important",
@@ -36,13 +54,73 @@ def mock_asr_stream(utt_id: str) -> List[PipelineMessage]:
     ]
 
     # End of speech marker with end_of_speech_time
-    end_msg = PipelineMessage(
+    end_msg = message_cls(
         id=utt_id,
         chunk_index=-1,
         text="",
         event="END_ASR",
         is_final=True,
-        end_of_speech_time=None,  # can be filled later by test or orchestrator
+        end_of_speech_time=end_of_speech_time,
     )
 
     return chunks + [end_msg]
+
+
+@dataclass
+class WorkloadConfig:
+    """Shape of a synthetic ASR workload (see synthetic_asr_stream)."""
+
+    utterances: int = 100
+    chunks_per_utterance: Tuple[int, int] = (2, 6)  # inclusive range
+    words_per_chunk: Tuple[int, int] = (3, 10)      # inclusive range
+    vocabulary: Sequence[str] = VOCABULARY
+    interleave: bool = True     # mix utterances, keeping each one's order
+    seed: int = 0
+    end_of_speech_time: Optional[float] = None  # set on every END_ASR
+    tone_modes: Sequence[str] = ()  # if set, each utterance gets a random tone_mode
+
+
+def synthetic_asr_stream(
+    config: WorkloadConfig, message_cls: Type[AnyMessage] = PipelineMessage
+) -> List[AnyMessage]:
+    """
+    Many utterances shaped like mock_asr_stream (PART chunks + END_ASR),
+    generated reproducibly from config.seed. With interleave, messages of
+    different utterances are randomly mixed as on a shared connection.
+    """
+    rng = random.Random(config.seed)
+    per_utt: List[List[AnyMessage]] = []
+    for u in range(config.utterances):
+        utt_id = f"utt_{u}"
+        tone_mode = rng.choice(config.tone_modes) if config.tone_modes else None
+        msgs: List[AnyMessage] = []
+        for i in range(rng.randint(*config.chunks_per_utterance)):
+            words = rng.choices(config.vocabulary, k=rng.randint(*config.words_per_chunk))
+            msgs.append(
+                message_cls(id=utt_id, chunk_index=i, text=" ".join(words), event="PART", tone_mode=tone_mode)
+            )
+        msgs.append(
+            message_cls(
+                id=utt_id,
+                chunk_index=-1,
+                text="",
+                event="END_ASR",
+                is_final=True,
+                end_of_speech_time=config.end_of_speech_time,
+                tone_mode=tone_mode,
+            )
+        )
+        per_utt.append(msgs)
+
+    if not config.interleave:
+        return [m for msgs in per_utt for m in msgs]
+
+    # pick the next utterance weighted by what it has left: uniform over messages
+    out: List[AnyMessage] = []
+    cursors = [0] * len(per_utt)
+    tickets = [u for u, msgs in enumerate(per_utt) for _ in msgs]
+    rng.shuffle(tickets)
+    for u in tickets:
+        out.append(per_utt[u][cursors[u]])
+        cursors[u] += 1
+    return out
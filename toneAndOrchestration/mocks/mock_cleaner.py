@@ -1,50 +1,76 @@
 # mocks/mock_cleaner.py
-from typing import List
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
 import re
-from schemas.pipeline_message import PipelineMessage
+from schemas.pipeline_message import AnyMessage
 
 FILLERS = ["um", "uh", "you know", "like"]
 
+# Compiled once. Chunks are cleaned one at a time; see
+# cleaner_module.streaming_cleaner for a stage that also handles chunk joins.
+_FILLER_RE = re.compile(r"\b(" + "|".join(re.escape(w) for w in FILLERS) + r")\b", flags=re.IGNORECASE)
+_REPETITION_RE = re.compile(r"\b(\w+)\s+\1\b", flags=re.IGNORECASE)
+
 
 def _remove_fillers(text: str) -> str:
-    pattern = re.compile(r"\b(" + "|".join(re.escape(w) for w in FILLERS) + r")\b", flags=re.IGNORECASE)
-    return pattern.sub("", text).replace("  ", " ").strip()
+    return _FILLER_RE.sub("", text).replace("  ", " ").strip()
 
 
 def _fix_simple_repetition(text: str) -> str:
     # collapse "I I" -> "I", "really really" -> "really"
-    return re.sub(r"\b(\w+)\s+\1\b", r"\1", text, flags=re.IGNORECASE)
+    return _REPETITION_RE.sub(r"\1", text)
 
 
-def mock_cleaner_stage(messages: List[PipelineMessage]) -> List[PipelineMessage]:
+def clean_message(msg: AnyMessage) -> Optional[AnyMessage]:
     """
-    Take ASR messages and output cleaned messages (still PART + one END_CLEAN).
+    Clean one ASR message: PART -> cleaned PART, END_ASR -> END_CLEAN,
+    anything else -> None. The output has the same type as msg.
     """
-    out: List[PipelineMessage] = []
+    cls = type(msg)
+    if msg.event == "PART":
+        t = _remove_fillers(msg.text)
+        t = _fix_simple_repetition(t)
+        return cls(
+            id=msg.id,
+            chunk_index=msg.chunk_index,
+            text=t.strip(),
+            event="PART",
+            is_final=msg.is_final,
+            end_of_speech_time=msg.end_of_speech_time,
+            tone_mode=msg.tone_mode,
+        )
+    if msg.event == "END_ASR":
+        # propagate end event as END_CLEAN, copying time if present
+        return cls(
+            id=msg.id,
+            chunk_index=-1,
+            text="",
+            event="END_CLEAN",
+            is_final=True,
+            end_of_speech_time=msg.end_of_speech_time,
+            tone_mode=msg.tone_mode,
+        )
+    return None
+
+
+def clean_stream(messages: Iterable[AnyMessage]) -> Iterator[AnyMessage]:
+    """Generator stage: yields each cleaned message as soon as its input arrives."""
     for msg in messages:
-        if msg.event == "PART":
-            t = _remove_fillers(msg.text)
-            t = _fix_simple_repetition(t)
-            out.append(
-                PipelineMessage(
-                    id=msg.id,
-                    chunk_index=msg.chunk_index,
-                    text=t.strip(),
-                    event="PART",
-                    is_final=msg.is_final,
-                    end_of_speech_time=msg.end_of_speech_time,
-                )
-            )
-        elif msg.event == "END_ASR":
-            # propagate end event as END_CLEAN, copying time if present
-            out.append(
-                PipelineMessage(
-                    id=msg.id,
-                    chunk_index=-1,
-                    text="",
-                    event="END_CLEAN",
-                    is_final=True,
-                    end_of_speech_time=msg.end_of_speech_time,
-                )
-            )
-    return out
+        out = clean_message(msg)
+        if out is not None:
+            yield out
+
+
+async def aclean_stream(messages: AsyncIterable[AnyMessage]) -> AsyncIterator[AnyMessage]:
+    """Async-generator version of clean_stream."""
+    async for msg in messages:
+        out = clean_message(msg)
+        if out is not None:
+            yield out
+
+
+def mock_cleaner_stage(messages: List[AnyMessage]) -> List[AnyMessage]:
+    """
+    Take ASR messages and output cleaned messages (still PART + one END_CLEAN).
+    Outputs use the same message type (PipelineMessage or FastMessage) as inputs.
+    """
+    return list(clean_stream(messages))
@@ -1,7 +1,8 @@
 # mocks/mock_grammar.py
-from typing import List
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
 import re
-from schemas.pipeline_message import PipelineMessage
+from mocks.mock_cleaner import clean_stream
+from schemas.pipeline_message import AnyMessage
 
 
 def _basic_punctuate(text: str) -> str:
@@ -21,34 +22,63 @@ def _basic_punctuate(text: str) -> str:
     return t
 
 
-def mock_grammar_stage(messages: List[PipelineMessage]) -> List[PipelineMessage]:
+def grammar_message(msg: AnyMessage) -> Optional[AnyMessage]:
+    """
+    Punctuate one cleaned message: PART -> PART, END_CLEAN -> END_GRAMMAR,
+    anything else -> None. The output has the same type as msg.
+    """
+    cls = type(msg)
+    if msg.event == "PART":
+        return cls(
+            id=msg.id,
+            chunk_index=msg.chunk_index,
+            text=_basic_punctuate(msg.text),
+            event="PART",
+            is_final=msg.is_final,
+            end_of_speech_time=msg.end_of_speech_time,
+            tone_mode=msg.tone_mode,
+        )
+    if msg.event == "END_CLEAN":
+        return cls(
+            id=msg.id,
+            chunk_index=-1,
+            text="",
+            event="END_GRAMMAR",
+            is_final=True,
+            end_of_speech_time=msg.end_of_speech_time,
+            tone_mode=msg.tone_mode,
+        )
+    return None
+
+
+def grammar_stream(messages: Iterable[AnyMessage]) -> Iterator[AnyMessage]:
+    """Generator stage: yields each corrected message as soon as its input arrives."""
+    for msg in messages:
+        out = grammar_message(msg)
+        if out is not None:
+            yield out
+
+
+async def agrammar_stream(messages: AsyncIterable[AnyMessage]) -> AsyncIterator[AnyMessage]:
+    """Async-generator version of grammar_stream."""
+    async for msg in messages:
+        out = grammar_message(msg)
+        if out is not None:
+            yield out
+
+
+def mock_grammar_stage(messages: List[AnyMessage]) -> List[AnyMessage]:
     """
     Take cleaned messages and add simple punctuation/capitalization.
     Converts END_CLEAN into END_GRAMMAR.
+    Outputs use the same message type (PipelineMessage or FastMessage) as inputs.
     """
-    out: List[PipelineMessage] = []
-    for msg in messages:
-        if msg.event == "PART":
-            t = _basic_punctuate(msg.text)
-            out.append(
-                PipelineMessage(
-                    id=msg.id,
-                    chunk_index=msg.chunk_index,
-                    text=t,
-                    event="PART",
-                    is_final=msg.is_final,
-                    end_of_speech_time=msg.end_of_speech_time,
-                )
-            )
-        elif msg.event == "END_CLEAN":
-            out.append(
-                PipelineMessage(
-                    id=msg.id,
-                    chunk_index=-1,
-                    text="",
-                    event="END_GRAMMAR",
-                    is_final=True,
-                    end_of_speech_time=msg.end_of_speech_time,
-                )
-            )
-    return out
+    return list(grammar_stream(messages))
+
+
+def mock_upstream_stages(asr_messages: Iterable[AnyMessage]) -> List[AnyMessage]:
+    """
+    Run ASR messages through the mock cleaner and grammar stages: what the
+    tone orchestrator consumes (PARTs and END_GRAMMAR, in the input's type).
+    """
+    return list(grammar_stream(clean_stream(asr_messages)))
@@ -0,0 +1,106 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Deque, Dict, List, Optional, Set
+
+from schemas.pipeline_message import PipelineMessage
+from orchestrator.orchestrator import PipelineOrchestrator
+
+_DONE = object()
+
+
+class AsyncPipelineOrchestrator:
+    """
+    Asyncio front-end for PipelineOrchestrator.
+
+    Consumes an async stream of grammar messages from many interleaved
+    utterances and yields PREVIEW_TONE / END_TONE messages as they are
+    produced. Messages of one utterance are handled strictly in order by a
+    single drain task; up to max_concurrency utterances are drained at once.
+
+    Backpressure: at most max_pending input messages are buffered before
+    reading from the source pauses, and at most output_queue_size results
+    wait for the consumer before the drain tasks pause.
+    """
+
+    def __init__(
+        self,
+        tone_mode: str = "neutral",
+        max_concurrency: int = 64,
+        max_pending: int = 1024,
+        output_queue_size: int = 1024,
+        orchestrator: Optional[PipelineOrchestrator] = None,
+    ):
+        if max_concurrency < 1 or max_pending < 1 or output_queue_size < 1:
+            raise ValueError("max_concurrency, max_pending and output_queue_size must be >= 1")
+        self.orchestrator = orchestrator or PipelineOrchestrator(tone_mode=tone_mode)
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.output_queue_size = output_queue_size
+        # Highest number of utterances drained at the same time
+        self.peak_concurrency = 0
+        self._active = 0
+
+    async def stream(self, messages: AsyncIterable[PipelineMessage]) -> AsyncIterator[PipelineMessage]:
+        out: asyncio.Queue = asyncio.Queue(maxsize=self.output_queue_size)
+        pending = asyncio.Semaphore(self.max_pending)
+        slots = asyncio.Semaphore(self.max_concurrency)
+        inboxes: Dict[str, Deque[PipelineMessage]] = {}
+        workers: Set[asyncio.Task] = set()
+        errors: List[BaseException] = []
+
+        def on_worker_done(task: asyncio.Task):
+            workers.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                # stop reading input; the consumer re-raises the error
+                errors.append(task.exception())
+                feeder.cancel()
+
+        async def drain(utt_id: str):
+            async with slots:
+                self._active += 1
+                self.peak_concurrency = max(self.peak_concurrency, self._active)
+                try:
+                    box = inboxes[utt_id]
+                    while box:
+                        msg = box.popleft()
+                        result = self.orchestrator.process_message(msg)
+                        if result is not None:
+                            await out.put(result)
+                        pending.release()
+                        # let other utterances interleave
+                        await asyncio.sleep(0)
+                    # no await since the last emptiness check: safe to drop
+                    del inboxes[utt_id]
+                finally:
+                    self._active -= 1
+
+        async def feed():
+            try:
+                async for msg in messages:
+                    await pending.acquire()
+                    box = inboxes.get(msg.id)
+                    if box is None:
+                        box = inboxes[msg.id] = deque()
+                        task = asyncio.create_task(drain(msg.id))
+                        workers.add(task)
+                        task.add_done_callback(on_worker_done)
+                    box.append(msg)
+                while workers:
+                    await asyncio.gather(*list(workers))
+            finally:
+                await out.put(_DONE)
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                item = await out.get()
+                if item is _DONE:
+                    break
+                yield item
+            if errors:
+                raise errors[0]
+            await feeder  # re-raise any error from the source
+        finally:
+            feeder.cancel()
+            for task in list(workers):
+                task.cancel()
@@ -0,0 +1,157 @@
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from tone_module.sentiment import SentimentAnalyzer
+
+AUTO_MODES = ("formal", "casual", "concise")
+
+
+class ToneDecision:
+    """
+    Running features and the current tone choice for one utterance.
+    Updated on every PART, so END_GRAMMAR just reads .mode. A revised chunk
+    replaces what its earlier version contributed instead of adding to it.
+    """
+
+    __slots__ = ("mode", "words", "chunks", "polarity_sum", "scored_words",
+                 "scored", "sampled", "skipped", "sentiment_ns", "switches", "by_chunk")
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.words = 0            # words seen in all chunks
+        self.chunks = 0
+        self.polarity_sum = 0.0   # polarity weighted by scored words
+        self.scored_words = 0
+        self.scored = 0           # chunks scored in full
+        self.sampled = 0          # chunks scored on a word sample (budget used up)
+        self.skipped = 0          # chunks not scored (budget used up)
+        self.sentiment_ns = 0     # time spent in sentiment scoring
+        self.switches = 0         # mode changes after the first chunk
+        # chunk index -> (text, words, polarity * scored words, scored words)
+        self.by_chunk: Dict[int, Tuple[str, int, float, int]] = {}
+
+    @property
+    def polarity(self) -> float:
+        return self.polarity_sum / self.scored_words if self.scored_words else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "polarity": self.polarity,
+            "words": self.words,
+            "chunks": self.chunks,
+            "scored": self.scored,
+            "sampled": self.sampled,
+            "skipped": self.skipped,
+            "sentiment_ms": self.sentiment_ns / 1e6,
+            "switches": self.switches,
+        }
+
+
+class AutoToneSelector:
+    """
+    Picks formal, casual or concise per utterance from streaming features:
+      - long utterances (> long_words words)   -> concise
+      - negative sentiment (< negative)        -> formal (polite, de-escalating)
+      - positive sentiment (> positive)        -> casual
+      - otherwise                              -> default_mode
+
+    Sentiment is budgeted per utterance: until budget_ms of scoring time is
+    used every chunk is scored; after that only every sample_every-th chunk
+    is, on its first sample_words words, and the rest are skipped.
+    Finished decisions are kept in history (most recent history_size).
+    """
+
+    def __init__(
+        self,
+        analyzer: Optional[SentimentAnalyzer] = None,
+        budget_ms: float = 2.0,
+        sample_every: int = 4,
+        sample_words: int = 12,
+        long_words: int = 60,
+        negative: float = -0.15,
+        positive: float = 0.15,
+        default_mode: str = "formal",
+        history_size: int = 1024,
+    ):
+        if default_mode not in AUTO_MODES:
+            raise ValueError(f"default_mode must be one of {AUTO_MODES}")
+        self.analyzer = analyzer or SentimentAnalyzer()
+        self.budget_ns = int(budget_ms * 1e6)
+        self.sample_every = max(1, sample_every)
+        self.sample_words = sample_words
+        self.long_words = long_words
+        self.negative = negative
+        self.positive = positive
+        self.default_mode = default_mode
+        self.history: Deque[Tuple[str, dict]] = deque(maxlen=history_size)
+
+    def start(self) -> ToneDecision:
+        return ToneDecision(self.default_mode)
+
+    def observe(self, decision: ToneDecision, text: str, chunk_index: Optional[int] = None) -> str:
+        """
+        Fold one chunk into the features; returns the (possibly new) mode.
+        With chunk_index, a chunk seen before is a revision: its earlier
+        version's words and sentiment are taken out first (an identical
+        resend changes nothing).
+        """
+        if chunk_index is not None:
+            previous = decision.by_chunk.get(chunk_index)
+            if previous is not None:
+                if previous[0] == text:
+                    return decision.mode
+                _, n, weighted, scored_words = previous
+                decision.words -= n
+                decision.polarity_sum -= weighted
+                decision.scored_words -= scored_words
+                decision.chunks -= 1
+        words = text.split()
+        n = len(words)
+        decision.words += n
+        decision.chunks += 1
+        weighted = 0.0
+        scored_words = 0
+
+        if words:
+            if decision.sentiment_ns < self.budget_ns:
+                sample = text
+                decision.scored += 1
+            elif decision.chunks % self.sample_every == 0:
+                words = words[: self.sample_words]
+                sample = " ".join(words)
+                decision.sampled += 1
+            else:
+                sample = None
+                decision.skipped += 1
+            if sample is not None:
+                t0 = time.perf_counter_ns()
+                polarity = self.analyzer.polarity(sample)
+                decision.sentiment_ns += time.perf_counter_ns() - t0
+                weighted = polarity * len(words)
+                scored_words = len(words)
+                decision.polarity_sum += weighted
+                decision.scored_words += scored_words
+        if chunk_index is not None:
+            decision.by_chunk[chunk_index] = (text, n, weighted, scored_words)
+
+        mode = self.decide(decision)
+        if mode != decision.mode:
+            if decision.chunks > 1:
+                decision.switches += 1
+            decision.mode = mode
+        return mode
+
+    def decide(self, decision: ToneDecision) -> str:
+        if decision.words > self.long_words:
+            return "concise"
+        polarity = decision.polarity
+        if polarity < self.negative:
+            return "formal"
+        if polarity > self.positive:
+            return "casual"
+        return self.default_mode
+
+    def finish(self, utt_id: str, decision: ToneDecision):
+        self.history.append((utt_id, decision.as_dict()))
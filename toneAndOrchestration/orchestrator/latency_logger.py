@@ -1,15 +1,161 @@
+import threading
 import time
+from typing import Dict, List
+
+# -----------------------------------------
+# Histogram buckets: log-linear over nanoseconds (HDR-style).
+# Values below 2 * SUB_BUCKETS ns get one bucket each; above that every
+# power of two is split into SUB_BUCKETS buckets, so a bucket is at most
+# 1/16 (~6%) wider than its lower bound.
+# -----------------------------------------
+SUB_BITS = 4
+SUB_BUCKETS = 1 << SUB_BITS
+NUM_BUCKETS = (64 - SUB_BITS) * SUB_BUCKETS
+
+
+def bucket_index(ns: int) -> int:
+    if ns < 2 * SUB_BUCKETS:
+        return max(ns, 0)
+    shift = ns.bit_length() - (SUB_BITS + 1)
+    return (shift + 1) * SUB_BUCKETS + (ns >> shift) - SUB_BUCKETS
+
+
+def bucket_upper(index: int) -> int:
+    """Largest value (ns) that falls in bucket index."""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift) - 1
+
+
+class _Shard:
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram. Each thread records into its own shard,
+    so record() takes no lock; snapshot() sums the shards. Percentiles are
+    reported as the upper edge of their bucket (never under-reported),
+    capped at the largest value seen.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._lock = threading.Lock()  # only for adding shards / reading them
+
+    def _shard(self) -> _Shard:
+        shard = _Shard()
+        self._local.shard = shard
+        with self._lock:
+            self._shards.append(shard)
+        return shard
+
+    def record(self, ns: int):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard.counts[bucket_index(ns)] += 1
+        shard.count += 1
+        shard.total_ns += ns
+        if ns > shard.max_ns:
+            shard.max_ns = ns
+
+    def reset(self):
+        with self._lock:
+            self._shards = []
+            self._local = threading.local()
+
+    def snapshot(self, percentiles=(50, 95, 99)) -> Dict[str, float]:
+        """count, mean/max and requested percentiles, all in milliseconds."""
+        with self._lock:
+            shards = list(self._shards)
+        count = sum(s.count for s in shards)
+        out: Dict[str, float] = {"count": count}
+        if not count:
+            return out
+        counts = [sum(col) for col in zip(*(s.counts for s in shards))]
+        out["mean_ms"] = sum(s.total_ns for s in shards) / count / 1e6
+        max_ns = max(s.max_ns for s in shards)
+        out["max_ms"] = max_ns / 1e6
+        for p in percentiles:
+            rank = p / 100 * count
+            seen = 0
+            for index, n in enumerate(counts):
+                seen += n
+                if n and seen >= rank:
+                    break
+            out[f"p{p}_ms"] = min(bucket_upper(index), max_ns) / 1e6
+        return out
+
+
+class LatencyMetrics:
+    """
+    Named latency histograms, one per pipeline stage. Pass an instance to
+    PipelineOrchestrator(metrics=...) to turn instrumentation on; with
+    metrics=None the hot path only pays an `is None` check.
+    """
+
+    # stages recorded by the orchestrator
+    PREVIEW_TRANSFORM = "preview_transform"  # tone of one PART chunk
+    ASSEMBLY = "assembly"                    # folding the chunk into the utterance
+    FINAL_TRANSFORM = "final_transform"      # END_GRAMMAR: building the final text
+    END_TO_END = "end_to_end"                # end of speech -> END_TONE emitted
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        hist = self.histograms.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(stage, LatencyHistogram())
+        return hist
+
+    def record(self, stage: str, ns: int):
+        self.histogram(stage).record(ns)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """{stage: {count, mean_ms, max_ms, p50_ms, p95_ms, p99_ms}}"""
+        return {stage: hist.snapshot() for stage, hist in list(self.histograms.items())}
+
+    def reset(self):
+        for hist in list(self.histograms.values()):
+            hist.reset()
+
+
+def since_end_of_speech_ns(end_of_speech_time: float) -> int:
+    """Wall time since end_of_speech_time (epoch seconds, as set by ASR)."""
+    return time.time_ns() - int(end_of_speech_time * 1e9)
+
 
 class LatencyLogger:
+    """
+    Per-utterance latency line. Kept for existing callers; printing on every
+    utterance is costly at volume, so log() is silent unless verbose is set.
+    Use LatencyMetrics for aggregated numbers.
+    """
+
+    verbose = False
+
     @staticmethod
     def compute_latency(end_of_speech_time: float) -> float:
         """
-        end_of_speech_time is provided by ASR.
+        end_of_speech_time is provided by ASR in epoch seconds (time.time()).
         Return computed wall time latency in milliseconds.
         """
-        now = time.time() * 1000  # ms
-        return now - end_of_speech_time
+        return since_end_of_speech_ns(end_of_speech_time) / 1e6
 
     @staticmethod
     def log(label: str, latency_ms: float):
-        print(f"[LATENCY] {label}: {latency_ms:.2f} ms")
+        if LatencyLogger.verbose:
+            print(f"[LATENCY] {label}: {latency_ms:.2f} ms")
@@ -1,8 +1,15 @@
-from typing import Dict, Optional
-from schemas.pipeline_message import PipelineMessage
-from tone_module.transformer import ToneTransformer
+import time
+from time import perf_counter_ns
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Set, Type
+from schemas.pipeline_message import AnyMessage, model_class
+from tone_module.cache import TransformCache
+from tone_module.chunk_buffer import ChunkBuffer
+from tone_module.rule_engine import ToneRuleSet
+from tone_module.state_store import UtteranceStore
+from tone_module.transformer import MODES, ToneTransformer
+from orchestrator.auto_tone import AutoToneSelector
 from orchestrator.state import UtteranceState
-from orchestrator.latency_logger import LatencyLogger
+from orchestrator.latency_logger import LatencyLogger, LatencyMetrics, since_end_of_speech_ns
 
 
 class PipelineOrchestrator:
@@ -10,40 +17,215 @@ class PipelineOrchestrator:
     Consumes grammar-corrected PipelineMessage chunks,
     buffers them per utterance, applies tone transformation,
     and emits partial + final outputs.
+
+    With incremental_finalize (default), each PART's tone result is cached
+    and END_GRAMMAR splices the cached chunks, re-transforming only where a
+    multi-word rule spans a chunk boundary. Output is identical to
+    re-transforming the assembled text.
+
+    Utterances that never reach END_GRAMMAR are bounded by max_utterances
+    (least recently active evicted first) and utterance_ttl (seconds idle).
+    on_evict(utt_id, state, reason) is called for each one dropped; pass
+    finalize_state(utt_id, state) to it to force-finalize instead of discard.
+
+    tone_cache memoizes PREVIEW_TONE results of repeated chunks.
+
+    metrics (a LatencyMetrics) records per-stage latency histograms:
+    preview transform, assembly, final transform and end-to-end.
+
+    With stable_previews, PREVIEW_TONE carries only the newly stabilized
+    span of the contiguous chunk prefix (chunk_index = its first chunk);
+    chunks after a gap wait for it to fill. A changed chunk that was already
+    previewed gets a REVISION_TONE with its new preview; identical resends
+    emit nothing. Spans stabilizing within preview_window seconds of the
+    last preview are held and sent together with the next one, or by
+    flush_previews(); END_TONE supersedes anything still held.
+
+    tone_mode is the default; a message's tone_mode overrides it for its
+    utterance (kept in state.tone_mode), so one orchestrator serves every
+    mode. The mode lives only in per-utterance state and the transformer's
+    compiled rules are read-only, so utterances fed from different threads
+    do not interfere (each utterance from one thread at a time).
+
+    Mode "auto" picks formal, casual or concise per utterance with
+    auto_tone (an AutoToneSelector), updated on every PART from its
+    sentiment and length. When the choice changes mid-utterance the cached
+    chunk results are rebuilt for the new mode right away, so END_GRAMMAR
+    stays a splice. The live choice is state.tone_decision; finished ones
+    are in auto_tone.history.
+
+    rules replaces the built-in tone rule tables (e.g. a loaded rule pack).
+    Assigning tone_transformer.rules later (see rule_packs.RulePackReloader)
+    applies to new utterances; ones already assembling keep their rules.
     """
 
-    def __init__(self, tone_mode="neutral"):
+    def __init__(
+        self,
+        tone_mode="neutral",
+        incremental_finalize: bool = True,
+        max_utterances: Optional[int] = None,
+        utterance_ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[str, UtteranceState, str], None]] = None,
+        tone_cache: Optional[TransformCache] = None,
+        metrics: Optional[LatencyMetrics] = None,
+        stable_previews: bool = False,
+        preview_window: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        auto_tone: Optional[AutoToneSelector] = None,
+        rules: Optional[ToneRuleSet] = None,
+    ):
         self.tone_mode = tone_mode
-        self.tone_transformer = ToneTransformer(mode=tone_mode)
-        self.state_by_id: Dict[str, UtteranceState] = {}
+        self.metrics = metrics
+        self.stable_previews = stable_previews
+        self.preview_window = preview_window
+        self.clock = clock
+        self._held_previews: Set[str] = set()  # utterances with a held span
+        self.incremental_finalize = incremental_finalize
+        # created on first use unless tone_mode is "auto" or one is given
+        self.auto_tone = auto_tone or (AutoToneSelector() if tone_mode == "auto" else None)
+        # One transformer for every mode: the mode is passed per call
+        default_mode = self.auto_tone.default_mode if tone_mode == "auto" else tone_mode
+        self.tone_transformer = ToneTransformer(mode=default_mode, rules=rules, cache=tone_cache, metrics=metrics)
+        self.state_by_id: UtteranceStore[UtteranceState] = UtteranceStore(
+            max_size=max_utterances, ttl=utterance_ttl, on_evict=on_evict
+        )
+
+    def warmup(self, modes: Optional[Iterable[str]] = None, models: bool = True) -> "PipelineOrchestrator":
+        """
+        Optional prewarm for latency-sensitive starts. Loads now what is
+        otherwise imported on first use: the rewrite steps of modes (default:
+        all), the sentiment backend if auto_tone is set and, with models,
+        pydantic for PipelineMessage.
+        """
+        self.tone_transformer.warmup(modes or MODES)
+        if self.auto_tone is not None:
+            self.auto_tone.analyzer.warmup()
+        if models:
+            model_class()
+        return self
 
     def _get_state(self, utt_id: str) -> UtteranceState:
-        if utt_id not in self.state_by_id:
-            self.state_by_id[utt_id] = UtteranceState()
-        return self.state_by_id[utt_id]
+        return self.state_by_id.get_or_create(utt_id, UtteranceState)
+
+    def _mode(self, state: UtteranceState) -> str:
+        """Tone mode currently applied to an utterance."""
+        if state.tone_decision is not None:
+            return state.tone_decision.mode
+        mode = state.tone_mode or self.tone_mode
+        return self.tone_transformer.mode if mode == "auto" else mode
+
+    def _part_mode(self, state: UtteranceState, msg: AnyMessage) -> str:
+        """Resolve the mode for a PART; rebuilds the cached chunk tones if it changed."""
+        if msg.tone_mode:
+            state.tone_mode = msg.tone_mode.lower()
+        elif state.tone_mode is None:
+            state.tone_mode = self.tone_mode
+        if state.tone_mode == "auto":
+            if self.auto_tone is None:
+                self.auto_tone = AutoToneSelector()
+            decision = state.tone_decision
+            if decision is None:
+                decision = state.tone_decision = self.auto_tone.start()
+            mode = self.auto_tone.observe(decision, msg.text, msg.chunk_index)
+        else:
+            state.tone_decision = None
+            mode = state.tone_mode
+        assembly = state.assembly
+        if assembly is not None and assembly.mode != mode:
+            transformer = self.tone_transformer
+            assembly = state.assembly = transformer.start_assembly(mode)
+            for index, chunk in state.chunks.items():
+                assembly.add(index, transformer.transform_chunk(chunk, mode, assembly.rules))
+        return mode
+
+    def _final_text(self, state: UtteranceState) -> str:
+        # Reuse the per-chunk tone results cached during PARTs
+        if state.assembly is not None:
+            toned = state.assembly.result()
+        else:
+            # Assemble full text and apply full tone transformation
+            full_text = state.assemble_full_text()
+            toned = self.tone_transformer._tone_transform(full_text, self._mode(state))
+
+        # Ensure final text ends with a period
+        # (Safe UI formatting, not grammar correction)
+        if not toned.endswith("."):
+            toned += "."
+        return toned
+
+    def finalize_state(
+        self, utt_id: str, state: UtteranceState, message_cls: Optional[Type[AnyMessage]] = None
+    ) -> AnyMessage:
+        """
+        END_TONE for whatever an (evicted) utterance received so far,
+        without END_GRAMMAR. Does not log latency or touch state_by_id.
+        message_cls defaults to PipelineMessage.
+        """
+        return (message_cls or model_class())(
+            id=utt_id,
+            chunk_index=0,
+            text=self._final_text(state),
+            event="END_TONE",
+            is_final=True,
+            end_of_speech_time=state.end_of_speech_time,
+            tone_mode=self._mode(state),
+        )
 
     # ----------------------------------------------------------
     # MAIN ENTRYPOINT — Process incoming grammar chunks
     # ----------------------------------------------------------
-    def process_message(self, msg: PipelineMessage) -> Optional[PipelineMessage]:
+    def process_message(self, msg: AnyMessage) -> Optional[AnyMessage]:
+        """
+        Accepts PipelineMessage or FastMessage; outputs use the same type.
+        """
+        cls = type(msg)
+        metrics = self.metrics
         state = self._get_state(msg.id)
 
         # ----------------------
         # PART EVENT (streaming)
         # ----------------------
         if msg.event == "PART":
-            state.add_chunk(msg.chunk_index, msg.text)
-
+            mode = self._part_mode(state, msg)
+            transformer = self.tone_transformer
             # Apply CHUNK-LEVEL tone transformation for preview
-            preview = self.tone_transformer._tone_transform(msg.text)
+            # (no assembly once chunks were absorbed without one)
+            if self.incremental_finalize and (state.assembly is not None or not state.chunks):
+                assembly = state.assembly
+                if assembly is None:
+                    # pinned to the current rules until END_GRAMMAR
+                    assembly = state.assembly = transformer.start_assembly(mode)
+                if metrics is None:
+                    tone = transformer.transform_chunk(msg.text, mode, assembly.rules)
+                    state.add_chunk(msg.chunk_index, msg.text, tone)
+                else:
+                    t0 = perf_counter_ns()
+                    tone = transformer.transform_chunk(msg.text, mode, assembly.rules)
+                    t1 = perf_counter_ns()
+                    state.add_chunk(msg.chunk_index, msg.text, tone)
+                    metrics.record(LatencyMetrics.PREVIEW_TRANSFORM, t1 - t0)
+                    metrics.record(LatencyMetrics.ASSEMBLY, perf_counter_ns() - t1)
+                preview = tone.text
+            else:
+                state.add_chunk(msg.chunk_index, msg.text)
+                if metrics is None:
+                    preview = transformer._tone_transform(msg.text, mode)
+                else:
+                    t0 = perf_counter_ns()
+                    preview = transformer._tone_transform(msg.text, mode)
+                    metrics.record(LatencyMetrics.PREVIEW_TRANSFORM, perf_counter_ns() - t0)
 
-            return PipelineMessage(
+            if self.stable_previews:
+                return self._stable_preview(cls, msg.id, msg.chunk_index, preview, state)
+
+            return cls(
                 id=msg.id,
                 chunk_index=msg.chunk_index,
                 text=preview,
                 event="PREVIEW_TONE",
                 is_final=False,
                 end_of_speech_time=None,
+                tone_mode=mode,
             )
 
         # ----------------------
@@ -52,34 +234,38 @@ class PipelineOrchestrator:
         if msg.event == "END_GRAMMAR":
             # Mark end state
             state.mark_end_grammar(msg.end_of_speech_time)
+            if state.tone_mode is None and msg.tone_mode:
+                state.tone_mode = msg.tone_mode.lower()  # no PARTs carried one
 
-            # Assemble full text
-            full_text = state.assemble_full_text()
-
-            # Apply full tone transformation
-            toned = self.tone_transformer._tone_transform(full_text)
-
-            # Ensure final text ends with a period
-            # (Safe UI formatting, not grammar correction)
-            if not toned.endswith("."):
-                toned += "."
-
-            # Compute final latency
-            latency_ms = LatencyLogger.compute_latency(msg.end_of_speech_time)
-            LatencyLogger.log("Final Tone Stage", latency_ms)
+            if metrics is None:
+                toned = self._final_text(state)
+            else:
+                t0 = perf_counter_ns()
+                toned = self._final_text(state)
+                metrics.record(LatencyMetrics.FINAL_TRANSFORM, perf_counter_ns() - t0)
+            if state.tone_decision is not None:
+                self.auto_tone.finish(msg.id, state.tone_decision)
 
+            # Compute final latency (end_of_speech_time is epoch seconds)
+            if msg.end_of_speech_time is not None:
+                if metrics is not None:
+                    metrics.record(LatencyMetrics.END_TO_END, since_end_of_speech_ns(msg.end_of_speech_time))
+                if LatencyLogger.verbose:
+                    LatencyLogger.log("Final Tone Stage", LatencyLogger.compute_latency(msg.end_of_speech_time))
 
-            final_msg = PipelineMessage(
+            final_msg = cls(
                 id=msg.id,
                 chunk_index=0,
                 text=toned,
                 event="END_TONE",
                 is_final=True,
                 end_of_speech_time=msg.end_of_speech_time,
+                tone_mode=self._mode(state),
             )
 
             # Cleanup: free memory for this utterance
-            del self.state_by_id[msg.id]
+            self.state_by_id.pop(msg.id, None)  # may have been evicted meanwhile
+            self._held_previews.discard(msg.id)
 
             return final_msg
 
@@ -87,3 +273,104 @@ class PipelineOrchestrator:
         # Any other event → ignore
         # ----------------------
         return None
+
+    def absorb(self, msg: AnyMessage):
+        """
+        Take a PART into its utterance without a preview, for load shedding
+        (see orchestrator.scheduler). No tone work now: the utterance drops
+        its cached chunk tones and END_GRAMMAR re-transforms the assembled
+        text, which gives the same END_TONE. With stable_previews, later
+        previews of the utterance wait for the absorbed chunk (END_TONE
+        still covers it).
+        """
+        state = self._get_state(msg.id)
+        state.assembly = None
+        self._part_mode(state, msg)
+        state.add_chunk(msg.chunk_index, msg.text)
+
+    # ----------------------------------------------------------
+    # Stable-prefix previews
+    # ----------------------------------------------------------
+    def _stable_preview(
+        self, cls: Type[AnyMessage], utt_id: str, index: int, preview: str, state: UtteranceState
+    ) -> Optional[AnyMessage]:
+        tones = state.tone_chunks
+        if tones is None:
+            tones = state.tone_chunks = ChunkBuffer()
+        if index < state.preview_from and index in tones:
+            # already shown: only a real change is worth a message
+            if tones[index] == preview:
+                return None
+            tones.add(index, preview)
+            return cls(
+                id=utt_id,
+                chunk_index=index,
+                text=preview,
+                event="REVISION_TONE",
+                is_final=False,
+                end_of_speech_time=None,
+                tone_mode=self._mode(state),
+            )
+        tones.add(index, preview)
+        return self._emit_stable(cls, utt_id, state, self.clock())
+
+    def _emit_stable(
+        self, cls: Type[AnyMessage], utt_id: str, state: UtteranceState, now: float
+    ) -> Optional[AnyMessage]:
+        tones = state.tone_chunks
+        start, end = state.preview_from, tones.next_index
+        if end <= start:
+            return None
+        if now - state.last_preview_at < self.preview_window:
+            self._held_previews.add(utt_id)
+            return None
+        self._held_previews.discard(utt_id)
+        state.preview_from = end
+        state.last_preview_at = now
+        return cls(
+            id=utt_id,
+            chunk_index=start,
+            text=" ".join(filter(None, (tones[i] for i in range(start, end)))),
+            event="PREVIEW_TONE",
+            is_final=False,
+            end_of_speech_time=None,
+            tone_mode=self._mode(state),
+        )
+
+    def flush_previews(self, message_cls: Optional[Type[AnyMessage]] = None) -> List[AnyMessage]:
+        """
+        PREVIEW_TONEs (of message_cls, default PipelineMessage) for held spans
+        whose preview_window has passed. Call from a timer so a burst's tail
+        is not held until the next PART.
+        """
+        if not self._held_previews:
+            return []
+        message_cls = message_cls or model_class()
+        now = self.clock()
+        out: List[AnyMessage] = []
+        for utt_id in list(self._held_previews):
+            state = self.state_by_id.peek(utt_id)
+            if state is None:  # finalized or evicted meanwhile
+                self._held_previews.discard(utt_id)
+                continue
+            msg = self._emit_stable(message_cls, utt_id, state, now)
+            if msg is not None:
+                out.append(msg)
+        return out
+
+    # ----------------------------------------------------------
+    # Streaming stages (see orchestrator.pipeline)
+    # ----------------------------------------------------------
+    def stream(self, messages: Iterable[AnyMessage]) -> Iterator[AnyMessage]:
+        """Generator stage: PREVIEW_TONE / END_TONE as each grammar message arrives."""
+        for msg in messages:
+            out = self.process_message(msg)
+            if out is not None:
+                yield out
+
+    async def astream(self, messages: AsyncIterable[AnyMessage]) -> AsyncIterator[AnyMessage]:
+        """Async-generator version of stream()."""
+        async for msg in messages:
+            out = self.process_message(msg)
+            if out is not None:
+                yield out
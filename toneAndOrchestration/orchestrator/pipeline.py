@@ -0,0 +1,78 @@
+import time
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from schemas.pipeline_message import AnyMessage
+
+# A stage transforms a message stream into another, lazily
+SyncStage = Callable[[Iterable[AnyMessage]], Iterator[AnyMessage]]
+AsyncStage = Callable[[AsyncIterable[AnyMessage]], AsyncIterator[AnyMessage]]
+
+
+class StreamPipeline:
+    """
+    Chains generator stages so every message flows through all of them as
+    soon as it arrives (ASR -> cleaner -> grammar -> tone), instead of each
+    stage finishing the whole list before the next one starts. Nothing is
+    buffered between stages, so memory does not grow with session length.
+
+        pipe = (StreamPipeline()
+                .stage("cleaner", clean_stream, aclean_stream)
+                .stage("grammar", grammar_stream, agrammar_stream)
+                .stage("tone", orch.stream, orch.astream))
+        for out in pipe.run(asr_messages): ...
+        async for out in pipe.arun(async_asr_messages): ...
+
+    After (or during) a run, first_output_ms holds each stage's
+    time-to-first-output, measured from the start of the run.
+    """
+
+    def __init__(self):
+        self._stages: List[Tuple[str, Optional[SyncStage], Optional[AsyncStage]]] = []
+        self.first_output_ms: Dict[str, float] = {}
+        self._started = 0.0
+
+    def stage(self, name: str, sync: Optional[SyncStage] = None, aio: Optional[AsyncStage] = None) -> "StreamPipeline":
+        """Append a stage; give the generator for run() and/or the async one for arun()."""
+        if sync is None and aio is None:
+            raise ValueError(f"stage {name!r} needs a sync or async transform")
+        self._stages.append((name, sync, aio))
+        return self
+
+    # -----------------------------------------
+    # Time-to-first-output probes
+    # -----------------------------------------
+    def _probe(self, name: str, stream: Iterator[AnyMessage]) -> Iterator[AnyMessage]:
+        for msg in stream:
+            if name not in self.first_output_ms:
+                self.first_output_ms[name] = (time.perf_counter() - self._started) * 1000
+            yield msg
+
+    async def _aprobe(self, name: str, stream: AsyncIterator[AnyMessage]) -> AsyncIterator[AnyMessage]:
+        async for msg in stream:
+            if name not in self.first_output_ms:
+                self.first_output_ms[name] = (time.perf_counter() - self._started) * 1000
+            yield msg
+
+    # -----------------------------------------
+    # Running
+    # -----------------------------------------
+    def run(self, messages: Iterable[AnyMessage]) -> Iterator[AnyMessage]:
+        stream: Iterator[AnyMessage] = iter(messages)
+        for name, sync, _ in self._stages:
+            if sync is None:
+                raise TypeError(f"stage {name!r} has no sync transform; use arun()")
+            stream = self._probe(name, sync(stream))
+        self.first_output_ms = {}
+        self._started = time.perf_counter()
+        yield from stream
+
+    async def arun(self, messages: AsyncIterable[AnyMessage]) -> AsyncIterator[AnyMessage]:
+        stream = messages
+        for name, _, aio in self._stages:
+            if aio is None:
+                raise TypeError(f"stage {name!r} has no async transform; use run()")
+            stream = self._aprobe(name, aio(stream))
+        self.first_output_ms = {}
+        self._started = time.perf_counter()
+        async for msg in stream:
+            yield msg
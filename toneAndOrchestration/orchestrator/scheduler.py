@@ -0,0 +1,181 @@
+import asyncio
+import heapq
+import time
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from schemas.pipeline_message import AnyMessage
+from orchestrator.orchestrator import PipelineOrchestrator
+
+
+class _Utterance:
+    __slots__ = ("parts", "final")
+
+    def __init__(self):
+        self.parts: Deque[Tuple[float, AnyMessage]] = deque()  # (queued at, PART)
+        self.final: Optional[AnyMessage] = None                # END_GRAMMAR, once queued
+
+
+class OverloadScheduler:
+    """
+    Queue in front of a PipelineOrchestrator that serves what users wait
+    for first when work arrives faster than it can be done.
+
+    submit() queues grammar messages; each step() does one unit of work:
+      1. Finalize: of the utterances whose END_GRAMMAR is queued, the one
+         with the earliest deadline (end_of_speech_time + final_deadline,
+         or queue time + final_deadline without one). Its queued PARTs are
+         absorbed without previews (END_TONE supersedes them), then
+         END_GRAMMAR runs.
+      2. Otherwise the oldest queued PART, as a normal preview. If it has
+         waited more than stale_after seconds, it and every PART of its
+         utterance still queued are absorbed instead: nobody is looking at
+         that preview any more, and absorbing skips the tone work.
+    Messages of one utterance still reach the orchestrator in order, and an
+    utterance is only tracked while it has messages queued, so ones that
+    never get END_GRAMMAR are not kept.
+
+    Counters: shed (PARTs absorbed without a preview), finalized and
+    deadline_misses (END_TONEs emitted after their deadline).
+
+    clock must be on the same scale as end_of_speech_time (epoch seconds).
+    """
+
+    def __init__(
+        self,
+        orchestrator: Optional[PipelineOrchestrator] = None,
+        tone_mode: str = "neutral",
+        stale_after: float = 0.1,
+        final_deadline: float = 0.3,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.orchestrator = orchestrator or PipelineOrchestrator(tone_mode=tone_mode)
+        self.stale_after = stale_after
+        self.final_deadline = final_deadline
+        self.clock = clock
+        self.shed = 0
+        self.finalized = 0
+        self.deadline_misses = 0
+        self._utterances: Dict[str, _Utterance] = {}
+        self._finals: List[Tuple[float, int, str]] = []  # (deadline, seq, utt_id) heap
+        self._tickets: Deque[str] = deque()  # one utt_id per queued PART, oldest first
+        self._seq = 0
+        self._queued = 0
+
+    @property
+    def pending(self) -> int:
+        """Messages queued and not processed yet."""
+        return self._queued
+
+    def submit(self, msg: AnyMessage):
+        if msg.event not in ("PART", "END_GRAMMAR"):
+            return  # the orchestrator ignores everything else
+        utt = self._utterances.get(msg.id)
+        if utt is None:
+            utt = self._utterances[msg.id] = _Utterance()
+        now = self.clock()
+        if msg.event == "END_GRAMMAR":
+            eos = msg.end_of_speech_time
+            deadline = (now if eos is None else eos) + self.final_deadline
+            utt.final = msg
+            self._seq += 1
+            heapq.heappush(self._finals, (deadline, self._seq, msg.id))
+        else:
+            utt.parts.append((now, msg))
+            self._tickets.append(msg.id)
+        self._queued += 1
+
+    def step(self) -> List[AnyMessage]:
+        """Do one unit of work; returns its outputs (empty when idle or all shed)."""
+        while self._finals:
+            deadline, _, utt_id = heapq.heappop(self._finals)
+            utt = self._utterances.pop(utt_id, None)
+            if utt is None:  # a repeated END_GRAMMAR, already served
+                self._queued -= 1
+                continue
+            return self._finalize(utt, deadline)
+        tickets = self._tickets
+        while tickets:
+            utt_id = tickets.popleft()
+            utt = self._utterances.get(utt_id)
+            if utt is None or not utt.parts:
+                continue  # already absorbed
+            queued_at, msg = utt.parts[0]
+            if self.clock() - queued_at > self.stale_after:
+                self._absorb(utt)
+                self._release(utt_id, utt)
+                return []
+            utt.parts.popleft()
+            self._queued -= 1
+            self._release(utt_id, utt)
+            out = self.orchestrator.process_message(msg)
+            return [] if out is None else [out]
+        return []
+
+    def run(self, messages) -> List[AnyMessage]:
+        """Submit messages, then step until nothing is queued."""
+        for msg in messages:
+            self.submit(msg)
+        out: List[AnyMessage] = []
+        while self._queued:
+            out += self.step()
+        return out
+
+    def _absorb(self, utt: _Utterance):
+        absorb = self.orchestrator.absorb
+        for _, msg in utt.parts:
+            absorb(msg)
+        self.shed += len(utt.parts)
+        self._queued -= len(utt.parts)
+        utt.parts.clear()
+
+    def _release(self, utt_id: str, utt: _Utterance):
+        """Stop tracking an utterance with nothing queued."""
+        if not utt.parts and utt.final is None:
+            del self._utterances[utt_id]
+
+    def _finalize(self, utt: _Utterance, deadline: float) -> List[AnyMessage]:
+        self._absorb(utt)
+        self._queued -= 1
+        if utt.final is None:
+            return []
+        out = self.orchestrator.process_message(utt.final)
+        self.finalized += 1
+        if self.clock() > deadline:
+            self.deadline_misses += 1
+        return [] if out is None else [out]
+
+    async def astream(self, messages: AsyncIterable[AnyMessage]) -> AsyncIterator[AnyMessage]:
+        """
+        Async stage: reads messages as they arrive (in a separate task) and
+        yields outputs in scheduled order. Between steps the reader gets a
+        turn, so an END_GRAMMAR arriving in a backlog is served next.
+        """
+        arrived = asyncio.Event()
+        done = False
+
+        async def feed():
+            nonlocal done
+            try:
+                async for msg in messages:
+                    self.submit(msg)
+                    arrived.set()
+            finally:
+                done = True
+                arrived.set()
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                if not self._queued:
+                    if done:
+                        break
+                    arrived.clear()
+                    await arrived.wait()
+                    continue
+                for out in self.step():
+                    yield out
+                await asyncio.sleep(0)
+            await feeder  # re-raise any error from the source
+        finally:
+            feeder.cancel()
@@ -0,0 +1,305 @@
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Set, Tuple, Type, Union
+
+from schemas import wire
+from schemas.pipeline_message import AnyMessage, FastMessage
+from orchestrator.async_orchestrator import AsyncPipelineOrchestrator
+from orchestrator.latency_logger import LatencyMetrics
+from orchestrator.orchestrator import PipelineOrchestrator
+
+# (host, port) for TCP, a path for a Unix socket
+Address = Union[Tuple[str, int], str]
+
+READ_SIZE = 64 * 1024
+# largest frame a client may send (a chunk of text is far smaller)
+MAX_FRAME = 1 << 20
+
+log = logging.getLogger(__name__)
+
+# events that open an utterance until its END_TONE (the orchestrator ignores the rest)
+_TRACKED = frozenset(("PART", "END_GRAMMAR"))
+
+
+class _Connection:
+    """Per-connection bookkeeping: utterances started and not finalized yet."""
+
+    __slots__ = ("open", "draining", "stop")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.open: Set[str] = set()
+        self.draining = False
+        # resolved once the connection should stop reading (drained)
+        self.stop: asyncio.Future = loop.create_future()
+
+    def drain(self):
+        self.draining = True
+        self._maybe_stop()
+
+    def finished(self, utt_id: str):
+        self.open.discard(utt_id)
+        self._maybe_stop()
+
+    def _maybe_stop(self):
+        if self.draining and not self.open and not self.stop.done():
+            self.stop.set_result(None)
+
+
+class OrchestratorServer:
+    """
+    Long-running asyncio service exposing PipelineOrchestrator over a TCP or
+    Unix socket. Clients send grammar messages (PART / END_GRAMMAR) as
+    schemas.wire frames and receive PREVIEW_TONE / END_TONE frames back.
+
+    One connection carries any number of interleaved utterances (sessions,
+    keyed by message id). Each connection gets its own orchestrator from
+    orchestrator_factory, so ids only need to be unique per connection, and
+    is served by an AsyncPipelineOrchestrator: at most max_pending messages
+    are buffered before the server stops reading from that socket, and
+    output waits for the socket to drain, so a slow client is throttled
+    through TCP flow control without affecting other connections.
+
+    shutdown() stops accepting connections, then lets every connection
+    finish the utterances it has in flight: frames for new utterances are
+    dropped (counted in rejected) and a connection closes once nothing is
+    open on it, or when drain_timeout expires.
+
+    Utterances that never get END_GRAMMAR are bounded per connection: the
+    orchestrator keeps at most max_utterances (unless orchestrator_factory
+    sets its own bound), and one it evicts no longer counts as open.
+
+    A connection that sends a malformed frame, or one longer than max_frame
+    bytes, is logged and closed (counted in protocol_errors); its
+    utterances are dropped. Any other error while serving a connection is
+    logged as a server error and closes that connection.
+    """
+
+    def __init__(
+        self,
+        tone_mode: str = "neutral",
+        orchestrator_factory: Optional[Callable[[], PipelineOrchestrator]] = None,
+        metrics: Optional[LatencyMetrics] = None,
+        max_pending: int = 1024,
+        max_concurrency: int = 64,
+        output_queue_size: int = 1024,
+        drain_timeout: float = 10.0,
+        read_size: int = READ_SIZE,
+        max_frame: int = MAX_FRAME,
+        max_utterances: int = 1024,
+    ):
+        self.metrics = metrics
+        self.orchestrator_factory = orchestrator_factory or (
+            lambda: PipelineOrchestrator(tone_mode=tone_mode, metrics=metrics)
+        )
+        self.max_pending = max_pending
+        self.max_concurrency = max_concurrency
+        self.output_queue_size = output_queue_size
+        self.drain_timeout = drain_timeout
+        self.read_size = read_size
+        self.max_frame = max_frame
+        self.max_utterances = max_utterances
+        self.address: Optional[Address] = None
+        # counters over the server's lifetime
+        self.connections = 0
+        self.messages_in = 0
+        self.messages_out = 0
+        self.rejected = 0
+        self.protocol_errors = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Set[asyncio.Task] = set()
+        self._live: Set[_Connection] = set()
+        self._closing = False
+
+    # ----------------------------------------------------------
+    # Lifecycle
+    # ----------------------------------------------------------
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> Address:
+        """Listen on path (Unix socket) if given, else on host:port (0 = any free port)."""
+        if path is not None:
+            if os.path.exists(path):
+                os.unlink(path)  # stale socket from an earlier run
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+            self.address = path
+        else:
+            self._server = await asyncio.start_server(self._handle, host=host, port=port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        return self.address
+
+    async def serve_forever(self):
+        """Serve until shutdown() is called (or the task is cancelled)."""
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            if not self._closing:
+                raise
+
+    async def shutdown(self, drain_timeout: Optional[float] = None):
+        """Stop accepting, drain in-flight utterances, then close every connection."""
+        if self._closing:
+            return
+        self._closing = True
+        self._server.close()
+        for conn in self._live:
+            conn.drain()
+        handlers = list(self._handlers)
+        if handlers:
+            timeout = self.drain_timeout if drain_timeout is None else drain_timeout
+            _, late = await asyncio.wait(handlers, timeout=timeout)
+            for task in late:
+                task.cancel()
+            await asyncio.gather(*late, return_exceptions=True)
+        await self._server.wait_closed()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    async def __aenter__(self) -> "OrchestratorServer":
+        if self._server is None:
+            await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.shutdown()
+
+    # ----------------------------------------------------------
+    # Connections
+    # ----------------------------------------------------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        conn = _Connection(asyncio.get_running_loop())
+        if self._closing:
+            conn.drain()
+        self._handlers.add(task)
+        self._live.add(conn)
+        self.connections += 1
+        session = AsyncPipelineOrchestrator(
+            orchestrator=self._orchestrator_for(conn),
+            max_concurrency=self.max_concurrency,
+            max_pending=self.max_pending,
+            output_queue_size=self.output_queue_size,
+        )
+        out = bytearray()
+        try:
+            async for msg in session.stream(self._incoming(conn, reader)):
+                del out[:]
+                writer.write(wire.encode_frame(msg, out))
+                self.messages_out += 1
+                if msg.event == "END_TONE":
+                    conn.finished(msg.id)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # client went away; its utterances are dropped with the session
+        except wire.ProtocolError as exc:  # malformed frame: the stream cannot be resynced
+            self.protocol_errors += 1
+            log.warning("closing connection %s: %s", writer.get_extra_info("peername"), exc)
+        except Exception:
+            log.exception("error serving connection %s", writer.get_extra_info("peername"))
+        finally:
+            self._live.discard(conn)
+            self._handlers.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _orchestrator_for(self, conn: _Connection) -> PipelineOrchestrator:
+        """The connection's orchestrator, bounded, with evictions closing utterances on conn."""
+        orchestrator = self.orchestrator_factory()
+        store = orchestrator.state_by_id
+        if store.max_size is None:
+            store.max_size = self.max_utterances
+        chained = store.on_evict
+
+        def on_evict(utt_id, state, reason):
+            conn.finished(utt_id)
+            if chained is not None:
+                chained(utt_id, state, reason)
+
+        store.on_evict = on_evict
+        return orchestrator
+
+    async def _incoming(self, conn: _Connection, reader: asyncio.StreamReader) -> AsyncIterator[AnyMessage]:
+        decoder = wire.FrameDecoder(FastMessage, self.max_frame)
+        read: Optional[asyncio.Task] = None
+        try:
+            while not conn.stop.done():
+                read = asyncio.ensure_future(reader.read(self.read_size))
+                await asyncio.wait((read, conn.stop), return_when=asyncio.FIRST_COMPLETED)
+                if not read.done():
+                    break
+                data = read.result()
+                read = None
+                if not data:
+                    break
+                for msg in decoder.feed(data):
+                    if msg.id not in conn.open and msg.event in _TRACKED:
+                        if conn.draining:
+                            self.rejected += 1
+                            continue
+                        conn.open.add(msg.id)
+                    self.messages_in += 1
+                    yield msg
+        finally:
+            if read is not None:
+                read.cancel()
+
+
+# ----------------------------------------------------------
+# Client
+# ----------------------------------------------------------
+class OrchestratorClient:
+    """
+    Client side of OrchestratorServer. send() queues frames (flushed with
+    drain()), responses() yields decoded messages as they arrive; use them
+    from separate tasks so neither side stalls the other.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 message_cls: Type[AnyMessage] = FastMessage, read_size: int = READ_SIZE):
+        self.reader = reader
+        self.writer = writer
+        self.message_cls = message_cls
+        self.read_size = read_size
+
+    @classmethod
+    async def connect(cls, address: Address, **kwargs) -> "OrchestratorClient":
+        if isinstance(address, str):
+            reader, writer = await asyncio.open_unix_connection(address)
+        else:
+            reader, writer = await asyncio.open_connection(*address)
+        return cls(reader, writer, **kwargs)
+
+    def send(self, messages: Iterable[AnyMessage]):
+        self.writer.write(wire.encode_batch(messages))
+
+    async def drain(self):
+        await self.writer.drain()
+
+    def close_input(self):
+        """Tell the server nothing more is coming; responses keep arriving."""
+        if self.writer.can_write_eof():
+            self.writer.write_eof()
+
+    async def responses(self) -> AsyncIterator[AnyMessage]:
+        decoder = wire.FrameDecoder(self.message_cls)
+        while True:
+            data = await self.reader.read(self.read_size)
+            if not data:
+                break
+            for msg in decoder.feed(data):
+                yield msg
+
+    async def request(self, messages: Iterable[AnyMessage]) -> List[AnyMessage]:
+        """Send messages, close the input and collect every response."""
+        self.send(messages)
+        await self.drain()
+        self.close_input()
+        return [msg async for msg in self.responses()]
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
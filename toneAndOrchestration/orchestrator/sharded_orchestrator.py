@@ -0,0 +1,171 @@
+import multiprocessing as mp
+import os
+import queue
+import threading
+import zlib
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from schemas.pipeline_message import EVENTS, AnyMessage, FastMessage, model_class
+from tone_module.cache import TransformCache
+from tone_module.rule_engine import ToneRuleSet
+from orchestrator.orchestrator import PipelineOrchestrator
+
+# Events are sent as small ints instead of strings
+_EVENT_CODE = {e: i for i, e in enumerate(EVENTS)}
+
+# (id, chunk_index, text, event_code_or_name, is_final, end_of_speech_time, tone_mode, is_fast)
+Packed = Tuple[str, int, str, object, bool, Optional[float], Optional[str], bool]
+
+_FLUSHED = "__flushed__"
+
+
+def pack(msg: AnyMessage) -> Packed:
+    """Compact, pickle-cheap tuple form of a message for crossing processes."""
+    event = _EVENT_CODE.get(msg.event, msg.event)
+    return (msg.id, msg.chunk_index, msg.text, event, msg.is_final, msg.end_of_speech_time, msg.tone_mode,
+            type(msg) is FastMessage)
+
+
+def unpack(t: Packed) -> AnyMessage:
+    """Inverse of pack(), rebuilding the message type that was packed."""
+    utt_id, chunk_index, text, event, is_final, eos, tone_mode, fast = t
+    if isinstance(event, int):
+        event = EVENTS[event]
+    if fast:
+        return FastMessage(utt_id, chunk_index, text, event, is_final, eos, tone_mode)
+    return model_class().model_construct(
+        id=utt_id,
+        chunk_index=chunk_index,
+        text=text,
+        event=event,
+        is_final=is_final,
+        end_of_speech_time=eos,
+        tone_mode=tone_mode,
+    )
+
+
+def shard_for(utt_id: str, num_shards: int) -> int:
+    """Stable across processes and runs (unlike hash(), which is salted)."""
+    return zlib.crc32(utt_id.encode("utf-8")) % num_shards
+
+
+def _worker_main(tone_mode: str, rules: Optional[ToneRuleSet], cache_settings: Optional[Tuple[int, int]],
+                 inbox, outbox):
+    """
+    Worker process: owns its own PipelineOrchestrator (ToneTransformer and
+    UtteranceState map). Receives batches of packed messages, returns a
+    batch of packed outputs per input batch.
+    """
+    cache = TransformCache(*cache_settings) if cache_settings is not None else None
+    orch = PipelineOrchestrator(tone_mode=tone_mode, rules=rules, tone_cache=cache)
+    while True:
+        batch = inbox.get()
+        if batch is None:
+            outbox.put(_FLUSHED)
+            break
+        results: List[Packed] = []
+        for t in batch:
+            out = orch.process_message(unpack(t))
+            if out is not None:
+                results.append(pack(out))
+        if results:
+            outbox.put(results)
+
+
+class ShardedOrchestrator:
+    """
+    Runs tone orchestration in num_workers processes. Each message is routed
+    by a stable hash of the message id, so every utterance lives on one
+    worker and keeps its order. Results from all workers are merged into one
+    output stream (ordered per utterance, interleaved across utterances).
+
+    Messages cross process boundaries as batches of packed tuples, and come
+    back as the message type they were sent as (FastMessage or PipelineMessage).
+    batch_size trades latency (1 = send every message at once) for throughput;
+    queue_size bounds the batches waiting per worker (and for the consumer).
+
+    rules (default: the built-in tables) is shipped to every worker once per
+    process_stream() call. A cache cannot be shared across processes: with
+    tone_cache set, each worker gets its own TransformCache with the same
+    max_size and max_text_len (tone_cache itself is left untouched).
+    """
+
+    def __init__(
+        self,
+        tone_mode: str = "neutral",
+        num_workers: Optional[int] = None,
+        batch_size: int = 64,
+        queue_size: int = 64,
+        rules: Optional[ToneRuleSet] = None,
+        tone_cache: Optional[TransformCache] = None,
+    ):
+        self.tone_mode = tone_mode
+        self.rules = rules
+        self.tone_cache = tone_cache
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+
+    def _route(self, messages: Iterable[AnyMessage], inboxes, errors: List[BaseException]):
+        batches: List[List[Packed]] = [[] for _ in inboxes]
+        try:
+            for msg in messages:
+                shard = shard_for(msg.id, len(inboxes))
+                batch = batches[shard]
+                batch.append(pack(msg))
+                if len(batch) >= self.batch_size:
+                    inboxes[shard].put(batch)
+                    batches[shard] = []
+        except BaseException as exc:  # surface source errors to the consumer
+            errors.append(exc)
+        finally:
+            for shard, batch in enumerate(batches):
+                if batch:
+                    inboxes[shard].put(batch)
+                inboxes[shard].put(None)
+
+    def process_stream(self, messages: Iterable[AnyMessage]) -> Iterator[AnyMessage]:
+        """
+        Process a (possibly interleaved) message stream across the worker
+        processes and yield PREVIEW_TONE / END_TONE messages as they arrive.
+        Workers are started per call and stopped when the stream ends.
+        """
+        ctx = mp.get_context()
+        inboxes = [ctx.Queue(maxsize=self.queue_size) for _ in range(self.num_workers)]
+        outbox = ctx.Queue(maxsize=self.queue_size * self.num_workers)
+        cache = self.tone_cache
+        cache_settings = (cache.max_size, cache.max_text_len) if cache is not None else None
+        procs = [
+            ctx.Process(target=_worker_main, args=(self.tone_mode, self.rules, cache_settings, inbox, outbox),
+                        daemon=True)
+            for inbox in inboxes
+        ]
+        for p in procs:
+            p.start()
+
+        errors: List[BaseException] = []
+        router = threading.Thread(target=self._route, args=(messages, inboxes, errors), daemon=True)
+        router.start()
+        try:
+            flushed = 0
+            while flushed < len(procs):
+                try:
+                    item = outbox.get(timeout=0.5)
+                except queue.Empty:
+                    dead = [p for p in procs if p.exitcode not in (None, 0)]
+                    if dead:
+                        raise RuntimeError(f"tone worker exited with code {dead[0].exitcode}")
+                    continue
+                if item == _FLUSHED:
+                    flushed += 1
+                    continue
+                for t in item:
+                    yield unpack(t)
+            router.join()
+            if errors:
+                raise errors[0]
+        finally:
+            for p in procs:
+                p.join(timeout=1)
+                if p.is_alive():
+                    p.terminate()
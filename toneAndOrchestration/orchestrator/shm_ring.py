@@ -0,0 +1,257 @@
+import os
+import queue
+import struct
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Type
+
+from schemas import wire
+from schemas.pipeline_message import AnyMessage, FastMessage
+
+# Control block: write position, read position and the closed flag, each
+# on its own cache line so producer and consumer do not share one
+_HEAD, _TAIL, _CLOSED = 0, 8, 16
+_CONTROL_BYTES = 192
+_ALIGN = 8
+_WRAP = 0xFFFFFFFF  # record length meaning "continue at the start"
+_LENGTH = struct.Struct("<I")
+
+WAIT_POLICIES = ("spin", "yield", "block")
+_POLLS_BEFORE_SLEEP = 100
+_MIN_SLEEP = 50e-6
+_MAX_SLEEP = 2e-3
+
+_yield = getattr(os, "sched_yield", lambda: time.sleep(0))
+
+
+class ShmRing:
+    """
+    Single-producer / single-consumer ring buffer in shared memory, carrying
+    messages between two processes as schemas.wire frames: no pickling, one
+    copy into the ring, and text decoded straight out of shared memory.
+
+    The ring holds records of one or more frames; put_many() packs up to
+    max_batch messages per record, so a batch costs one index update on each
+    side. Positions are 64-bit counters that only grow, written by one side
+    each (aligned 8-byte stores, atomic on the platforms we run on).
+
+    Waiting on a full (producer) or empty (consumer) ring follows wait:
+      "spin"   busy-poll: lowest latency given a core per side, keeps
+               them busy (and starves the other side on one core)
+      "yield"  poll, giving up the CPU between polls
+      "block"  poll as "yield" for a while, then sleep with backoff
+               (50 us .. 2 ms) until the other side catches up
+    With timeout (seconds), put raises queue.Full and get queue.Empty.
+
+    The creating process owns the segment (unlink() it when done); pass the
+    ring to a multiprocessing.Process and the child attaches by name.
+    Iterating yields messages until the producer calls close() and the ring
+    is empty, so a ring is a drop-in message stream for generator stages
+    (see run_stage).
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1 << 20,
+        wait: str = "block",
+        timeout: Optional[float] = None,
+        message_cls: Type[AnyMessage] = FastMessage,
+        max_batch: int = 64,
+        name: Optional[str] = None,
+    ):
+        if capacity < 64 or capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two >= 64")
+        if wait not in WAIT_POLICIES:
+            raise ValueError(f"wait must be one of {WAIT_POLICIES}")
+        self.capacity = capacity
+        self.wait = wait
+        self.timeout = timeout
+        self.message_cls = message_cls
+        self.max_batch = max(1, max_batch)
+        self._owner = name is None
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=_CONTROL_BYTES + capacity)
+            self._shm.buf[:_CONTROL_BYTES] = bytes(_CONTROL_BYTES)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._control = self._shm.buf[:_CONTROL_BYTES].cast("Q")
+        self._data = self._shm.buf[_CONTROL_BYTES:_CONTROL_BYTES + capacity]
+        self._mask = capacity - 1
+        # each side's own position, and its last look at the other one
+        self._head = self._control[_HEAD]
+        self._tail = self._tail_seen = self._control[_TAIL]
+        self._head_seen = self._tail  # nothing seen yet: look on first read
+        self._decoded: Deque[AnyMessage] = deque()
+        self._frame = bytearray()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __reduce__(self):
+        return (_attach, (self.name, self.capacity, self.wait, self.timeout, self.message_cls, self.max_batch))
+
+    # ----------------------------------------------------------
+    # Waiting
+    # ----------------------------------------------------------
+    def _deadline(self) -> Optional[float]:
+        return None if self.timeout is None else time.monotonic() + self.timeout
+
+    def _pause(self, attempt: int, deadline: Optional[float], error: Type[Exception]):
+        if deadline is not None and time.monotonic() > deadline:
+            raise error
+        if self.wait == "spin":
+            return
+        if self.wait == "yield" or attempt < _POLLS_BEFORE_SLEEP:
+            _yield()
+        else:
+            time.sleep(min(_MIN_SLEEP * (1 << min(attempt - _POLLS_BEFORE_SLEEP, 8)), _MAX_SLEEP))
+
+    # ----------------------------------------------------------
+    # Producer
+    # ----------------------------------------------------------
+    def _push(self, record: bytearray):
+        n = len(record)
+        size = (_LENGTH.size + n + _ALIGN - 1) & ~(_ALIGN - 1)
+        if size > self.capacity // 2:
+            raise ValueError(f"record of {n} bytes does not fit a ring of {self.capacity}")
+        head = self._head
+        pos = head & self._mask
+        room = self.capacity - pos
+        need = size if size <= room else room + size
+        if need > self.capacity - (head - self._tail_seen):
+            deadline = self._deadline()
+            attempt = 0
+            while True:
+                self._tail_seen = self._control[_TAIL]
+                if need <= self.capacity - (head - self._tail_seen):
+                    break
+                self._pause(attempt, deadline, queue.Full)
+                attempt += 1
+        data = self._data
+        if size > room:
+            _LENGTH.pack_into(data, pos, _WRAP)
+            head += room
+            pos = 0
+        _LENGTH.pack_into(data, pos, n)
+        data[pos + _LENGTH.size:pos + _LENGTH.size + n] = record
+        self._head = head + size
+        self._control[_HEAD] = self._head  # publish after the data
+
+    def put(self, msg: AnyMessage):
+        frame = self._frame
+        del frame[:]
+        self._push(wire.encode_frame(msg, frame))
+
+    def put_many(self, messages: Iterable[AnyMessage]):
+        """Send messages in records of up to max_batch each."""
+        frames = self._frame
+        del frames[:]
+        count = 0
+        for msg in messages:
+            wire.encode_frame(msg, frames)
+            count += 1
+            if count == self.max_batch:
+                self._push(frames)
+                del frames[:]
+                count = 0
+        if count:
+            self._push(frames)
+
+    def close(self):
+        """Producer side: no more messages; the consumer's iteration ends once it has read them."""
+        self._control[_CLOSED] = 1
+
+    # ----------------------------------------------------------
+    # Consumer
+    # ----------------------------------------------------------
+    @property
+    def buffered(self) -> int:
+        """Messages already taken off the ring but not returned by get() / iteration yet."""
+        return len(self._decoded)
+
+    def _pop(self) -> bool:
+        """Decode the next record into _decoded; False if the ring is closed and drained."""
+        tail = self._tail
+        if tail == self._head_seen:
+            deadline = self._deadline()
+            attempt = 0
+            while True:
+                closed = self._control[_CLOSED]
+                self._head_seen = self._control[_HEAD]
+                if tail != self._head_seen:
+                    break
+                if closed:
+                    return False
+                self._pause(attempt, deadline, queue.Empty)
+                attempt += 1
+        data = self._data
+        pos = tail & self._mask
+        n = _LENGTH.unpack_from(data, pos)[0]
+        if n == _WRAP:
+            tail += self.capacity - pos
+            pos = 0
+            n = _LENGTH.unpack_from(data, pos)[0]
+        start = pos + _LENGTH.size
+        with data[start:start + n] as record:
+            messages, _ = wire.decode_frames(record, self.message_cls)
+        self._decoded.extend(messages)
+        self._tail = tail + ((_LENGTH.size + n + _ALIGN - 1) & ~(_ALIGN - 1))
+        self._control[_TAIL] = self._tail  # hand the space back
+        return True
+
+    def get(self) -> AnyMessage:
+        """Next message; EOFError once the ring is closed and drained."""
+        while not self._decoded:
+            if not self._pop():
+                raise EOFError("ring closed")
+        return self._decoded.popleft()
+
+    def __iter__(self) -> Iterator[AnyMessage]:
+        decoded = self._decoded
+        while decoded or self._pop():
+            while decoded:
+                yield decoded.popleft()
+
+    # ----------------------------------------------------------
+    # Cleanup
+    # ----------------------------------------------------------
+    def release(self):
+        """Detach this process from the segment."""
+        self._control.release()
+        self._data.release()
+        self._shm.close()
+
+    def unlink(self):
+        """Owner: release and free the segment."""
+        self.release()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _attach(name, capacity, wait, timeout, message_cls, max_batch) -> ShmRing:
+    return ShmRing(capacity, wait, timeout, message_cls, max_batch, name=name)
+
+
+def run_stage(stage: Callable[[Iterable[AnyMessage]], Iterable[AnyMessage]], inbox: ShmRing, outbox: ShmRing):
+    """
+    Process entry point: feed inbox through a generator stage (clean_stream,
+    grammar_stream, PipelineOrchestrator.stream, ...) into outbox, then close
+    it. Outputs go out in batches that end where an input batch ended, so
+    batching adds no wait for stages that answer every input (one that
+    drops the last message of a batch holds the rest until the next).
+    """
+    batch: List[AnyMessage] = []
+    try:
+        for out in stage(inbox):
+            batch.append(out)
+            if not inbox.buffered or len(batch) >= outbox.max_batch:
+                outbox.put_many(batch)
+                batch = []
+        if batch:
+            outbox.put_many(batch)
+    finally:
+        outbox.close()
+        inbox.release()
+        outbox.release()
@@ -1,4 +1,8 @@
-from typing import Dict, Optional
+from typing import Optional
+
+from tone_module.assembly import ChunkTone, ToneAssembly
+from tone_module.chunk_buffer import ChunkBuffer
+from orchestrator.auto_tone import ToneDecision
 
 
 class UtteranceState:
@@ -8,17 +12,32 @@ class UtteranceState:
     """
 
     def __init__(self):
-        self.chunks: Dict[int, str] = {}          # chunk_index -> text
+        self.chunks = ChunkBuffer()                   # chunk_index -> text, kept in order
+        self.assembly: Optional[ToneAssembly] = None  # cached tone results (incremental finalize)
         self.end_of_speech_time: Optional[float] = None
         self.received_end_grammar: bool = False
+        # stable-prefix previews: chunk previews in order, first chunk not yet
+        # sent in a PREVIEW_TONE, and when the last one was sent
+        self.tone_chunks: Optional[ChunkBuffer] = None
+        self.preview_from: int = 0
+        self.last_preview_at: float = float("-inf")
+        # tone mode asked for (message tone_mode or orchestrator default);
+        # for "auto", tone_decision holds the running features and choice
+        self.tone_mode: Optional[str] = None
+        self.tone_decision: Optional[ToneDecision] = None
 
-    def add_chunk(self, index: int, text: str):
-        self.chunks[index] = text
+    def add_chunk(self, index: int, text: str, tone: Optional[ChunkTone] = None):
+        self.chunks.add(index, text)
+        if tone is not None and self.assembly is not None:
+            self.assembly.add(index, tone)
 
     def mark_end_grammar(self, eos_time: float):
         self.received_end_grammar = True
         self.end_of_speech_time = eos_time
 
     def assemble_full_text(self) -> str:
-        ordered = [self.chunks[i] for i in sorted(self.chunks.keys())]
-        return " ".join(ordered).strip()
+        return self.chunks.joined().strip()
+
+    def running_text(self) -> str:
+        """Transcript of the contiguous prefix received so far (no re-sorting)."""
+        return self.chunks.prefix_text().strip()
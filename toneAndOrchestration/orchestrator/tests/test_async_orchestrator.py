@@ -0,0 +1,105 @@
+# orchestrator/tests/test_async_orchestrator.py
+
+import asyncio
+import random
+import time
+
+import pytest
+
+from mocks.mock_asr import mock_asr_stream
+from mocks.mock_grammar import mock_upstream_stages
+
+from orchestrator.async_orchestrator import AsyncPipelineOrchestrator
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import PipelineMessage
+
+
+def _interleave(per_utt, seed=0):
+    """Random interleaving that keeps each utterance's own order."""
+    rng = random.Random(seed)
+    queues = [list(msgs) for msgs in per_utt]
+    out = []
+    while queues:
+        q = rng.choice(queues)
+        out.append(q.pop(0))
+        if not q:
+            queues.remove(q)
+    return out
+
+
+async def _source(messages):
+    for m in messages:
+        yield m
+
+
+async def _collect(orch, messages):
+    return [out async for out in orch.stream(_source(messages))]
+
+
+def test_async_orchestrator_thousands_of_interleaved_utterances():
+    n_utts = 2000
+    per_utt = [mock_upstream_stages(mock_asr_stream(f"utt_{i}", end_of_speech_time=time.time())) for i in range(n_utts)]
+    messages = _interleave(per_utt)
+
+    orch = AsyncPipelineOrchestrator(tone_mode="formal", max_concurrency=32, max_pending=256)
+    start = time.perf_counter()
+    outputs = asyncio.run(_collect(orch, messages))
+    elapsed = time.perf_counter() - start
+
+    by_utt = {}
+    for out in outputs:
+        by_utt.setdefault(out.id, []).append(out)
+    assert len(by_utt) == n_utts
+
+    # reference: the synchronous orchestrator on one utterance
+    sync = PipelineOrchestrator(tone_mode="formal")
+    expected = [r for r in (sync.process_message(m) for m in per_utt[0]) if r is not None]
+    expected_texts = [(e.event, e.chunk_index, e.text) for e in expected]
+
+    for utt_id, outs in by_utt.items():
+        # per-utterance order: previews 0,1,2 then the final
+        assert [o.event for o in outs] == ["PREVIEW_TONE"] * 3 + ["END_TONE"]
+        assert [o.chunk_index for o in outs[:3]] == [0, 1, 2]
+        assert [(o.event, o.chunk_index, o.text) for o in outs] == expected_texts
+
+    assert 1 < orch.peak_concurrency <= 32
+    assert orch.orchestrator.state_by_id == {}
+    throughput = len(messages) / elapsed
+    assert throughput > 500  # messages per second; generous for slow CI
+
+
+def test_async_orchestrator_backpressure_limits_read_ahead():
+    pulled = []
+
+    async def source():
+        for i in range(1000):
+            pulled.append(i)
+            yield PipelineMessage(id=f"u{i % 50}", chunk_index=i // 50, text="hello there", event="PART")
+
+    async def run():
+        orch = AsyncPipelineOrchestrator(max_pending=8, output_queue_size=4)
+        stream = orch.stream(source())
+        first = await stream.__anext__()
+        # give the feeder time to run ahead as far as it can
+        for _ in range(100):
+            await asyncio.sleep(0)
+        read_ahead = len(pulled)
+        await stream.aclose()
+        return first, read_ahead
+
+    first, read_ahead = asyncio.run(run())
+    assert first.event == "PREVIEW_TONE"
+    assert read_ahead <= 8 + 4 + 2
+
+
+def test_async_orchestrator_propagates_processing_errors():
+    class Boom(PipelineOrchestrator):
+        def process_message(self, msg):
+            if msg.chunk_index == 3:
+                raise RuntimeError("boom")
+            return super().process_message(msg)
+
+    messages = [PipelineMessage(id="u", chunk_index=i, text="hi", event="PART") for i in range(10)]
+    orch = AsyncPipelineOrchestrator(orchestrator=Boom())
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(_collect(orch, messages))
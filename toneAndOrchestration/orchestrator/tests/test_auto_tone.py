@@ -0,0 +1,126 @@
+# orchestrator/tests/test_auto_tone.py
+
+import time
+
+from orchestrator.auto_tone import AutoToneSelector
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import PipelineMessage
+from tone_module.sentiment import SentimentAnalyzer
+
+
+def _selector(**kwargs):
+    return AutoToneSelector(analyzer=SentimentAnalyzer(backend="heuristic"), **kwargs)
+
+
+def _run(orch, utt_id, chunks):
+    previews = []
+    for i, text in enumerate(chunks):
+        previews.append(orch.process_message(
+            PipelineMessage(id=utt_id, chunk_index=i, text=text, event="PART", is_final=False)
+        ))
+    final = orch.process_message(
+        PipelineMessage(id=utt_id, chunk_index=0, text="", event="END_GRAMMAR",
+                        is_final=True, end_of_speech_time=time.time())
+    )
+    return previews, final
+
+
+def test_selector_rules():
+    sel = _selector(long_words=10)
+
+    happy = sel.start()
+    assert sel.observe(happy, "thanks this is great") == "casual"
+
+    upset = sel.start()
+    assert sel.observe(upset, "this is a terrible problem") == "formal"
+
+    neutral = sel.start()
+    assert sel.observe(neutral, "the meeting is at noon") == sel.default_mode
+
+    long = sel.start()
+    sel.observe(long, "thanks this is great")
+    assert sel.observe(long, "and then we talked about the plan for a while") == "concise"
+    assert long.switches == 1
+
+
+def test_selector_samples_and_skips_once_budget_is_spent():
+    sel = _selector(budget_ms=0, sample_every=2, sample_words=2)
+    d = sel.start()
+    for text in ["a b c", "d e f", "g h i", "j k l"]:
+        sel.observe(d, text)
+    assert (d.scored, d.sampled, d.skipped) == (0, 2, 2)
+    assert d.scored_words == 4
+    assert d.words == 12
+
+
+def test_auto_mode_matches_fixed_mode_output():
+    chunks = ["thanks, i'm gonna", "go now, this is great", "i kinda love it"]
+
+    auto = PipelineOrchestrator(tone_mode="auto", auto_tone=_selector())
+    _, final = _run(auto, "u1", chunks)
+
+    utt_id, decision = auto.auto_tone.history[-1]
+    assert utt_id == "u1"
+    assert decision["mode"] == "casual"
+    assert decision["chunks"] == 3
+
+    fixed = PipelineOrchestrator(tone_mode="casual")
+    _, expected = _run(fixed, "u1", chunks)
+    assert final.text == expected.text
+
+
+def test_mode_switch_rebuilds_assembly():
+    # neutral first (default formal), then a positive chunk flips it to casual
+    chunks = ["i'm gonna check the report", "thanks, that is great"]
+    for incremental in (True, False):
+        auto = PipelineOrchestrator(tone_mode="auto", auto_tone=_selector(), incremental_finalize=incremental)
+        previews, final = _run(auto, "u1", chunks)
+        fixed = PipelineOrchestrator(tone_mode="casual", incremental_finalize=incremental)
+        _, expected = _run(fixed, "u1", chunks)
+
+        assert final.text == expected.text
+        assert auto.auto_tone.history[-1][1]["switches"] == 1
+        # the first preview went out in the default mode
+        assert previews[0].text == PipelineOrchestrator(tone_mode="formal").process_message(
+            PipelineMessage(id="x", chunk_index=0, text=chunks[0], event="PART", is_final=False)
+        ).text
+
+
+def test_auto_requested_per_message():
+    orch = PipelineOrchestrator(tone_mode="neutral")
+    assert orch.auto_tone is None
+    out = orch.process_message(
+        PipelineMessage(id="u1", chunk_index=0, text="thanks, this is great", event="PART", tone_mode="auto")
+    )
+    assert out.tone_mode == "casual"
+    assert orch.auto_tone is not None
+    _, final = _run(orch, "u2", ["see you at noon"])
+    assert final.tone_mode == "neutral"
+
+
+def test_revised_chunks_replace_their_earlier_version():
+    sel = _selector(long_words=10)
+    d = sel.start()
+    sel.observe(d, "the meeting is at noon", 0)
+    for _ in range(5):  # resent and revised: still one five-word chunk
+        sel.observe(d, "the meeting is at noon", 0)
+        assert sel.observe(d, "the meeting is at one", 0) == sel.default_mode
+    assert (d.words, d.chunks) == (5, 1)
+
+    # a revision that turns the chunk negative replaces its sentiment
+    assert sel.observe(d, "this is a terrible problem", 0) == "formal"
+    assert sel.observe(d, "thanks this is great", 0) == "casual"
+    assert (d.words, d.chunks, d.scored_words) == (4, 1, 4)
+    assert d.polarity == sel.analyzer.polarity("thanks this is great")
+
+
+def test_orchestrator_resending_a_chunk_does_not_inflate_auto_features():
+    orch = PipelineOrchestrator(tone_mode="auto", auto_tone=_selector(long_words=10))
+    text = "i'm gonna check the report"
+    for _ in range(4):
+        orch.process_message(PipelineMessage(id="u", chunk_index=0, text=text, event="PART"))
+        orch.process_message(PipelineMessage(id="u", chunk_index=0, text=text + " now", event="PART"))
+    final = orch.process_message(PipelineMessage(id="u", chunk_index=-1, text="", event="END_GRAMMAR", is_final=True))
+    [(_, decision)] = list(orch.auto_tone.history)
+    assert (decision["words"], decision["chunks"]) == (6, 1)
+    assert final.tone_mode == orch.auto_tone.default_mode
@@ -50,6 +50,7 @@ def test_full_mock_pipeline_formal_mode(monkeypatch):
         logged["latency"] = latency_ms
 
     monkeypatch.setattr(latency_logger.LatencyLogger, "log", staticmethod(fake_log))
+    monkeypatch.setattr(latency_logger.LatencyLogger, "verbose", True)
 
     final_msg: PipelineMessage | None = None
 
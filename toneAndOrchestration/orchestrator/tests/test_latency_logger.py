@@ -0,0 +1,90 @@
+# orchestrator/tests/test_latency_logger.py
+
+import threading
+import time
+
+from orchestrator.latency_logger import (
+    LatencyHistogram,
+    LatencyLogger,
+    LatencyMetrics,
+    bucket_index,
+    bucket_upper,
+)
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import PipelineMessage
+from tone_module.transformer import ToneTransformer
+
+
+def test_buckets_cover_values_within_relative_error():
+    for ns in [0, 1, 31, 32, 33, 1000, 123_456, 10**9, 7 * 10**12]:
+        index = bucket_index(ns)
+        assert ns <= bucket_upper(index)
+        assert index == 0 or bucket_upper(index - 1) < ns
+        assert bucket_upper(index) - ns <= ns / 16 + 1
+
+
+def test_histogram_percentiles():
+    hist = LatencyHistogram()
+    for ms in range(1, 101):  # 1..100 ms
+        hist.record(ms * 1_000_000)
+    snap = hist.snapshot()
+
+    assert snap["count"] == 100
+    assert snap["max_ms"] == 100
+    assert abs(snap["mean_ms"] - 50.5) < 1e-9
+    for p in (50, 95, 99):
+        assert p <= snap[f"p{p}_ms"] <= p * 1.07
+
+
+def test_histogram_records_from_many_threads():
+    hist = LatencyHistogram()
+
+    def worker():
+        for i in range(10_000):
+            hist.record(i)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert hist.snapshot()["count"] == 80_000
+    hist.reset()
+    assert hist.snapshot() == {"count": 0}
+
+
+def test_compute_latency_takes_epoch_seconds():
+    latency_ms = LatencyLogger.compute_latency(time.time() - 0.25)
+    assert 250 <= latency_ms < 5000
+
+
+def test_orchestrator_records_stage_histograms(capsys):
+    metrics = LatencyMetrics()
+    orch = PipelineOrchestrator(tone_mode="formal", metrics=metrics)
+    for i, text in enumerate(["thanks i'm", "gonna join"]):
+        orch.process_message(PipelineMessage(id="u", chunk_index=i, text=text, event="PART"))
+    orch.process_message(
+        PipelineMessage(id="u", chunk_index=-1, text="", event="END_GRAMMAR",
+                        is_final=True, end_of_speech_time=time.time() - 0.1)
+    )
+
+    snap = metrics.snapshot()
+    assert snap[LatencyMetrics.PREVIEW_TRANSFORM]["count"] == 2
+    assert snap[LatencyMetrics.ASSEMBLY]["count"] == 2
+    assert snap[LatencyMetrics.FINAL_TRANSFORM]["count"] == 1
+    assert snap[LatencyMetrics.END_TO_END]["p50_ms"] >= 100
+    # no per-utterance printing by default
+    assert capsys.readouterr().out == ""
+
+
+def test_transformer_finalize_records_latency():
+    metrics = LatencyMetrics()
+    tt = ToneTransformer(mode="formal", metrics=metrics)
+    tt.process_chunk(PipelineMessage(id="u", chunk_index=0, text="thanks", event="PART"))
+    tt.end_of_speech_time_by_id["u"] = time.time() - 0.2
+    tt.finalize("u")
+
+    snap = metrics.snapshot()
+    assert snap["final_transform"]["count"] == 1
+    assert 200 <= snap["end_to_end"]["p99_ms"] < 5000
@@ -1,11 +1,20 @@
 # orchestrator/tests/test_orchestrator.py
 
+import os
+import subprocess
+import sys
+import threading
 import time
 import pytest
 
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from mocks.mock_cleaner import mock_cleaner_stage
+from mocks.mock_grammar import mock_grammar_stage
+from orchestrator.latency_logger import LatencyMetrics
 from orchestrator.orchestrator import PipelineOrchestrator
 from orchestrator.state import UtteranceState
 from schemas.pipeline_message import PipelineMessage
+from tone_module.cache import TransformCache
 
 
 def test_orchestrator_streaming_previews_and_final_end_tone(monkeypatch):
@@ -87,6 +96,7 @@ def test_orchestrator_streaming_previews_and_final_end_tone(monkeypatch):
         recorded["latency_ms"] = latency_ms
 
     monkeypatch.setattr(latency_logger.LatencyLogger, "log", staticmethod(fake_log))
+    monkeypatch.setattr(latency_logger.LatencyLogger, "verbose", True)
 
     final = orch.process_message(end_msg)
 
@@ -123,3 +133,238 @@ def test_orchestrator_ignores_unknown_events():
     assert out is None
     # state is created but no output
     assert "utt2" in orch.state_by_id
+
+
+@pytest.mark.parametrize("mode", ["formal", "casual", "concise", "neutral"])
+def test_incremental_finalize_matches_full_retransform(mode):
+    """
+    Cached per-chunk results spliced at END_GRAMMAR must give exactly the
+    same END_TONE text as re-transforming the assembled utterance, including
+    when multi-word rules span chunk boundaries and chunks arrive out of order.
+    """
+    texts = ["Thank", "you, I do", "not kind", "of know. It is", "really yes."]
+    order = [2, 0, 4, 1, 3]
+
+    finals = []
+    for incremental in (True, False):
+        orch = PipelineOrchestrator(tone_mode=mode, incremental_finalize=incremental)
+        for i in order:
+            orch.process_message(PipelineMessage(id="u", chunk_index=i, text=texts[i], event="PART"))
+        final = orch.process_message(
+            PipelineMessage(id="u", chunk_index=-1, text="", event="END_GRAMMAR",
+                            is_final=True, end_of_speech_time=time.time())
+        )
+        finals.append(final.text)
+
+    assert finals[0] == finals[1]
+
+
+
+@pytest.mark.parametrize("mode", ["formal", "casual", "concise", "neutral"])
+def test_absorbed_parts_give_the_same_final(mode):
+    """PARTs taken in with absorb() (no preview) do not change END_TONE, mixed with normal ones too."""
+    texts = ["Thank", "you, I do", "not kind", "of know. It is", "really yes."]
+    finals = []
+    for absorbed in ((), (0, 1, 2, 3, 4), (1, 3), (0,)):
+        orch = PipelineOrchestrator(tone_mode=mode)
+        previews = 0
+        for i, text in enumerate(texts):
+            msg = PipelineMessage(id="u", chunk_index=i, text=text, event="PART")
+            if i in absorbed:
+                assert orch.absorb(msg) is None
+            else:
+                previews += orch.process_message(msg).event == "PREVIEW_TONE"
+        assert previews == len(texts) - len(absorbed)
+        final = orch.process_message(PipelineMessage(id="u", chunk_index=-1, text="", event="END_GRAMMAR"))
+        finals.append((final.text, final.tone_mode))
+    assert len(set(finals)) == 1
+
+def test_orchestrator_bounds_abandoned_utterances():
+    """
+    Utterances that never get END_GRAMMAR are evicted once max_utterances
+    is exceeded; on_evict can force-finalize them with what they received.
+    """
+    finals = []
+    orch = PipelineOrchestrator(
+        tone_mode="formal",
+        max_utterances=2,
+        on_evict=lambda utt_id, state, reason: finals.append(orch.finalize_state(utt_id, state)),
+    )
+    for utt_id in ["a", "b", "c"]:
+        orch.process_message(PipelineMessage(id=utt_id, chunk_index=0, text="i'm gonna join", event="PART"))
+
+    assert set(orch.state_by_id) == {"b", "c"}
+    assert orch.state_by_id.stats() == {"live": 2, "evicted": 1, "expired": 0}
+    assert [(m.id, m.event, m.text) for m in finals] == [("a", "END_TONE", "I am going to join.")]
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _part(i, text, utt_id="u"):
+    return PipelineMessage(id=utt_id, chunk_index=i, text=text, event="PART")
+
+
+def test_stable_previews_emit_contiguous_deltas_and_revisions():
+    orch = PipelineOrchestrator(tone_mode="formal", stable_previews=True)
+
+    assert orch.process_message(_part(1, "i'm gonna")) is None  # waits for chunk 0
+    out = orch.process_message(_part(0, "thanks"))
+    assert (out.event, out.chunk_index, out.text) == ("PREVIEW_TONE", 0, "thank you I am going to")
+
+    out = orch.process_message(_part(2, "join"))
+    assert (out.event, out.chunk_index, out.text) == ("PREVIEW_TONE", 2, "join")
+
+    # identical resend: nothing; real change of a shown chunk: REVISION_TONE
+    assert orch.process_message(_part(1, "i'm gonna")) is None
+    out = orch.process_message(_part(1, "we're gonna"))
+    assert (out.event, out.chunk_index, out.text) == ("REVISION_TONE", 1, "we are going to")
+
+    final = orch.process_message(
+        PipelineMessage(id="u", chunk_index=-1, text="", event="END_GRAMMAR",
+                        is_final=True, end_of_speech_time=time.time())
+    )
+    assert final.text == "thank you we are going to join."
+
+
+def test_stable_previews_coalesce_bursts_within_window():
+    clock = _Clock()
+    orch = PipelineOrchestrator(tone_mode="neutral", stable_previews=True, preview_window=0.05, clock=clock)
+
+    first = orch.process_message(_part(0, "a"))
+    assert (first.chunk_index, first.text) == (0, "a")  # leading edge goes out at once
+    clock.now = 0.01
+    assert orch.process_message(_part(1, "b")) is None
+    clock.now = 0.02
+    assert orch.process_message(_part(2, "c")) is None
+    assert orch.flush_previews() == []  # window not over yet
+
+    clock.now = 0.08
+    [held] = orch.flush_previews()
+    assert (held.event, held.chunk_index, held.text) == ("PREVIEW_TONE", 1, "b c")
+    assert orch.flush_previews() == []
+
+    clock.now = 0.09
+    assert orch.process_message(_part(3, "d")) is None
+    clock.now = 0.2
+    out = orch.process_message(_part(4, "e"))
+    assert (out.chunk_index, out.text) == (3, "d e")
+
+
+def test_shared_orchestrator_serves_every_mode_from_many_threads():
+    """Each utterance names its own tone_mode; 4 threads share one orchestrator."""
+    modes = ("formal", "casual", "concise", "neutral")
+    config = WorkloadConfig(utterances=120, chunks_per_utterance=(2, 6), seed=5,
+                            end_of_speech_time=time.time(), tone_modes=modes)
+    msgs = mock_grammar_stage(mock_cleaner_stage(synthetic_asr_stream(config)))
+
+    # reference: one single-threaded orchestrator per mode
+    fixed = {m: PipelineOrchestrator(tone_mode=m) for m in modes}
+    expected = {}
+    for msg in msgs:
+        out = fixed[msg.tone_mode].process_message(msg)
+        if out is not None:
+            expected.setdefault(msg.id, []).append((out.event, out.text, out.tone_mode))
+
+    shared = PipelineOrchestrator(tone_mode="neutral", tone_cache=TransformCache(), metrics=LatencyMetrics())
+    threads = 4
+    got = [{} for _ in range(threads)]
+
+    def worker(t):
+        for msg in msgs:
+            if int(msg.id.rsplit("_", 1)[1]) % threads == t:
+                out = shared.process_message(msg)
+                if out is not None:
+                    got[t].setdefault(msg.id, []).append((out.event, out.text, out.tone_mode))
+
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # interleave the threads as much as possible
+    try:
+        pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+        for th in pool:
+            th.start()
+        for th in pool:
+            th.join()
+    finally:
+        sys.setswitchinterval(switch)
+
+    merged = {k: v for part in got for k, v in part.items()}
+    assert merged == expected
+    assert shared.tone_transformer.mode == "neutral"
+    assert len(shared.state_by_id) == 0
+
+
+@pytest.mark.parametrize("bounds", [{"max_utterances": 4}, {"utterance_ttl": 0.002}])
+def test_bounded_state_shared_by_many_threads(bounds):
+    """Eviction and expiry racing with finalize in other threads must not raise."""
+    config = WorkloadConfig(utterances=160, chunks_per_utterance=(2, 6), seed=8)
+    msgs = mock_grammar_stage(mock_cleaner_stage(synthetic_asr_stream(config)))
+    shared = PipelineOrchestrator(tone_mode="formal", **bounds)
+    threads = 8
+    finals = [0] * threads
+    errors = []
+
+    def worker(t):
+        try:
+            for msg in msgs:
+                if int(msg.id.rsplit("_", 1)[1]) % threads == t:
+                    out = shared.process_message(msg)
+                    finals[t] += out is not None and out.event == "END_TONE"
+        except Exception as e:  # surfaced below: a thread's exception is otherwise only printed
+            errors.append(e)
+
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+        for th in pool:
+            th.start()
+        for th in pool:
+            th.join()
+    finally:
+        sys.setswitchinterval(switch)
+
+    assert errors == []
+    assert sum(finals) == 160  # every utterance still ends, evicted or not
+    assert len(shared.state_by_id) <= bounds.get("max_utterances", 160)
+
+
+def test_backends_are_imported_on_first_use():
+    """pydantic, contractions and sentiment backends stay unloaded until needed."""
+    script = """
+import sys
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import FastMessage
+loaded = lambda: sorted(m for m in ("pydantic", "contractions", "vaderSentiment", "textblob") if m in sys.modules)
+orch = PipelineOrchestrator(tone_mode="neutral")
+orch.process_message(FastMessage(id="u", chunk_index=0, text="hi", event="PART"))
+print(loaded())
+orch.process_message(FastMessage(id="u", chunk_index=1, text="i'm here", event="PART", tone_mode="formal"))
+print(loaded())
+orch.warmup()
+print(loaded())
+"""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    out = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True).stdout
+    assert out.splitlines() == ["[]", "[]", "['pydantic']"]
+
+
+def test_transformer_batch_on_fast_messages_does_not_import_pydantic():
+    script = """
+import sys
+from schemas.pipeline_message import FastMessage
+from tone_module.transformer import ToneTransformer
+out = ToneTransformer(mode="formal").process_batch([
+    FastMessage(id="u", chunk_index=0, text="i'm here", event="PART"),
+    FastMessage(id="u", chunk_index=-1, text="", event="END_GRAMMAR", is_final=True),
+])
+print(type(out[-1]).__name__, "pydantic" in sys.modules)
+"""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    out = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True).stdout
+    assert out.split() == ["FastMessage", "False"]
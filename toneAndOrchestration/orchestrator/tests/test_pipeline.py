@@ -0,0 +1,86 @@
+# orchestrator/tests/test_pipeline.py
+
+import asyncio
+import itertools
+import time
+import tracemalloc
+
+import pytest
+
+from mocks.mock_asr import mock_asr_stream
+from mocks.mock_cleaner import aclean_stream, clean_stream
+from mocks.mock_grammar import agrammar_stream, grammar_stream, mock_upstream_stages
+from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.pipeline import StreamPipeline
+from schemas.pipeline_message import FastMessage
+
+
+def _pipeline(orch: PipelineOrchestrator) -> StreamPipeline:
+    return (
+        StreamPipeline()
+        .stage("cleaner", clean_stream, aclean_stream)
+        .stage("grammar", grammar_stream, agrammar_stream)
+        .stage("tone", orch.stream, orch.astream)
+    )
+
+
+def test_streaming_pipeline_matches_list_stages():
+    eos = time.time()
+    batch_orch = PipelineOrchestrator(tone_mode="formal")
+    expected = [
+        (o.event, o.chunk_index, o.text)
+        for o in batch_orch.stream(mock_upstream_stages(mock_asr_stream("u", FastMessage, eos)))
+    ]
+
+    pipe = _pipeline(PipelineOrchestrator(tone_mode="formal"))
+    assert [(o.event, o.chunk_index, o.text) for o in pipe.run(mock_asr_stream("u", FastMessage, eos))] == expected
+    assert set(pipe.first_output_ms) == {"cleaner", "grammar", "tone"}
+
+
+def test_first_preview_arrives_before_the_utterance_ends():
+    pulled = []
+
+    def source():
+        for msg in mock_asr_stream("u", FastMessage, time.time()):
+            pulled.append(msg.event)
+            yield msg
+
+    pipe = _pipeline(PipelineOrchestrator(tone_mode="formal"))
+    first = next(pipe.run(source()))
+    assert first.event == "PREVIEW_TONE"
+    assert pulled == ["PART"]  # only the first chunk was read
+    assert pipe.first_output_ms["cleaner"] <= pipe.first_output_ms["tone"]
+
+
+def test_async_pipeline():
+    async def source():
+        for msg in mock_asr_stream("u", FastMessage, time.time()):
+            yield msg
+
+    async def run():
+        pipe = _pipeline(PipelineOrchestrator(tone_mode="casual"))
+        return [o async for o in pipe.arun(source())]
+
+    outs = asyncio.run(run())
+    assert [o.event for o in outs] == ["PREVIEW_TONE"] * 3 + ["END_TONE"]
+
+    with pytest.raises(TypeError):
+        next(StreamPipeline().stage("only_async", aio=aclean_stream).run([]))
+
+
+def test_long_session_memory_stays_constant():
+    eos = time.time()
+    session = itertools.chain.from_iterable(mock_asr_stream(f"utt_{i}", FastMessage, eos) for i in range(2000))
+    pipe = _pipeline(PipelineOrchestrator(tone_mode="formal"))
+
+    tracemalloc.start()
+    try:
+        for n, _ in enumerate(pipe.run(session)):
+            if n == 1000:
+                early, _ = tracemalloc.get_traced_memory()
+        late, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert n + 1 == 2000 * 4
+    assert late < early + 64 * 1024
@@ -0,0 +1,108 @@
+# orchestrator/tests/test_scheduler.py
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from mocks.mock_grammar import mock_upstream_stages
+from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.scheduler import OverloadScheduler
+from schemas.pipeline_message import FastMessage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+WORKLOAD = WorkloadConfig(utterances=40, seed=6, tone_modes=("formal", "casual", "concise"))
+
+
+def _finals(msgs):
+    return {m.id: (m.text, m.tone_mode) for m in msgs if m.event == "END_TONE"}
+
+
+def test_without_overload_output_is_unchanged():
+    msgs = mock_upstream_stages(synthetic_asr_stream(WORKLOAD, FastMessage))
+    expected = list(PipelineOrchestrator().stream(msgs))
+    scheduler = OverloadScheduler(stale_after=float("inf"))
+    got = []
+    for m in msgs:
+        scheduler.submit(m)
+        got += scheduler.step()
+    assert got == expected
+    assert scheduler.pending == 0
+    assert (scheduler.shed, scheduler.deadline_misses) == (0, 0)
+
+
+def test_backlog_serves_finals_first_and_sheds_stale_previews():
+    msgs = mock_upstream_stages(synthetic_asr_stream(WORKLOAD, FastMessage))
+    clock = FakeClock()
+    scheduler = OverloadScheduler(stale_after=0.1, final_deadline=0.5, clock=clock)
+    for m in msgs:
+        scheduler.submit(m)
+    clock.now += 0.2  # everything queued is stale now
+    out = scheduler.run([])
+    ends = [m for m in out if m.event == "END_TONE"]
+    # every utterance ended in the backlog: all finals, no previews
+    assert len(out) == len(ends) == 40
+    assert scheduler.shed == sum(m.event == "PART" for m in msgs)
+    assert scheduler.deadline_misses == 0
+    assert _finals(out) == _finals(PipelineOrchestrator().stream(msgs))
+
+
+def test_end_grammar_jumps_the_preview_queue():
+    scheduler = OverloadScheduler(stale_after=float("inf"), clock=FakeClock())
+    for i in range(5):
+        scheduler.submit(FastMessage("a", i, "I am going to the store.", "PART"))
+    scheduler.submit(FastMessage("b", 0, "Thanks.", "PART"))
+    scheduler.submit(FastMessage("b", -1, "", "END_GRAMMAR", True))
+    first = scheduler.step()
+    assert [(m.id, m.event) for m in first] == [("b", "END_TONE")]
+    assert scheduler.shed == 1  # b's preview was superseded
+    assert [m.event for m in scheduler.run([])] == ["PREVIEW_TONE"] * 5
+
+
+def test_earliest_deadline_first_and_misses():
+    clock = FakeClock()
+    scheduler = OverloadScheduler(final_deadline=0.3, clock=clock)
+    scheduler.submit(FastMessage("late", -1, "", "END_GRAMMAR", True, end_of_speech_time=clock.now))
+    scheduler.submit(FastMessage("early", -1, "", "END_GRAMMAR", True, end_of_speech_time=clock.now - 1))
+    assert [m.id for m in scheduler.step()] == ["early"]
+    assert scheduler.deadline_misses == 1
+    assert [m.id for m in scheduler.step()] == ["late"]
+    assert (scheduler.finalized, scheduler.deadline_misses) == (2, 1)
+
+
+def test_utterances_without_end_grammar_are_not_kept():
+    clock = FakeClock()
+    scheduler = OverloadScheduler(stale_after=0.1, clock=clock)
+    for i in range(100):
+        scheduler.submit(FastMessage(f"u{i}", 0, "hello there.", "PART"))
+    assert len(scheduler.run([])) == 100  # previews
+    for i in range(100):
+        scheduler.submit(FastMessage(f"v{i}", 0, "hello there.", "PART"))
+    clock.now += 1
+    assert scheduler.run([]) == []  # all shed
+    assert scheduler._utterances == {}
+    # a later END_GRAMMAR still finalizes with what was absorbed
+    [final] = scheduler.run([FastMessage("v3", -1, "", "END_GRAMMAR", True)])
+    assert (final.event, final.text) == ("END_TONE", "hello there.")
+    assert scheduler._utterances == {}
+
+def test_astream():
+    msgs = mock_upstream_stages(synthetic_asr_stream(replace(WORKLOAD, utterances=10), FastMessage))
+
+    async def source():
+        for m in msgs:
+            yield m
+
+    async def collect():
+        return [m async for m in OverloadScheduler(stale_after=float("inf")).astream(source())]
+
+    out = asyncio.run(collect())
+    assert _finals(out) == _finals(PipelineOrchestrator().stream(msgs))
@@ -0,0 +1,181 @@
+# orchestrator/tests/test_server.py
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from mocks.mock_grammar import mock_upstream_stages
+from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.server import OrchestratorClient, OrchestratorServer
+from schemas.pipeline_message import FastMessage
+
+
+def _by_id(msgs):
+    out = {}
+    for m in msgs:
+        out.setdefault(m.id, []).append(m)
+    return out
+
+
+@pytest.mark.parametrize("unix", [False, True])
+def test_many_sessions_per_connection_match_in_process(unix):
+    config = WorkloadConfig(utterances=30, tone_modes=("formal", "casual"))
+    msgs = mock_upstream_stages(synthetic_asr_stream(config, FastMessage))
+    expected = _by_id(PipelineOrchestrator().stream(msgs))
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            server = OrchestratorServer()
+            if unix:
+                await server.start(path=os.path.join(tmp, "orch.sock"))
+            else:
+                await server.start()
+            async with server:
+                clients = [await OrchestratorClient.connect(server.address) for _ in range(3)]
+                results = await asyncio.gather(*(c.request(msgs) for c in clients))
+                for c in clients:
+                    await c.close()
+            return server, results
+
+    server, results = asyncio.run(run())
+    for got in results:
+        assert _by_id(got) == expected
+    assert server.connections == 3
+    assert server.messages_in == 3 * len(msgs)
+    assert server.messages_out == 3 * sum(map(len, expected.values()))
+
+
+def test_slow_reader_is_throttled():
+    config = WorkloadConfig(utterances=400, tone_modes=("formal", "casual"))
+    msgs = mock_upstream_stages(synthetic_asr_stream(config, FastMessage)) * 20
+
+    async def run():
+        async with OrchestratorServer(max_pending=8, output_queue_size=8, read_size=4096) as server:
+            client = await OrchestratorClient.connect(server.address)
+            client.send(msgs)  # responses not read yet
+            await asyncio.sleep(0.5)
+            stalled_at = server.messages_in
+            client.close_input()
+            got = [m async for m in client.responses()]
+            await client.close()
+            return stalled_at, got
+
+    stalled_at, got = asyncio.run(run())
+    assert stalled_at < len(msgs) / 2
+    assert len(got) == len(msgs)  # one PREVIEW_TONE / END_TONE each
+
+
+def test_shutdown_drains_in_flight_utterances_and_rejects_new_ones():
+    first = [FastMessage("a", 0, "I really want to go.", "PART")]
+    rest = [FastMessage("a", 1, "Thanks.", "PART"), FastMessage("a", -1, "", "END_GRAMMAR", True),
+            FastMessage("b", 0, "Too late.", "PART"), FastMessage("b", -1, "", "END_GRAMMAR", True)]
+
+    async def run():
+        server = OrchestratorServer(drain_timeout=5)
+        await server.start()
+        client = await OrchestratorClient.connect(server.address)
+        responses = client.responses().__aiter__()
+        client.send(first)
+        preview = await responses.__anext__()
+        stopping = asyncio.create_task(server.shutdown())
+        await asyncio.sleep(0.05)
+        assert not stopping.done()  # "a" is still open
+        client.send(rest)
+        got = [m async for m in responses]  # server closes once "a" is done
+        await stopping
+        await client.close()
+        return server, [preview] + got
+
+    server, got = asyncio.run(run())
+    assert [(m.id, m.event) for m in got] == [("a", "PREVIEW_TONE"), ("a", "PREVIEW_TONE"), ("a", "END_TONE")]
+    assert server.rejected == 2
+
+
+def test_shutdown_gives_up_after_drain_timeout():
+    async def run():
+        server = OrchestratorServer()
+        await server.start()
+        client = await OrchestratorClient.connect(server.address)
+        client.send([FastMessage("a", 0, "hello.", "PART")])
+        await client.responses().__anext__()
+        await asyncio.wait_for(server.shutdown(drain_timeout=0.1), 2)
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_malformed_frame_closes_only_that_connection(caplog):
+    async def run():
+        async with OrchestratorServer() as server:
+            bad = await OrchestratorClient.connect(server.address)
+            bad.writer.write(b"\x03\xf8\x00\x00")  # unknown event code
+            await bad.drain()
+            dropped = [m async for m in bad.responses()]  # ends when the server closes
+            await bad.close()
+            good = await OrchestratorClient.connect(server.address)
+            got = await good.request([FastMessage("a", 0, "hi.", "PART")])
+            await good.close()
+        return server, dropped, got
+
+    server, dropped, got = asyncio.run(run())
+    assert dropped == []
+    assert [m.event for m in got] == ["PREVIEW_TONE"]
+    assert server.protocol_errors == 1
+    assert [r.levelname for r in caplog.records if r.name == "orchestrator.server"] == ["WARNING"]
+
+
+def test_oversized_frame_is_rejected_before_it_is_buffered():
+    async def run():
+        async with OrchestratorServer(max_frame=1024) as server:
+            client = await OrchestratorClient.connect(server.address)
+            client.writer.write(b"\x80\x80\x80\x80\x80\x20")  # length prefix of 1 << 40
+            await client.drain()
+
+            async def collect():
+                return [m async for m in client.responses()]
+
+            got = await asyncio.wait_for(collect(), 2)  # closed without waiting for the body
+            await client.close()
+        return server, got
+
+    server, got = asyncio.run(run())
+    assert got == []
+    assert server.protocol_errors == 1
+
+
+def test_orchestrator_errors_are_not_protocol_errors(caplog):
+    class Failing(PipelineOrchestrator):
+        def process_message(self, msg):
+            raise ValueError("boom")
+
+    async def run():
+        async with OrchestratorServer(orchestrator_factory=Failing) as server:
+            client = await OrchestratorClient.connect(server.address)
+            got = await asyncio.wait_for(client.request([FastMessage("a", 0, "hi.", "PART")]), 2)
+            await client.close()
+        return server, got
+
+    server, got = asyncio.run(run())
+    assert got == []
+    assert server.protocol_errors == 0
+    [record] = [r for r in caplog.records if r.name == "orchestrator.server"]
+    assert record.levelname == "ERROR" and "boom" in str(record.exc_info[1])
+
+
+def test_abandoned_utterances_do_not_pile_up_on_a_connection():
+    async def run():
+        async with OrchestratorServer(max_utterances=4) as server:
+            client = await OrchestratorClient.connect(server.address)
+            responses = client.responses().__aiter__()
+            client.send(FastMessage(f"u{i}", 0, "hi.", "PART") for i in range(50))
+            for _ in range(50):
+                await responses.__anext__()
+            [conn] = server._live
+            open_now = set(conn.open)
+            await client.close()
+        return open_now
+
+    open_now = asyncio.run(run())
+    assert open_now == {"u46", "u47", "u48", "u49"}
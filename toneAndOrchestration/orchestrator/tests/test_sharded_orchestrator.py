@@ -0,0 +1,75 @@
+# orchestrator/tests/test_sharded_orchestrator.py
+
+import time
+
+from mocks.mock_asr import mock_asr_stream
+from mocks.mock_grammar import mock_upstream_stages
+
+from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.sharded_orchestrator import ShardedOrchestrator, pack, shard_for, unpack
+from schemas.pipeline_message import FastMessage, PipelineMessage
+from tone_module.cache import TransformCache
+from tone_module.rule_engine import ToneRuleSet
+from tone_module.tone_rules import FORMAL_EXPANSIONS, HEDGES, INTENSIFIERS
+
+
+def test_pack_unpack_round_trip():
+    msgs = [
+        PipelineMessage(id="u1", chunk_index=3, text="héllo", event="PART"),
+        PipelineMessage(id="u1", chunk_index=-1, text="", event="END_GRAMMAR", is_final=True, end_of_speech_time=1.5),
+        PipelineMessage(id="u2", chunk_index=0, text="x", event="CUSTOM_EVENT"),
+    ]
+    msgs += [FastMessage.from_model(m) for m in msgs]
+    for m in msgs:
+        back = unpack(pack(m))
+        assert (type(back), back) == (type(m), m)
+    assert isinstance(pack(msgs[0])[3], int)
+
+
+def test_fast_messages_come_back_as_fast_messages():
+    messages = mock_upstream_stages(mock_asr_stream("utt_f", FastMessage, end_of_speech_time=time.time()))
+    outputs = list(ShardedOrchestrator(tone_mode="formal", num_workers=2).process_stream(messages))
+    expected = PipelineOrchestrator(tone_mode="formal").stream(messages)
+    assert {type(m) for m in outputs} == {FastMessage}
+    assert outputs == list(expected)
+
+
+def test_shard_for_is_stable_and_in_range():
+    shards = {shard_for(f"utt_{i}", 4) for i in range(100)}
+    assert shards == {0, 1, 2, 3}
+    assert shard_for("utt_7", 4) == shard_for("utt_7", 4)
+
+
+def test_sharded_orchestrator_matches_in_process_results():
+    per_utt = [mock_upstream_stages(mock_asr_stream(f"utt_{i}", end_of_speech_time=time.time())) for i in range(200)]
+    # round-robin interleaving keeps each utterance's own order
+    messages = [m for group in zip(*per_utt) for m in group]
+
+    sharded = ShardedOrchestrator(tone_mode="concise", num_workers=3, batch_size=16)
+    outputs = list(sharded.process_stream(messages))
+
+    sync = PipelineOrchestrator(tone_mode="concise")
+    expected = [r for r in (sync.process_message(m) for m in messages) if r is not None]
+
+    def by_utt(msgs):
+        grouped = {}
+        for m in msgs:
+            grouped.setdefault(m.id, []).append((m.event, m.chunk_index, m.text))
+        return grouped
+
+    assert by_utt(outputs) == by_utt(expected)
+
+
+def test_workers_use_the_given_rules_and_cache_settings():
+    rules = ToneRuleSet(FORMAL_EXPANSIONS, {"purchase": "buy"}, HEDGES, INTENSIFIERS)
+    messages = []
+    for i in range(20):
+        messages += [
+            PipelineMessage(id=f"u{i}", chunk_index=0, text="I want to purchase it", event="PART"),
+            PipelineMessage(id=f"u{i}", chunk_index=-1, text="", event="END_GRAMMAR", is_final=True),
+        ]
+    cache = TransformCache(max_size=8)
+    sharded = ShardedOrchestrator(tone_mode="casual", num_workers=2, rules=rules, tone_cache=cache)
+    finals = {m.text for m in sharded.process_stream(messages) if m.event == "END_TONE"}
+    assert finals == {"I want to buy it."}
+    assert (cache.hits, cache.misses) == (0, 0)  # each worker used a cache of its own
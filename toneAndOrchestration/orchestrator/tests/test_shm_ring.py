@@ -0,0 +1,90 @@
+# orchestrator/tests/test_shm_ring.py
+import multiprocessing as mp
+import queue
+import time
+
+import pytest
+
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from mocks.mock_cleaner import clean_stream
+from mocks.mock_grammar import grammar_stream
+from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.shm_ring import ShmRing, run_stage
+from schemas.pipeline_message import FastMessage, PipelineMessage
+
+
+@pytest.fixture
+def rings():
+    made = []
+
+    def make(*args, **kwargs):
+        ring = ShmRing(*args, **kwargs)
+        made.append(ring)
+        return ring
+
+    yield make
+    for ring in made:
+        ring.unlink()
+
+
+def test_round_trip_and_wrap_around(rings):
+    ring = rings(capacity=1024, max_batch=3)
+    msgs = synthetic_asr_stream(WorkloadConfig(utterances=200, seed=4, tone_modes=("formal", "casual")), FastMessage)
+    got = []
+    for i in range(0, len(msgs), 7):  # many laps of a small ring
+        ring.put_many(msgs[i:i + 7])
+        got += [ring.get() for _ in msgs[i:i + 7]]
+    ring.put(msgs[0])
+    ring.close()
+    assert got + list(ring) == msgs + [msgs[0]]
+    with pytest.raises(EOFError):
+        ring.get()
+
+
+def test_full_and_empty_time_out(rings):
+    ring = rings(capacity=256, timeout=0.05, wait="yield")
+    with pytest.raises(queue.Empty):
+        ring.get()
+    msg = FastMessage("u", 0, "x" * 40, "PART")
+    with pytest.raises(queue.Full):
+        for _ in range(100):
+            ring.put(msg)
+    with pytest.raises(ValueError):
+        ring.put(FastMessage("u", 0, "x" * 200, "PART"))  # larger than half the ring
+
+
+def test_model_class_and_attach_by_name(rings):
+    ring = rings(message_cls=PipelineMessage)
+    msg = PipelineMessage(id="é", chunk_index=3, text="héllo", event="END_GRAMMAR", end_of_speech_time=1.5)
+    ring.put(msg)
+    other = ShmRing(ring.capacity, name=ring.name, message_cls=PipelineMessage)
+    try:
+        assert other.get() == msg
+    finally:
+        other.release()
+
+
+def _produce(ring, msgs):
+    ring.put_many(msgs)
+    ring.close()
+    ring.release()
+
+
+@pytest.mark.parametrize("wait", ["spin", "block"])
+def test_stages_in_separate_processes(rings, wait):
+    asr = synthetic_asr_stream(WorkloadConfig(utterances=50, seed=4, tone_modes=("formal", "casual")), FastMessage)
+    expected = list(PipelineOrchestrator(tone_mode="formal").stream(grammar_stream(clean_stream(asr))))
+    links = [rings(capacity=4096, wait=wait, max_batch=8) for _ in range(4)]
+    stages = [clean_stream, grammar_stream, PipelineOrchestrator(tone_mode="formal").stream]
+    ctx = mp.get_context()
+    procs = [ctx.Process(target=_produce, args=(links[0], asr))]
+    procs += [ctx.Process(target=run_stage, args=(stage, links[i], links[i + 1])) for i, stage in enumerate(stages)]
+    for p in procs:
+        p.start()
+    start = time.monotonic()
+    got = list(links[-1])
+    for p in procs:
+        p.join(timeout=10)
+        assert p.exitcode == 0
+    assert got == expected
+    assert time.monotonic() - start < 10
@@ -1,17 +1,66 @@
 # schemas/pipeline_message.py
-from typing import Optional
-from pydantic import BaseModel
+"""
+Message types shared by all stages. PipelineMessage (pydantic) is loaded on
+first access, so code that only uses FastMessage starts without pydantic.
+"""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Tuple, Type, Union
 
+if TYPE_CHECKING:
+    from schemas.pipeline_model import PipelineMessage
 
-class PipelineMessage(BaseModel):
+# Event vocabulary shared by all stages (append only: position is the wire code)
+EVENTS: Tuple[str, ...] = (
+    "PART", "END_ASR", "END_CLEAN", "END_GRAMMAR", "PREVIEW_TONE", "END_TONE", "REVISION_TONE",
+)
+
+
+@dataclass(slots=True)
+class FastMessage:
     """
-    Shared message object used across ALL pipeline stages.
-    This ensures ASR → Cleaner → Grammar → Tone are plug-and-play compatible.
+    Slotted, unvalidated twin of PipelineMessage for the hot path.
+    Same fields and event vocabulary; validate at the system boundary with
+    to_model() / from_model(). Internal stages accept either type and
+    answer with the type they were given.
     """
 
-    id: str                     # utterance/session ID (e.g., "utt_42")
-    chunk_index: int            # 0,1,2,... or -1 for END events
-    text: str                   # chunk text ("" for END events)
-    event: str                  # "PART", "END_ASR", "END_CLEAN", "END_GRAMMAR", "END_TONE"
-    is_final: bool = False      # ASR: whether this chunk is stable/final
-    end_of_speech_time: Optional[float] = None  # set by ASR on END_ASR
+    id: str
+    chunk_index: int
+    text: str
+    event: str
+    is_final: bool = False
+    end_of_speech_time: Optional[float] = None
+    tone_mode: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, msg: "PipelineMessage") -> "FastMessage":
+        return cls(msg.id, msg.chunk_index, msg.text, msg.event, msg.is_final, msg.end_of_speech_time, msg.tone_mode)
+
+    def to_model(self) -> "PipelineMessage":
+        """Validating conversion back to the pydantic model."""
+        return model_class()(
+            id=self.id,
+            chunk_index=self.chunk_index,
+            text=self.text,
+            event=self.event,
+            is_final=self.is_final,
+            end_of_speech_time=self.end_of_speech_time,
+            tone_mode=self.tone_mode,
+        )
+
+
+AnyMessage = Union["PipelineMessage", FastMessage]
+
+
+def model_class() -> Type["PipelineMessage"]:
+    """PipelineMessage, importing pydantic on the first call."""
+    from schemas.pipeline_model import PipelineMessage
+
+    return PipelineMessage
+
+
+def __getattr__(name: str):
+    # `from schemas.pipeline_message import PipelineMessage` keeps working
+    if name == "PipelineMessage":
+        return model_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
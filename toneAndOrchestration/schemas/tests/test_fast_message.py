@@ -0,0 +1,65 @@
+# schemas/tests/test_fast_message.py
+import time
+
+import pytest
+
+from mocks.mock_asr import mock_asr_stream
+from mocks.mock_cleaner import mock_cleaner_stage
+from mocks.mock_grammar import mock_grammar_stage
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import FastMessage, PipelineMessage
+
+
+def test_fast_message_round_trip():
+    model = PipelineMessage(
+        id="utt_1",
+        chunk_index=-1,
+        text="",
+        event="END_ASR",
+        is_final=True,
+        end_of_speech_time=12345.6,
+    )
+    fast = FastMessage.from_model(model)
+    assert fast.event == "END_ASR"
+    assert fast.end_of_speech_time == 12345.6
+    assert fast.to_model() == model
+
+
+def test_fast_message_is_slotted():
+    msg = FastMessage(id="utt_1", chunk_index=0, text="hi", event="PART")
+    assert not hasattr(msg, "__dict__")
+    with pytest.raises(AttributeError):
+        msg.extra = 1
+
+
+def test_fast_message_validates_on_to_model():
+    msg = FastMessage(id=None, chunk_index="wrong", text="hello", event="PART")
+    with pytest.raises(Exception):
+        msg.to_model()
+
+
+def test_stages_answer_in_kind():
+    orch = PipelineOrchestrator(tone_mode="formal")
+    ref = PipelineOrchestrator(tone_mode="formal")
+
+    eos = time.time()
+
+    def grammar_msgs(message_cls):
+        asr_msgs = mock_asr_stream("utt_f", message_cls)
+        for m in asr_msgs:
+            if m.event == "END_ASR":
+                m.end_of_speech_time = eos
+        return mock_grammar_stage(mock_cleaner_stage(asr_msgs))
+
+    fast_msgs = grammar_msgs(FastMessage)
+    model_msgs = grammar_msgs(PipelineMessage)
+    assert all(type(m) is FastMessage for m in fast_msgs)
+
+    for fast, model in zip(fast_msgs, model_msgs):
+        out = orch.process_message(fast)
+        expected = ref.process_message(model)
+        if expected is None:
+            assert out is None
+            continue
+        assert type(out) is FastMessage
+        assert out.to_model() == expected
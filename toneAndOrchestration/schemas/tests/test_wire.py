@@ -0,0 +1,83 @@
+# schemas/tests/test_wire.py
+import pickle
+
+import pytest
+
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from schemas import wire
+from schemas.pipeline_message import FastMessage, PipelineMessage
+
+MESSAGES = [
+    PipelineMessage(id="utt_1", chunk_index=0, text="thank you for coming", event="PART"),
+    PipelineMessage(id="utt_1", chunk_index=-1, text="", event="END_ASR", is_final=True,
+                    end_of_speech_time=1760000000.123456),
+    PipelineMessage(id="é", chunk_index=2 ** 70, text="naïve 🙂 \ud800", event="PREVIEW_TONE", tone_mode="formal"),
+    PipelineMessage(id="", chunk_index=-(2 ** 40), text="x" * 300, event="CUSTOM_EVENT", tone_mode="pirate"),
+    PipelineMessage(id="u", chunk_index=5, text="t", event="END_TONE", end_of_speech_time=-0.0, tone_mode="auto"),
+]
+
+
+@pytest.mark.parametrize("msg", MESSAGES)
+def test_round_trip_with_the_model(msg):
+    data = wire.encode(msg)
+    back = wire.decode(data, PipelineMessage)
+    assert back == msg
+    assert type(back) is PipelineMessage
+    assert repr(back.end_of_speech_time) == repr(msg.end_of_speech_time)  # bit exact, -0.0 too
+    assert wire.decode(data) == FastMessage.from_model(msg)
+    assert wire.encode(FastMessage.from_model(msg)) == data
+
+
+def test_compact():
+    assert len(wire.encode(MESSAGES[1])) == 1 + 1 + 6 + 1 + 8
+    assert len(wire.encode(MESSAGES[0])) < len(MESSAGES[0].model_dump_json()) / 3
+    assert len(wire.encode(MESSAGES[0])) < len(pickle.dumps(FastMessage.from_model(MESSAGES[0]))) / 3
+
+
+def test_batch_and_frames_from_any_buffer():
+    msgs = synthetic_asr_stream(WorkloadConfig(utterances=20, tone_modes=("formal", "casual")), FastMessage)
+    data = wire.encode_batch(msgs)
+    assert data == b"".join(wire.encode_frame(m) for m in msgs)
+    for buf in (bytes(data), data, memoryview(data)):
+        decoded, used = wire.decode_frames(buf)
+        assert decoded == msgs
+        assert used == len(data)
+    # a cut frame is left for later
+    decoded, used = wire.decode_frames(memoryview(data)[:-3])
+    assert decoded == msgs[:-1]
+    assert used == len(data) - len(wire.encode_frame(msgs[-1]))
+
+
+def test_frame_decoder_handles_any_split():
+    msgs = [FastMessage.from_model(m) for m in MESSAGES] * 3
+    data = bytes(wire.encode_batch(msgs))
+    for step in (1, 2, 7, 64, len(data)):
+        decoder = wire.FrameDecoder()
+        got = []
+        for i in range(0, len(data), step):
+            got += decoder.feed(memoryview(data)[i:i + step])
+        assert got == msgs
+        assert decoder.pending == 0
+
+
+@pytest.mark.parametrize("data", [b"", b"\x00", b"\x00\x00\x05ab", b"\xf8\x00\x00\x00", b"\x02\x00\x00\x00\x01",
+                                  b"\x00\x00\x01\xff\x00"])  # last: invalid UTF-8
+def test_corrupt_input_raises_protocol_error(data):
+    with pytest.raises(wire.ProtocolError):
+        wire.decode(data)
+
+
+def test_max_frame_rejects_oversized_frames_before_they_arrive():
+    msg = FastMessage("u", 0, "x" * 100, "PART")
+    frame = bytes(wire.encode_frame(msg))
+    assert wire.FrameDecoder(max_frame=len(frame)).feed(frame) == [msg]
+    decoder = wire.FrameDecoder(max_frame=64)
+    with pytest.raises(wire.ProtocolError, match="max_frame"):
+        decoder.feed(frame[:2])  # only the length prefix so far
+    # a 1 TiB length prefix, then an endless one
+    huge = bytearray()
+    wire._put_varint(huge, 1 << 40)
+    with pytest.raises(wire.ProtocolError):
+        wire.FrameDecoder(max_frame=1 << 20).feed(huge)
+    with pytest.raises(wire.ProtocolError):
+        wire.FrameDecoder(max_frame=1 << 20).feed(b"\xff" * 11)
@@ -0,0 +1,264 @@
+# schemas/wire.py
+"""
+Compact binary codec for PipelineMessage / FastMessage, for moving messages
+between processes or services without JSON or pickle.
+
+Message body:
+    header      1 byte: event code << 3 | flags (FINAL, EOS, TONE)
+    [event]     only for events outside EVENTS (code 31): varint length + UTF-8
+    chunk_index zigzag varint (-1 is one byte)
+    id, text    varint length + UTF-8 each
+    [eos]       8-byte little-endian double, if the EOS flag is set
+    [tone_mode] if the TONE flag is set: 1-byte code into TONE_MODES, or
+                255 + varint length + UTF-8 for any other mode
+
+Event and tone-mode codes are positions in EVENTS / TONE_MODES, so those
+tables are append only. A frame is a varint body length followed by the
+body; encode_frame / encode_batch write frames into one bytearray and
+decode_frames / FrameDecoder read them straight out of bytes, bytearray or
+memoryview buffers (text is decoded from the buffer, not from a copy).
+
+Readers of untrusted streams should pass max_frame: a frame whose length
+prefix exceeds it raises ProtocolError as soon as the prefix is read, instead
+of buffering until that many bytes have arrived.
+
+Round trips are exact: ints of any size, floats bit for bit, any str
+(lone surrogates included). Decoding into the pydantic model uses
+model_construct: every field is produced with its declared type, so
+validation would only cost time.
+"""
+import struct
+from typing import Callable, Iterable, List, Optional, Tuple, Type, Union
+
+from schemas.pipeline_message import EVENTS, AnyMessage, FastMessage
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Tone modes sent as one byte (append only: position is the wire code)
+TONE_MODES: Tuple[str, ...] = ("neutral", "formal", "casual", "concise", "auto")
+
+_FINAL, _EOS, _TONE = 1, 2, 4
+_LITERAL_EVENT = 31
+_LITERAL_TONE = 255
+_EVENT_CODES = {e: i for i, e in enumerate(EVENTS)}
+_TONE_CODES = {m: i for i, m in enumerate(TONE_MODES)}
+_DOUBLE = struct.Struct("<d")
+
+# longest varint of a 64-bit length
+_MAX_PREFIX = 10
+
+
+class ProtocolError(ValueError):
+    """Malformed or oversized input: the byte stream cannot be decoded further."""
+
+
+if len(EVENTS) >= _LITERAL_EVENT or len(TONE_MODES) >= _LITERAL_TONE:
+    raise RuntimeError("wire code tables are full")
+
+
+# -----------------------------------------
+# Encoding
+# -----------------------------------------
+def _put_varint(out: bytearray, n: int):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _put_str(out: bytearray, s: str):
+    data = s.encode("utf-8", "surrogatepass")
+    _put_varint(out, len(data))
+    out += data
+
+
+def _encode_body(msg: AnyMessage, out: bytearray):
+    code = _EVENT_CODES.get(msg.event, _LITERAL_EVENT)
+    eos = msg.end_of_speech_time
+    tone = msg.tone_mode
+    out.append(
+        code << 3
+        | (_FINAL if msg.is_final else 0)
+        | (_EOS if eos is not None else 0)
+        | (_TONE if tone is not None else 0)
+    )
+    if code == _LITERAL_EVENT:
+        _put_str(out, msg.event)
+    n = msg.chunk_index
+    _put_varint(out, n << 1 if n >= 0 else (-n << 1) - 1)
+    _put_str(out, msg.id)
+    _put_str(out, msg.text)
+    if eos is not None:
+        out += _DOUBLE.pack(eos)
+    if tone is not None:
+        tone_code = _TONE_CODES.get(tone)
+        if tone_code is None:
+            out.append(_LITERAL_TONE)
+            _put_str(out, tone)
+        else:
+            out.append(tone_code)
+
+
+def encode(msg: AnyMessage) -> bytes:
+    """One message body (unframed)."""
+    out = bytearray()
+    _encode_body(msg, out)
+    return bytes(out)
+
+
+def encode_frame(msg: AnyMessage, out: Optional[bytearray] = None) -> bytearray:
+    """Append msg as one length-prefixed frame to out (a new bytearray if None)."""
+    if out is None:
+        out = bytearray()
+    body = bytearray()
+    _encode_body(msg, body)
+    _put_varint(out, len(body))
+    out += body
+    return out
+
+
+def encode_batch(messages: Iterable[AnyMessage]) -> bytearray:
+    """Many messages as consecutive frames in one buffer."""
+    out = bytearray()
+    body = bytearray()
+    for msg in messages:
+        del body[:]
+        _encode_body(msg, body)
+        _put_varint(out, len(body))
+        out += body
+    return out
+
+
+# -----------------------------------------
+# Decoding
+# -----------------------------------------
+def _builder(cls: Type[AnyMessage]) -> Callable[..., AnyMessage]:
+    construct = getattr(cls, "model_construct", None)
+    if construct is None:
+        return cls
+    return lambda id, chunk_index, text, event, is_final, eos, tone: construct(
+        id=id, chunk_index=chunk_index, text=text, event=event,
+        is_final=is_final, end_of_speech_time=eos, tone_mode=tone,
+    )
+
+
+def _get_varint(buf: memoryview, pos: int) -> Tuple[int, int]:
+    b = buf[pos]
+    if b < 0x80:
+        return b, pos + 1
+    n, shift = b & 0x7F, 7
+    while True:
+        pos += 1
+        b = buf[pos]
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos + 1
+        shift += 7
+
+
+def _get_str(buf: memoryview, pos: int, end: int) -> Tuple[str, int]:
+    size, pos = _get_varint(buf, pos)
+    stop = pos + size
+    if stop > end:
+        raise IndexError
+    return str(buf[pos:stop], "utf-8", "surrogatepass"), stop
+
+
+def _decode_body(buf: memoryview, pos: int, end: int, build: Callable[..., AnyMessage]) -> AnyMessage:
+    try:
+        header = buf[pos]
+        pos += 1
+        code = header >> 3
+        if code == _LITERAL_EVENT:
+            event, pos = _get_str(buf, pos, end)
+        else:
+            event = EVENTS[code]
+        n, pos = _get_varint(buf, pos)
+        chunk_index = n >> 1 if not n & 1 else -((n + 1) >> 1)
+        utt_id, pos = _get_str(buf, pos, end)
+        text, pos = _get_str(buf, pos, end)
+        eos = None
+        if header & _EOS:
+            eos = _DOUBLE.unpack_from(buf, pos)[0]
+            pos += 8
+        tone = None
+        if header & _TONE:
+            tone_code = buf[pos]
+            pos += 1
+            if tone_code == _LITERAL_TONE:
+                tone, pos = _get_str(buf, pos, end)
+            else:
+                tone = TONE_MODES[tone_code]
+    except (IndexError, struct.error, UnicodeDecodeError) as exc:
+        raise ProtocolError("truncated or corrupt message") from exc
+    if pos != end:
+        raise ProtocolError(f"message length mismatch: {end - pos} bytes left over")
+    return build(utt_id, chunk_index, text, event, bool(header & _FINAL), eos, tone)
+
+
+def decode(data: Buffer, cls: Type[AnyMessage] = FastMessage) -> AnyMessage:
+    """Inverse of encode(); cls may be FastMessage or PipelineMessage."""
+    with memoryview(data) as view, view.cast("B") as buf:
+        return _decode_body(buf, 0, len(buf), _builder(cls))
+
+
+def decode_frames(
+    data: Buffer, cls: Type[AnyMessage] = FastMessage, max_frame: Optional[int] = None
+) -> Tuple[List[AnyMessage], int]:
+    """
+    Every complete frame in data, and the number of bytes they took; bytes
+    after that belong to a frame still arriving. A frame longer than
+    max_frame bytes raises ProtocolError, even if it has not fully arrived.
+    """
+    build = _builder(cls)
+    out: List[AnyMessage] = []
+    pos = 0
+    # views released on return, so a bytearray passed in can be resized
+    with memoryview(data) as view, view.cast("B") as buf:
+        size = len(buf)
+        while pos < size:
+            try:
+                length, start = _get_varint(buf, pos)
+            except IndexError:
+                if max_frame is not None and size - pos > _MAX_PREFIX:
+                    raise ProtocolError("frame length prefix too long") from None
+                break  # length prefix itself incomplete
+            if max_frame is not None and length > max_frame:
+                raise ProtocolError(f"frame of {length} bytes exceeds max_frame ({max_frame})")
+            end = start + length
+            if end > size:
+                break
+            out.append(_decode_body(buf, start, end, build))
+            pos = end
+    return out, pos
+
+
+class FrameDecoder:
+    """
+    Incremental decoder for a byte stream of frames (e.g. a socket):
+    feed() whatever arrived and get the messages it completed. Only a
+    trailing partial frame is kept between calls, so with max_frame set at
+    most about max_frame bytes are ever buffered (see decode_frames).
+    """
+
+    def __init__(self, cls: Type[AnyMessage] = FastMessage, max_frame: Optional[int] = None):
+        self.cls = cls
+        self.max_frame = max_frame
+        self._pending = bytearray()
+
+    def feed(self, data: Buffer) -> List[AnyMessage]:
+        if self._pending:
+            self._pending += data
+            messages, used = decode_frames(self._pending, self.cls, self.max_frame)
+            del self._pending[:used]
+        else:
+            messages, used = decode_frames(data, self.cls, self.max_frame)
+            if used < len(data):
+                with memoryview(data) as view:
+                    self._pending += view[used:]
+        return messages
+
+    @property
+    def pending(self) -> int:
+        """Bytes of a frame that is not complete yet."""
+        return len(self._pending)
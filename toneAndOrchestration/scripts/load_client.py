@@ -0,0 +1,137 @@
+# scripts/load_client.py
+"""
+Load generator for scripts.run_server. Each connection carries many
+interleaved utterances from mocks.mock_asr.synthetic_asr_stream, run through
+the mock cleaner and grammar stages on the client side and sent to the
+server as they come out. End-to-end latency is end of speech (stamped when
+ASR emits END_ASR) -> END_TONE received back. Runs once per connection
+count, to show how latency and throughput scale.
+
+Without --tcp / --unix a server is started in a child process.
+
+Run from toneAndOrchestration/:
+    python -m scripts.load_client [--connections 1,4,16] [--utterances 500] [--rate 0]
+    python -m scripts.load_client --tcp 127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from mocks.mock_asr import WorkloadConfig, synthetic_asr_stream
+from mocks.mock_cleaner import clean_stream
+from mocks.mock_grammar import grammar_stream
+from orchestrator.latency_logger import LatencyHistogram, since_end_of_speech_ns
+from orchestrator.server import Address, OrchestratorClient
+from schemas.pipeline_message import AnyMessage, FastMessage
+
+
+def _stamped(messages: Iterable[AnyMessage]) -> Iterator[AnyMessage]:
+    """Set end_of_speech_time as each END_ASR leaves the (mock) recognizer."""
+    for msg in messages:
+        if msg.event == "END_ASR":
+            msg.end_of_speech_time = time.time()
+        yield msg
+
+
+async def _drive(address: Address, seed: int, args, latency: LatencyHistogram) -> Tuple[int, int]:
+    client = await OrchestratorClient.connect(address)
+    config = WorkloadConfig(utterances=args.utterances, seed=seed, tone_modes=args.tone_modes)
+    asr = synthetic_asr_stream(config, FastMessage)
+
+    async def receive() -> int:
+        n = 0
+        async for msg in client.responses():
+            n += 1
+            if msg.event == "END_TONE" and msg.end_of_speech_time is not None:
+                latency.record(since_end_of_speech_ns(msg.end_of_speech_time))
+        return n
+
+    receiving = asyncio.create_task(receive())
+    interval = args.batch / args.rate if args.rate else 0.0
+    sent = 0
+    batch: List[AnyMessage] = []
+    for msg in grammar_stream(clean_stream(_stamped(asr))):
+        batch.append(msg)
+        # an END goes out at once: someone is waiting for it
+        if len(batch) >= args.batch or msg.event == "END_GRAMMAR":
+            client.send(batch)
+            sent += len(batch)
+            batch = []
+            await client.drain()
+            await asyncio.sleep(interval)
+    client.send(batch)
+    sent += len(batch)
+    await client.drain()
+    client.close_input()
+    received = await receiving
+    await client.close()
+    return sent, received
+
+
+async def _run(address: Address, connections: int, args):
+    latency = LatencyHistogram()
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(_drive(address, seed, args, latency) for seed in range(connections)))
+    seconds = time.perf_counter() - start
+    sent = sum(c[0] for c in counts)
+    received = sum(c[1] for c in counts)
+    snap = latency.snapshot()
+    print(f"{connections:>5} {sent:>9} {received:>9} {sent / seconds:>10.0f} "
+          f"{snap['p50_ms']:>8.2f} {snap['p99_ms']:>8.2f} {snap['max_ms']:>8.2f}")
+
+
+def _spawn_server(tone_mode: str) -> Tuple[subprocess.Popen, Address]:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "scripts.run_server", "--port", "0", "--tone-mode", tone_mode],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()  # "listening on ('127.0.0.1', 54321)"
+    host, port = line.split("(", 1)[1].rstrip(")\n").split(", ")
+    return proc, (host.strip("'"), int(port))
+
+
+def _parse_address(args) -> Optional[Address]:
+    if args.unix:
+        return args.unix
+    if args.tcp:
+        host, port = args.tcp.rsplit(":", 1)
+        return host, int(port)
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tcp", help="host:port of a running server")
+    parser.add_argument("--unix", help="Unix socket path of a running server")
+    parser.add_argument("--connections", default="1,4,16", help="comma-separated connection counts to run")
+    parser.add_argument("--utterances", type=int, default=500, help="per connection")
+    parser.add_argument("--rate", type=float, default=0.0, help="messages/s per connection (0 = unpaced)")
+    parser.add_argument("--batch", type=int, default=16, help="messages per write")
+    parser.add_argument("--tone-mode", default="formal", help="server default when spawned")
+    parser.add_argument("--tone-modes", default="", help="comma-separated modes sent per utterance")
+    args = parser.parse_args(argv)
+    args.tone_modes = tuple(m for m in args.tone_modes.split(",") if m)
+
+    address = _parse_address(args)
+    proc = None
+    if address is None:
+        proc, address = _spawn_server(args.tone_mode)
+    try:
+        print(f"server {address}, {args.utterances} utterances per connection")
+        print(f"{'conns':>5} {'sent':>9} {'received':>9} {'msgs/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for connections in (int(c) for c in args.connections.split(",")):
+            asyncio.run(_run(address, connections, args))
+    finally:
+        if proc is not None:
+            proc.send_signal(signal.SIGINT if os.name == "posix" else signal.SIGTERM)
+            out, _ = proc.communicate(timeout=30)
+            print(out, end="")
+
+
+if __name__ == "__main__":
+    main()
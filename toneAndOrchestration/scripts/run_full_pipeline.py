@@ -1,10 +1,12 @@
 # scripts/run_full_pipeline.py
 import time
 
+from cleaner_module.streaming_cleaner import StreamingCleaner
 from mocks.mock_asr import mock_asr_stream
-from mocks.mock_cleaner import mock_cleaner_stage
-from mocks.mock_grammar import mock_grammar_stage
+from mocks.mock_grammar import grammar_stream
+from orchestrator.latency_logger import LatencyLogger, LatencyMetrics
 from orchestrator.orchestrator import PipelineOrchestrator
+from orchestrator.pipeline import StreamPipeline
 from schemas.pipeline_message import PipelineMessage
 
 
@@ -18,7 +20,10 @@ def main():
         print("Invalid mode, defaulting to neutral.")
         tone_mode = "neutral"
 
-    orch = PipelineOrchestrator(tone_mode=tone_mode)
+    # one utterance: print its latency line as well as the histograms
+    LatencyLogger.verbose = True
+    metrics = LatencyMetrics()
+    orch = PipelineOrchestrator(tone_mode=tone_mode, metrics=metrics)
 
     # 1) ASR
     asr_msgs = mock_asr_stream(utt_id)
@@ -27,33 +32,30 @@ def main():
         if m.event == "END_ASR":
             m.end_of_speech_time = eos_time
 
-    print("\n[ASR OUTPUT]")
-    for m in asr_msgs:
-        if m.event == "PART":
-            print(f"ASR PART[{m.chunk_index}]: {m.text}")
-
-    # 2) Cleaner
-    clean_msgs = mock_cleaner_stage(asr_msgs)
-    print("\n[CLEANER OUTPUT]")
-    for m in clean_msgs:
-        if m.event == "PART":
-            print(f"CLEAN PART[{m.chunk_index}]: {m.text}")
+    # Stages are chained generators: each chunk is cleaned, corrected and
+    # tone-transformed as soon as ASR emits it
+    def show(label):
+        def tap(messages):
+            for m in messages:
+                if m.event == "PART":
+                    print(f"{label} PART[{m.chunk_index}]: {m.text}")
+                yield m
+        return tap
 
-    # 3) Grammar
-    grammar_msgs = mock_grammar_stage(clean_msgs)
-    print("\n[GRAMMAR OUTPUT]")
-    for m in grammar_msgs:
-        if m.event == "PART":
-            print(f"GRAMMAR PART[{m.chunk_index}]: {m.text}")
+    pipe = (
+        StreamPipeline()
+        .stage("asr", show("ASR"))
+        .stage("cleaner", StreamingCleaner().stream)
+        .stage("clean_tap", show("CLEAN"))
+        .stage("grammar", grammar_stream)
+        .stage("grammar_tap", show("GRAMMAR"))
+        .stage("tone", orch.stream)
+    )
 
-    # 4) Tone & Orchestrator
-    print("\n[TONE ORCHESTRATOR OUTPUT]")
+    print("\n[STREAMING PIPELINE OUTPUT]")
     final_msg: PipelineMessage | None = None
 
-    for gm in grammar_msgs:
-        out = orch.process_message(gm)
-        if out is None:
-            continue
+    for out in pipe.run(asr_msgs):
         if out.event == "PREVIEW_TONE":
             print(f"PREVIEW_TONE[{out.chunk_index}]: {out.text}")
         elif out.event == "END_TONE":
@@ -63,6 +65,11 @@ def main():
         print("\n--- FINAL TONE OUTPUT ---")
         print(final_msg.text)
         print("-------------------------")
+        print("\n[STAGE LATENCY]")
+        for stage, snap in metrics.snapshot().items():
+            print(f"{stage}: p50 {snap['p50_ms']:.3f} ms, max {snap['max_ms']:.3f} ms")
+        for stage, ms in pipe.first_output_ms.items():
+            print(f"{stage}: first output after {ms:.3f} ms")
     else:
         print("\nNo END_TONE produced; check pipeline wiring.")
 
@@ -0,0 +1,62 @@
+# scripts/run_server.py
+"""
+Serve PipelineOrchestrator over a socket until SIGINT / SIGTERM, then drain
+in-flight utterances and exit. Clients speak schemas.wire frames (see
+orchestrator.server.OrchestratorClient and scripts.load_client).
+
+Run from toneAndOrchestration/:
+    python -m scripts.run_server [--host 127.0.0.1] [--port 8765] [--tone-mode formal]
+    python -m scripts.run_server --unix /tmp/orchestrator.sock
+"""
+import argparse
+import asyncio
+import signal
+
+from orchestrator.latency_logger import LatencyMetrics
+from orchestrator.server import OrchestratorServer
+
+
+async def serve(args):
+    metrics = LatencyMetrics()
+    server = OrchestratorServer(
+        tone_mode=args.tone_mode,
+        metrics=metrics,
+        max_pending=args.max_pending,
+        drain_timeout=args.drain_timeout,
+    )
+    address = await server.start(host=args.host, port=args.port, path=args.unix)
+    print(f"listening on {address}", flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # e.g. Windows: Ctrl+C stops without draining
+    serving = asyncio.create_task(server.serve_forever())
+    await stop.wait()
+    print("draining...", flush=True)
+    await server.shutdown()
+    await serving
+
+    print(f"connections {server.connections}, messages in {server.messages_in}, "
+          f"out {server.messages_out}, rejected while draining {server.rejected}")
+    for stage, snap in metrics.snapshot().items():
+        if snap["count"]:
+            print(f"{stage}: n {snap['count']}, p50 {snap['p50_ms']:.3f} ms, p99 {snap['p99_ms']:.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--tone-mode", default="neutral")
+    parser.add_argument("--max-pending", type=int, default=1024, help="buffered input messages per connection")
+    parser.add_argument("--drain-timeout", type=float, default=10.0)
+    asyncio.run(serve(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# tone_module/assembly.py
+"""
+Incremental assembly of per-chunk tone results into the final utterance.
+
+A ToneAssembly is fed ChunkTones as PARTs arrive. For every rewrite step of
+the mode it keeps that step's input split into segments whose joins are
+clean (no multi-word rule crosses them, see rule_engine.SpanGuard). A
+segment is only re-run when a rule spans a join, so by END_GRAMMAR almost
+all the work is done and result() is a join plus the last chunk. The output
+is identical to running the transformer over " ".join(chunk texts).strip().
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tone_module.rule_engine import RewriteStep
+from tone_module.utils import normalize_whitespace
+
+Item = Tuple[str, Optional[List[str]]]
+
+
+def run_steps(steps: Sequence[RewriteStep], text: str, start: int = 0) -> List[str]:
+    """Apply steps[start:] to text; returns the text before/after each step."""
+    stages: List[str] = [""] * start + [text]
+    for step in steps[start:]:
+        text = step.sub(text)
+        stages.append(text)
+    return stages
+
+
+class ChunkTone:
+    """
+    Tone result for one chunk. Keeps the text before/after every rewrite
+    step so finalize can splice chunk results instead of re-transforming.
+    stages[0] is the raw chunk, stages[-1] the output of the last step;
+    text is the cleaned-up preview of the chunk on its own.
+    """
+
+    __slots__ = ("mode", "stages", "text")
+
+    def __init__(self, mode: str, stages: List[str], text: str):
+        self.mode = mode
+        self.stages = stages
+        self.text = text
+
+
+class _Segment:
+    __slots__ = ("start", "text", "out", "hint")
+
+    def __init__(self, start: int, text: str, out: str, hint: Optional[List[str]]):
+        self.start = start  # index of its first item
+        self.text = text    # input of the step
+        self.out = out      # output of the step
+        self.hint = hint    # chunk stages, while the segment is one untouched chunk
+
+
+class _Level:
+    """Items (upstream segment outputs) and clean segments for one step."""
+
+    __slots__ = ("step", "k", "items", "segs")
+
+    def __init__(self, step: RewriteStep, k: int):
+        self.step = step
+        self.k = k
+        self.items: List[Item] = []
+        self.segs: List[_Segment] = []
+
+    def _left_context(self, reach: int) -> str:
+        parts: List[str] = []
+        size = 0
+        for seg in reversed(self.segs):
+            parts.append(seg.text)
+            size += len(seg.text) + 1
+            if size > reach:
+                break
+        return " ".join(reversed(parts))
+
+    def _push(self, item: Item) -> int:
+        text, hint = item
+        segs = self.segs
+        start = len(self.items)
+        self.items.append(item)
+
+        need = 0
+        if segs:
+            guard = self.step.guard
+            need = guard.crossing(self._left_context(guard.reach), text)
+        if not need:
+            out = hint[self.k + 1] if hint is not None else self.step.sub(text)
+            segs.append(_Segment(start, text, out, hint))
+            return len(segs) - 1
+
+        # a rule spans the join: merge every segment it reaches
+        first = len(segs) - 1
+        covered = len(segs[first].text) + 1
+        while covered < need and first > 0:
+            first -= 1
+            covered += len(segs[first].text) + 1
+        merged = " ".join([seg.text for seg in segs[first:]] + [text])
+        start = segs[first].start
+        del segs[first:]
+        segs.append(_Segment(start, merged, self.step.sub(merged), None))
+        return first
+
+    def replace_tail(self, f: int, new: List[Item]) -> int:
+        """
+        Replace items[f:] with new and re-segment.
+        Returns the index of the first segment whose output may have changed.
+        """
+        segs = self.segs
+        end = len(self.items)
+        while segs and segs[-1].start >= f:
+            end = segs.pop().start
+        if segs and end > f:
+            # the last kept segment also covered replaced items: redo it
+            last = segs.pop()
+            new = self.items[last.start:f] + new
+            f = last.start
+        first = len(segs)
+        del self.items[f:]
+        for item in new:
+            first = min(first, self._push(item))
+        return first
+
+
+class ToneAssembly:
+    """
+    Accepts chunks in any order via add(); chunks extending the contiguous
+    prefix are folded in immediately. Blank chunks and the latest chunk are
+    held back so result() can mirror the outer strip of the joined text.
+    Revisions of folded chunks, or chunks left after a gap, make result()
+    rebuild from all chunks in order (still exact, just not incremental).
+    """
+
+    def __init__(self, steps: Tuple[RewriteStep, ...], mode: str, rules: object = None):
+        self.steps = steps
+        self.mode = mode
+        # the rule snapshot steps came from; chunk tones should be built with it
+        self.rules = rules
+        self.tones: Dict[int, ChunkTone] = {}
+        self._next_index = 0
+        self._held: List[ChunkTone] = []  # latest non-blank chunk + trailing blanks
+        self._started = False             # a non-blank chunk has been accepted
+        self._closed = False              # result() folded the held chunk
+        self._dirty = False
+        # steps with an unknown phrase table cannot be spliced
+        self._guarded = all(step.guard is not None for step in steps)
+        self._levels = [_Level(step, k) for k, step in enumerate(steps)]
+        # whitespace-normalized output of each last-level segment
+        self._final: List[str] = []
+
+    def _own(self, tone: ChunkTone) -> ChunkTone:
+        if tone.mode == self.mode:
+            return tone
+        stages = run_steps(self.steps, tone.stages[0])
+        return ChunkTone(self.mode, stages, normalize_whitespace(stages[-1]))
+
+    # -----------------------------------------
+    # Feeding chunks
+    # -----------------------------------------
+    def add(self, index: int, tone: ChunkTone):
+        if self._closed or (index in self.tones and index < self._next_index):
+            self._dirty = True
+        self.tones[index] = tone
+        if self._dirty or not self._guarded or not self._levels:
+            return
+        while self._next_index in self.tones:
+            self._accept(self._own(self.tones[self._next_index]))
+            self._next_index += 1
+
+    def _accept(self, tone: ChunkTone):
+        raw = tone.stages[0]
+        if not raw.strip():
+            if self._started:
+                self._held.append(tone)
+            return  # leading blanks vanish under the outer strip
+        if not self._started:
+            self._started = True
+            stripped = raw.lstrip()
+            if stripped != raw:
+                tone = ChunkTone(self.mode, run_steps(self.steps, stripped), tone.text)
+        for held in self._held:
+            self._fold(held.stages)
+        self._held = [tone]
+
+    def _fold(self, stages: List[str]):
+        first = len(self._levels[0].items)
+        new: List[Item] = [(stages[0], stages)]
+        for level in self._levels:
+            first = level.replace_tail(first, new)
+            new = [(seg.out, seg.hint) for seg in level.segs[first:]]
+        # normalizing pieces then joining non-empty ones == normalizing the join
+        del self._final[first:]
+        self._final.extend(normalize_whitespace(text) for text, _ in new)
+
+    # -----------------------------------------
+    # Final text
+    # -----------------------------------------
+    def _rebuild(self) -> str:
+        ordered = [self.tones[i] for i in sorted(self.tones.keys())]
+        if not self._guarded:
+            joined = " ".join(t.stages[0] for t in ordered).strip()
+            return normalize_whitespace(run_steps(self.steps, joined)[-1])
+        fresh = ToneAssembly(self.steps, self.mode, self.rules)
+        for i, tone in enumerate(ordered):
+            fresh.add(i, tone)
+        return fresh.result()
+
+    def result(self) -> str:
+        """
+        Final tone-transformed text of all chunks added so far.
+        Folds the held-back chunk, so later add() calls force a rebuild.
+        """
+        if not self._levels:
+            ordered = [self.tones[i].stages[0] for i in sorted(self.tones.keys())]
+            return normalize_whitespace(" ".join(ordered))
+        if self._dirty or not self._guarded or len(self.tones) != self._next_index:
+            return self._rebuild()
+        if not self._closed:
+            self._closed = True
+            if self._held:
+                raw = self._held[0].stages[0]
+                stripped = raw.rstrip()
+                stages = self._held[0].stages if stripped == raw else run_steps(self.steps, stripped)
+                self._fold(stages)
+                self._held = []
+        return " ".join(filter(None, self._final))
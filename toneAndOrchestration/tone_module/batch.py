@@ -0,0 +1,55 @@
+# tone_module/batch.py
+"""
+Process-pool batch tone transformation for offline reprocessing jobs.
+Each worker builds one ToneTransformer; texts are shipped in chunks and a
+bounded window of chunks is in flight, so input and output are streamed
+and memory stays flat regardless of batch size.
+"""
+import multiprocessing as mp
+import os
+from collections import deque
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Optional
+
+from tone_module.rule_engine import ToneRuleSet
+from tone_module.transformer import ToneTransformer
+
+_worker_transformer: Optional[ToneTransformer] = None
+
+
+def _init_worker(mode: str, rules: Optional[ToneRuleSet]):
+    global _worker_transformer
+    _worker_transformer = ToneTransformer(mode=mode, rules=rules)
+
+
+def _transform_chunk(texts: List[str]) -> List[str]:
+    return list(_worker_transformer.iter_transform_many(texts))
+
+
+def transform_many_parallel(
+    texts: Iterable[str],
+    mode: str,
+    workers: Optional[int] = None,
+    chunksize: int = 512,
+    window: Optional[int] = None,
+    rules: Optional[ToneRuleSet] = None,
+) -> Iterator[str]:
+    """
+    Yield tone-transformed texts in input order, computed by a process pool.
+    At most `window` chunks (default 2 per worker) are in flight at a time.
+    rules (default: the built-in tables) is shipped to every worker once.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 2
+    it = iter(texts)
+    with mp.get_context().Pool(workers, initializer=_init_worker, initargs=(mode, rules)) as pool:
+        in_flight: Deque = deque()
+        while True:
+            while len(in_flight) < window:
+                chunk = list(islice(it, chunksize))
+                if not chunk:
+                    break
+                in_flight.append(pool.apply_async(_transform_chunk, (chunk,)))
+            if not in_flight:
+                return
+            yield from in_flight.popleft().get()
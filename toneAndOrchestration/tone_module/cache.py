@@ -0,0 +1,70 @@
+# tone_module/cache.py
+"""
+Bounded LRU cache for tone transforms of repeated chunks.
+
+Voice traffic repeats the same short chunks ("Thank you.", "Yes.") all the
+time. ToneTransformer looks chunks up here by (rules version, mode, text)
+before running its rewrite steps. Replacing the transformer's rules bumps
+the version, so stale entries are never hit and simply age out.
+One cache may be shared by several transformers and threads.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TransformCache:
+    """
+    max_size: entries kept; the least recently used is evicted first.
+    max_text_len: longer texts (e.g. whole utterances) are not cached,
+                  they rarely repeat and would push out useful chunks.
+    """
+
+    def __init__(self, max_size: int = 4096, max_text_len: int = 256):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.max_size = max_size
+        self.max_text_len = max_text_len
+        self._data: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Optional[object] = None) -> Optional[object]:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: object):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
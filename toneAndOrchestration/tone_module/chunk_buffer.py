@@ -0,0 +1,117 @@
+# tone_module/chunk_buffer.py
+"""
+Chunks of one utterance kept in index order as they arrive.
+
+Chunks extending the contiguous prefix (start, start+1, ...) are appended
+to a list; chunks after a gap wait in a small dict and are moved over once
+the gap fills. The joined prefix is cached and only extended with new
+chunks, so a running transcript costs O(new text) per call instead of a
+sort and join of every chunk.
+"""
+from typing import Dict, Iterator, List, Mapping
+
+
+class ChunkBuffer(Mapping[int, str]):
+    """
+    Mapping chunk_index -> text, iterated in index order.
+    add() accepts out-of-order and repeated (revised) indices.
+    """
+
+    def __init__(self, start: int = 0):
+        self.start = start
+        self._stable: List[str] = []        # chunks start .. start + len - 1
+        self._pending: Dict[int, str] = {}  # chunks outside the contiguous prefix
+        # cache of " ".join(self._stable[:len(self._ends)])
+        self._joined = ""
+        self._ends: List[int] = []          # _ends[k]: end offset of chunk k in _joined
+
+    # -----------------------------------------
+    # Adding chunks
+    # -----------------------------------------
+    def add(self, index: int, text: str) -> int:
+        """
+        Store (or revise) a chunk. Returns how many chunks joined the
+        contiguous prefix because of it (0 for revisions and gapped chunks).
+        """
+        stable = self._stable
+        pos = index - self.start
+        if pos == len(stable):
+            stable.append(text)
+            pending = self._pending
+            if not pending:
+                return 1
+            added = 1
+            nxt = index + 1
+            while nxt in pending:
+                stable.append(pending.pop(nxt))
+                nxt += 1
+                added += 1
+            return added
+        if 0 <= pos < len(stable):
+            if stable[pos] != text:
+                stable[pos] = text
+                self._truncate_joined(pos)
+            return 0
+        self._pending[index] = text
+        return 0
+
+    def _truncate_joined(self, count: int):
+        if count < len(self._ends):
+            # chunk count-1 ends where chunk count's separator starts
+            self._joined = self._joined[: self._ends[count - 1]] if count else ""
+            del self._ends[count:]
+
+    # -----------------------------------------
+    # Assembled text
+    # -----------------------------------------
+    @property
+    def next_index(self) -> int:
+        """First index missing from the contiguous prefix."""
+        return self.start + len(self._stable)
+
+    def prefix_text(self) -> str:
+        """" ".join of the contiguous prefix, extended incrementally."""
+        done = len(self._ends)
+        new = self._stable[done:]
+        if new:
+            tail = " ".join(new)
+            joined = self._joined + " " + tail if done else tail
+            end = len(self._joined)
+            for k, part in enumerate(new):
+                end += len(part) + (1 if done or k else 0)
+                self._ends.append(end)
+            self._joined = joined
+        return self._joined
+
+    def joined(self) -> str:
+        """" ".join of every chunk in index order (gaps simply skipped)."""
+        if not self._pending:
+            return self.prefix_text()
+        pending = self._pending
+        before = [pending[i] for i in sorted(i for i in pending if i < self.start)]
+        after = [pending[i] for i in sorted(i for i in pending if i >= self.start)]
+        middle = [self.prefix_text()] if self._stable else []
+        return " ".join(before + middle + after)
+
+    # -----------------------------------------
+    # Mapping API
+    # -----------------------------------------
+    def __getitem__(self, index: int) -> str:
+        pos = index - self.start
+        if 0 <= pos < len(self._stable):
+            return self._stable[pos]
+        return self._pending[index]
+
+    def __iter__(self) -> Iterator[int]:
+        pending = sorted(self._pending)
+        yield from (i for i in pending if i < self.start)
+        yield from range(self.start, self.next_index)
+        yield from (i for i in pending if i >= self.start)
+
+    def __len__(self) -> int:
+        return len(self._stable) + len(self._pending)
+
+    def __contains__(self, index) -> bool:
+        if not isinstance(index, int):
+            return False
+        return 0 <= index - self.start < len(self._stable) or index in self._pending
@@ -0,0 +1,316 @@
+# tone_module/rule_engine.py
+"""
+Compiled rule engine for the tone transformer.
+
+Each rule table (phrase -> replacement) is compiled ONCE into a single regex
+built from a character trie of its keys, so a mode runs in one left-to-right
+pass instead of one re.sub per rule. The trie pattern gives the same
+longest-match-first behaviour as sorting an alternation by key length
+(see utils.apply_mapping), but stays fast with thousands of entries.
+
+Every rewrite step also carries a SpanGuard telling whether a chunk join is
+"clean" for it, i.e. whether step(left + " " + right) == step(left) + " " +
+step(right). Only keys containing a space can match across a join, so the
+check is a tiny scan of the characters around it (see tone_module.assembly).
+
+to_data() / from_data() give every compiled object a plain form (tables and
+regex sources, JSON-safe), so a rule set can be stored and rebuilt with
+re.compile alone, skipping the trie build (see tone_module.rule_packs).
+"""
+import functools
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Protocol
+
+from tone_module.tone_rules import (
+    CONTRACTIONS,
+    FORMAL_EXPANSIONS,
+    CASUAL_SIMPLIFICATIONS,
+    HEDGES,
+    INTENSIFIERS,
+)
+
+
+class RewriteStep(Protocol):
+    """
+    One text -> text rewrite in a tone mode's pipeline. guard is None when
+    the step's phrase table is unknown and joins cannot be checked.
+    """
+
+    guard: Optional["SpanGuard"]
+
+    def sub(self, text: str) -> str: ...
+
+
+def _trie_pattern(keys: Iterable[str]) -> str:
+    """
+    Build a regex source string matching any of the (lowercased) keys.
+    Shared prefixes are factored out; optional tails are greedy, so the
+    longest key wins at any start position.
+    """
+    root: Dict[str, dict] = {}
+    for key in keys:
+        node = root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # terminal marker
+
+    def emit(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1:
+            body = branches[0]
+            return f"(?:{body})?" if terminal else body
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if terminal else body
+
+    return emit(root)
+
+
+class SpanGuard:
+    """
+    Detects whether any key containing a space occurs across the joining
+    space of left + " " + right. Word boundaries are ignored, so the check
+    is conservative: a clean join is guaranteed clean for the rewriter.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        spanning = {k.lower() for k in keys if " " in k}
+        # a key covering the joiner has at most max_len - 1 chars on each side
+        self.reach = max((len(k) for k in spanning), default=1) - 1
+        self._pattern: Optional[re.Pattern] = None
+        if spanning:
+            self._pattern = re.compile("(?=(" + _trie_pattern(spanning) + "))", flags=re.IGNORECASE)
+
+    def crossing(self, left: str, right: str) -> int:
+        """
+        0 if no key occurs across the space joining left and right. Otherwise
+        the number of trailing characters of left + " " covered by the
+        earliest such occurrence (always >= 1). Pass the full text before the
+        join as left: an occurrence may start before the previous chunk.
+        """
+        if self._pattern is None:
+            return 0
+        head = left[max(0, len(left) - self.reach):]
+        window = head + " " + right[: self.reach]
+        joiner = len(head)
+        for m in self._pattern.finditer(window):
+            if m.start() > joiner:
+                break
+            if m.end(1) > joiner:
+                return joiner - m.start() + 1
+        return 0
+
+    def joins_cleanly(self, left: str, right: str) -> bool:
+        return self.crossing(left, right) == 0
+
+    def to_data(self) -> Dict[str, Any]:
+        return {"reach": self.reach, "pattern": None if self._pattern is None else self._pattern.pattern}
+
+    @classmethod
+    def from_data(cls, data: Mapping[str, Any]) -> "SpanGuard":
+        guard = cls.__new__(cls)
+        guard.reach = data["reach"]
+        source = data["pattern"]
+        guard._pattern = None if source is None else re.compile(source, flags=re.IGNORECASE)
+        return guard
+
+
+class PhraseMatcher:
+    """
+    Single-pass phrase rewriter compiled from a mapping.
+    Matching is case-insensitive and bounded by non-word characters
+    (or by whitespace only, with whole_tokens=True).
+    Replacements are inserted verbatim; lookup tries the exact matched text
+    first, then its lowercase form (first table entry wins).
+    """
+
+    def __init__(self, mapping: Mapping[str, str], whole_tokens: bool = False):
+        self._set_mapping(mapping)
+        self.guard = SpanGuard(self._lower)
+        self._pattern: Optional[re.Pattern] = None
+        if self._lower:
+            left, right = (r"(?<!\S)", r"(?!\S)") if whole_tokens else (r"(?<!\w)", r"(?!\w)")
+            source = left + "(?:" + _trie_pattern(self._lower) + ")" + right
+            self._pattern = re.compile(source, flags=re.IGNORECASE)
+
+    def _set_mapping(self, mapping: Mapping[str, str]):
+        self.mapping: Dict[str, str] = dict(mapping)
+        self._lower: Dict[str, str] = {}
+        for k, v in self.mapping.items():
+            self._lower.setdefault(k.lower(), v)
+        self.max_len = max((len(k) for k in self._lower), default=0)
+
+    def to_data(self) -> Dict[str, Any]:
+        return {
+            "mapping": self.mapping,
+            "pattern": None if self._pattern is None else self._pattern.pattern,
+            "guard": self.guard.to_data(),
+        }
+
+    @classmethod
+    def from_data(cls, data: Mapping[str, Any]) -> "PhraseMatcher":
+        """Inverse of to_data(): recompiles the stored sources, no trie build."""
+        matcher = cls.__new__(cls)
+        matcher._set_mapping(data["mapping"])
+        matcher.guard = SpanGuard.from_data(data["guard"])
+        source = data["pattern"]
+        matcher._pattern = None if source is None else re.compile(source, flags=re.IGNORECASE)
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self._lower)
+
+    def _replace(self, m: "re.Match[str]") -> str:
+        k = m.group(0)
+        mapped = self.mapping.get(k)
+        if mapped is None:
+            mapped = self._lower[k.lower()]
+        return mapped
+
+    def sub(self, text: str) -> str:
+        if self._pattern is None or not text:
+            return text
+        return self._pattern.sub(self._replace, text)
+
+
+class ContractionExpander(PhraseMatcher):
+    """
+    Compiled contraction expander: one trie regex over a contraction table
+    (default tone_rules.CONTRACTIONS). Keys spelled with ' also match the
+    typographic ’. Case is kept like utils.apply_mapping does: a match
+    starting with a capital gets a capitalized expansion, anything else
+    the table value as written.
+
+    fallback=True additionally runs contractions.fix (optional dependency,
+    imported here) on text that still contains an apostrophe afterwards,
+    for contractions the table lacks. Its slang table is left out.
+    """
+
+    def __init__(self, mapping: Mapping[str, str] = CONTRACTIONS, fallback: bool = False):
+        table = dict(mapping)
+        for k, v in mapping.items():
+            table.setdefault(k.replace("'", "\u2019"), v)
+        super().__init__(table)
+        self._fallback: Optional[Callable[[str], str]] = None
+        if fallback:
+            contractions = self._use_library()
+            self.guard = SpanGuard([*self._lower, *contractions.contractions_dict, *contractions.leftovers_dict])
+
+    def _use_library(self):
+        try:
+            import contractions
+        except ImportError as exc:
+            raise ImportError("the contractions fallback needs the contractions package "
+                              "(pip install contractions)") from exc
+        self._fallback = functools.partial(contractions.fix, slang=False)
+        return contractions
+
+    def to_data(self) -> Dict[str, Any]:
+        return {**super().to_data(), "fallback": self._fallback is not None}
+
+    @classmethod
+    def from_data(cls, data: Mapping[str, Any]) -> "ContractionExpander":
+        expander = super().from_data(data)
+        expander._fallback = None
+        if data["fallback"]:
+            expander._use_library()
+        return expander
+
+    def _replace(self, m: "re.Match[str]") -> str:
+        k = m.group(0)
+        mapped = self._lower[k.lower()]
+        if k[0].isupper():
+            return mapped[0].upper() + mapped[1:]
+        return mapped
+
+    def sub(self, text: str) -> str:
+        text = super().sub(text)
+        if self._fallback is not None and ("'" in text or "\u2019" in text):
+            text = self._fallback(text)
+        return text
+
+
+class FunctionRewrite:
+    """
+    Adapts an opaque rewriter (e.g. contractions.fix) to the step interface.
+    keys is the rewriter's phrase table; pass None if it is unknown, in
+    which case chunk joins cannot be checked (guard is None).
+    """
+
+    def __init__(self, fn: Callable[[str], str], keys: Optional[Iterable[str]]):
+        self.fn = fn
+        self.guard: Optional[SpanGuard] = SpanGuard(keys) if keys is not None else None
+
+    def sub(self, text: str) -> str:
+        return self.fn(text)
+
+
+class ToneRuleSet:
+    """
+    Compiled, read-only view of the tone_rules tables.
+    Built once and shared by every transformer that uses it.
+    """
+
+    def __init__(
+        self,
+        formal_expansions: Mapping[str, str],
+        casual_simplifications: Mapping[str, str],
+        hedges: Iterable[str],
+        intensifiers: Iterable[str],
+        contractions: Mapping[str, str] = CONTRACTIONS,
+        contractions_fallback: bool = False,
+    ):
+        self.contractions = ContractionExpander(contractions, fallback=contractions_fallback)
+        self.formal = PhraseMatcher(formal_expansions)
+        self.casual = PhraseMatcher(casual_simplifications)
+        self.hedges = PhraseMatcher(dict.fromkeys(hedges, ""))
+        # removed as whole whitespace-delimited tokens, leaving the spacing
+        # for the final cleanup so the step stays join-safe
+        self.intensifiers = PhraseMatcher(dict.fromkeys(intensifiers, ""), whole_tokens=True)
+
+    @classmethod
+    def from_tables(cls, contractions_fallback: bool = False) -> "ToneRuleSet":
+        """
+        Compile the default tables from tone_module.tone_rules.
+        contractions_fallback: see ContractionExpander.
+        """
+        return cls(
+            formal_expansions=FORMAL_EXPANSIONS,
+            casual_simplifications=CASUAL_SIMPLIFICATIONS,
+            hedges=HEDGES,
+            intensifiers=INTENSIFIERS,
+            contractions=CONTRACTIONS,
+            contractions_fallback=contractions_fallback,
+        )
+
+    _STEPS = ("contractions", "formal", "casual", "hedges", "intensifiers")
+
+    def to_data(self) -> Dict[str, Any]:
+        """Plain (JSON-safe) form of every compiled table."""
+        return {name: getattr(self, name).to_data() for name in self._STEPS}
+
+    @classmethod
+    def from_data(cls, data: Mapping[str, Any]) -> "ToneRuleSet":
+        """Inverse of to_data(); raises KeyError / TypeError / re.error on malformed data."""
+        rules = cls.__new__(cls)
+        rules.contractions = ContractionExpander.from_data(data["contractions"])
+        for name in cls._STEPS[1:]:
+            setattr(rules, name, PhraseMatcher.from_data(data[name]))
+        return rules
+
+    @classmethod
+    def shared(cls) -> "ToneRuleSet":
+        """The default tables, compiled on first use and reused process-wide."""
+        global _SHARED
+        if _SHARED is None:
+            with _SHARED_LOCK:
+                if _SHARED is None:
+                    _SHARED = cls.from_tables()
+        return _SHARED
+
+
+_SHARED: Optional[ToneRuleSet] = None
+_SHARED_LOCK = threading.Lock()
@@ -0,0 +1,239 @@
+# tone_module/rule_packs.py
+"""
+Rule packs: tone rule tables loaded from JSON or YAML files instead of
+tone_rules.py, so phrases can change without a redeploy.
+
+A pack is a mapping with any of these sections (missing ones keep the
+built-in tables from tone_module.tone_rules):
+    contractions:           {contraction: expansion}
+    formal_expansions:      {phrase: replacement}
+    casual_simplifications: {phrase: replacement}
+    hedges:                 [phrase, ...]
+    intensifiers:           [word, ...]
+
+Compiling a large pack (trie patterns, then the regex compiler) costs about
+a second per 10k phrases, so compiled packs are cached on disk, keyed by the
+pack's bytes. A cache file is plain JSON (ToneRuleSet.to_data(): the tables
+and each regex's source), so loading one runs no code and depends on no
+interpreter internals; a warm load skips the trie build and only runs
+re.compile. A cache file that fails to load is deleted and rebuilt.
+
+RulePackReloader watches a pack and swaps freshly compiled rules into
+transformers (see ToneTransformer.rules and CompiledRules).
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from tone_module.rule_engine import ToneRuleSet
+from tone_module.tone_rules import CASUAL_SIMPLIFICATIONS, CONTRACTIONS, FORMAL_EXPANSIONS, HEDGES, INTENSIFIERS
+
+MAPPING_SECTIONS = ("contractions", "formal_expansions", "casual_simplifications")
+LIST_SECTIONS = ("hedges", "intensifiers")
+
+# Bump when the to_data() form of ToneRuleSet / PhraseMatcher changes
+CACHE_FORMAT = 3
+_CACHE_TAG = repr(CACHE_FORMAT).encode()
+
+# cache_dir default: __rulecache__/ next to the pack
+DEFAULT_CACHE_DIR = "__rulecache__"
+
+
+# -----------------------------------------
+# Parsing
+# -----------------------------------------
+def parse_pack(data: bytes, path: str) -> Dict[str, object]:
+    """Decode and validate a pack; the format is taken from path's extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        pack = json.loads(data.decode("utf-8"))
+    elif ext in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise ImportError("PyYAML is required for YAML rule packs (pip install pyyaml)") from exc
+        pack = yaml.safe_load(data.decode("utf-8")) or {}
+    else:
+        raise ValueError(f"unknown rule pack format {ext!r}; expected .json, .yaml or .yml")
+
+    if not isinstance(pack, dict):
+        raise ValueError(f"{path}: a rule pack must be a mapping of sections")
+    unknown = set(pack) - set(MAPPING_SECTIONS) - set(LIST_SECTIONS)
+    if unknown:
+        raise ValueError(f"{path}: unknown sections {sorted(unknown)}")
+    for name in MAPPING_SECTIONS:
+        table = pack.get(name, {})
+        if not isinstance(table, dict) or not all(
+            isinstance(k, str) and isinstance(v, str) for k, v in table.items()
+        ):
+            raise ValueError(f"{path}: {name} must map phrases to replacement strings")
+    for name in LIST_SECTIONS:
+        items = pack.get(name, [])
+        if not isinstance(items, list) or not all(isinstance(x, str) for x in items):
+            raise ValueError(f"{path}: {name} must be a list of strings")
+    return pack
+
+
+def rule_set_from_pack(pack: Mapping[str, object]) -> ToneRuleSet:
+    return ToneRuleSet(
+        formal_expansions=pack.get("formal_expansions", FORMAL_EXPANSIONS),
+        casual_simplifications=pack.get("casual_simplifications", CASUAL_SIMPLIFICATIONS),
+        hedges=pack.get("hedges", HEDGES),
+        intensifiers=pack.get("intensifiers", INTENSIFIERS),
+        contractions=pack.get("contractions", CONTRACTIONS),
+    )
+
+
+# -----------------------------------------
+# Disk cache (plain JSON: tables and regex sources)
+# -----------------------------------------
+def _cache_path(cache_dir: str, data: bytes) -> str:
+    digest = hashlib.sha256(_CACHE_TAG + data).hexdigest()
+    return os.path.join(cache_dir, digest[:32] + ".rules.json")
+
+
+def _read_cache(path: str) -> Optional[ToneRuleSet]:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    try:
+        return ToneRuleSet.from_data(json.loads(data.decode("utf-8")))
+    except Exception:  # truncated, corrupt or from another format: rebuild
+        pass
+    # drop it, so it is rewritten instead of failing on every load
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+    return None
+
+
+def _write_cache(path: str, rules: ToneRuleSet):
+    # write-then-rename, so readers never see a partial file
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    except OSError:
+        return  # read-only location: run uncached
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(rules.to_data(), separators=(",", ":")).encode("utf-8"))
+        os.replace(tmp, path)
+    except OSError:
+        os.unlink(tmp)
+
+
+def load_rule_pack(path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> ToneRuleSet:
+    """
+    Compiled rules of the pack at path. cache_dir: directory for compiled
+    packs (relative paths are taken next to the pack); None disables it.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    cached = None
+    if cache_dir is not None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), cache_dir)
+        cached = _cache_path(cache_dir, data)
+        rules = _read_cache(cached)
+        if rules is not None:
+            return rules
+    rules = rule_set_from_pack(parse_pack(data, path))
+    if cached is not None:
+        _write_cache(cached, rules)
+    return rules
+
+
+# -----------------------------------------
+# Hot reload
+# -----------------------------------------
+class RulePackReloader:
+    """
+    Publishes the rules of a pack file to targets (objects with a rules
+    attribute, e.g. ToneTransformer) and again whenever the file changes.
+
+    A new pack is compiled before anything is swapped, and each target
+    swaps it in with one assignment. Messages being transformed meanwhile
+    finish on the old rules. Utterances already assembling keep their
+    rules until END_GRAMMAR, so no utterance mixes two rule versions.
+    A pack that fails to load leaves the current rules in place and is
+    reported in last_error.
+
+        reloader = RulePackReloader("rules/support.yaml", [orch.tone_transformer])
+        reloader.reload()           # initial load; raises on a bad pack
+        reloader.start(interval=2)  # background polling; or call check()
+    """
+
+    def __init__(self, path: str, targets: Iterable[object] = (), cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.path = path
+        self.targets: List[object] = list(targets)
+        self.cache_dir = cache_dir
+        self.rules: Optional[ToneRuleSet] = None
+        self.version = 0  # number of packs published
+        self.last_error: Optional[Exception] = None
+        self._stamp = None
+        self._lock = threading.Lock()  # one reload at a time
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _publish(self, rules: ToneRuleSet):
+        self.rules = rules
+        self.version += 1
+        for target in self.targets:
+            target.rules = rules
+
+    def reload(self) -> ToneRuleSet:
+        """Load and publish the pack now; errors propagate."""
+        with self._lock:
+            stamp = self._stat()
+            rules = load_rule_pack(self.path, self.cache_dir)
+            self._stamp = stamp
+            self.last_error = None
+            self._publish(rules)
+            return rules
+
+    def check(self) -> bool:
+        """Reload if the file changed since the last attempt; True if new rules went out."""
+        with self._lock:
+            try:
+                stamp = self._stat()
+                if stamp == self._stamp:
+                    return False
+                self._stamp = stamp  # a broken pack is not retried until it changes again
+                rules = load_rule_pack(self.path, self.cache_dir)
+            except Exception as exc:
+                self.last_error = exc
+                return False
+            self.last_error = None
+            self._publish(rules)
+            return True
+
+    # -----------------------------------------
+    # Background polling
+    # -----------------------------------------
+    def start(self, interval: float = 1.0) -> "RulePackReloader":
+        if self._thread is not None:
+            raise RuntimeError("reloader already started")
+        self._stop.clear()
+
+        def poll():
+            while not self._stop.wait(interval):
+                self.check()
+
+        self._thread = threading.Thread(target=poll, name="rule-pack-reloader", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
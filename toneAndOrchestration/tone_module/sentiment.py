@@ -2,27 +2,129 @@
 """
 Lightweight sentiment wrapper. Uses vaderSentiment or textblob if available.
 If not installed, falls back to a very small heuristic scorer.
+
+Backends are imported on first use (or by warmup()), not at module load,
+and results are memoized in a bounded cache.
 """
-from typing import Tuple
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from tone_module.cache import TransformCache
+
+BACKENDS = ("vader", "textblob", "heuristic")
+
+_POSITIVE = frozenset(["good", "great", "excellent", "awesome", "love", "happy", "thanks"])
+_NEGATIVE = frozenset(["bad", "terrible", "hate", "problem", "sad", "angry"])
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Imported backends, filled in by _load_backends(): name -> class / None
+_LOADED: dict = {}
+
 
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    _HAS_VADER = True
-except Exception:
-    _HAS_VADER = False
+def _load_backends() -> dict:
+    if not _LOADED:
+        try:
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        except Exception:
+            SentimentIntensityAnalyzer = None
+        try:
+            from textblob import TextBlob
+        except Exception:
+            TextBlob = None
+        _LOADED.update(vader=SentimentIntensityAnalyzer, textblob=TextBlob)
+    return _LOADED
+
+
+def heuristic_polarity(text: str) -> float:
+    """Keyword scorer: +0.2 per positive word, -0.2 per negative word, +0.05 per '!'."""
+    low = text.lower()
+    words = set(_WORD_RE.findall(low))
+    score = 0.2 * len(words & _POSITIVE) - 0.2 * len(words & _NEGATIVE)
+    score += low.count("!") * 0.05
+    # clamp
+    return max(-1.0, min(1.0, score))
 
-try:
-    from textblob import TextBlob
-    _HAS_TEXTBLOB = True
-except Exception:
-    _HAS_TEXTBLOB = False
 
 class SentimentAnalyzer:
-    def __init__(self):
-        if _HAS_VADER:
-            self._vader = SentimentIntensityAnalyzer()
+    """
+    backend: "vader", "textblob" or "heuristic"; by default the first one
+             installed, in that order. Loaded lazily, or up front by warmup().
+    cache_size: memoized texts (0 disables the cache).
+    """
+
+    def __init__(self, backend: Optional[str] = None, cache_size: int = 1024):
+        if backend is not None and backend not in BACKENDS:
+            raise ValueError(f"unknown sentiment backend {backend!r}; expected one of {BACKENDS}")
+        self._requested = backend
+        self._backend: Optional[str] = None
+        self._vader = None
+        self._textblob = None
+        self.cache = TransformCache(max_size=cache_size) if cache_size > 0 else None
+
+    # -----------------------------------------
+    # Backend loading
+    # -----------------------------------------
+    @property
+    def backend(self) -> str:
+        if self._backend is None:
+            self._load()
+        return self._backend
+
+    def _load(self):
+        loaded = _load_backends()
+        self._textblob = loaded["textblob"]
+        wanted = self._requested
+        if wanted in (None, "vader") and loaded["vader"] is not None:
+            self._vader = loaded["vader"]()
+            self._backend = "vader"
+        elif wanted in (None, "textblob") and self._textblob is not None:
+            self._backend = "textblob"
+        elif wanted in (None, "heuristic"):
+            self._backend = "heuristic"
         else:
-            self._vader = None
+            raise ImportError(f"sentiment backend {wanted!r} is not installed")
+        if wanted == "heuristic":
+            self._textblob = None
+
+    def warmup(self) -> "SentimentAnalyzer":
+        """Import the backend and load its lexicons now instead of on the first call."""
+        self.backend
+        self._score("warm up")
+        return self
+
+    # -----------------------------------------
+    # Scoring
+    # -----------------------------------------
+    def _score(self, text: str) -> Tuple[float, float]:
+        backend = self.backend
+        if backend == "vader":
+            polarity = self._vader.polarity_scores(text)["compound"]
+            subjectivity = self._textblob(text).sentiment.subjectivity if self._textblob else 0.5
+            return polarity, subjectivity
+        if backend == "textblob":
+            sentiment = self._textblob(text).sentiment
+            return sentiment.polarity, sentiment.subjectivity
+        # fallback: heuristic
+        return heuristic_polarity(text), 0.5
+
+    def _polarity(self, text: str) -> float:
+        backend = self.backend
+        if backend == "vader":
+            return self._vader.polarity_scores(text)["compound"]
+        if backend == "textblob":
+            return self._textblob(text).sentiment.polarity
+        return heuristic_polarity(text)
+
+    def _cached(self, kind: str, text: str, compute):
+        cache = self.cache
+        if cache is None or len(text) > cache.max_text_len:
+            return compute(text)
+        key = (kind, text)
+        value = cache.get(key)
+        if value is None:
+            value = compute(text)
+            cache.put(key, value)
+        return value
 
     def polarity(self, text: str) -> float:
         """
@@ -30,30 +132,31 @@ class SentimentAnalyzer:
         """
         if not text:
             return 0.0
-        if self._vader:
-            scores = self._vader.polarity_scores(text)
-            return scores["compound"]
-        if _HAS_TEXTBLOB:
-            tb = TextBlob(text)
-            return tb.sentiment.polarity
-        # Fallback heuristic: count exclamation and presence of positive/negative keywords
-        low = text.lower()
-        score = 0.0
-        positives = ["good", "great", "excellent", "awesome", "love", "happy", "thanks"]
-        negatives = ["bad", "terrible", "hate", "problem", "sad", "angry"]
-        for p in positives:
-            if p in low:
-                score += 0.2
-        for n in negatives:
-            if n in low:
-                score -= 0.2
-        score += low.count("!") * 0.05
-        # clamp
-        return max(-1.0, min(1.0, score))
+        return self._cached("polarity", text, self._polarity)
 
     def subjectivity(self, text: str) -> float:
-        if _HAS_TEXTBLOB:
-            tb = TextBlob(text)
-            return tb.sentiment.subjectivity
-        # fallback: heuristic
-        return 0.5
+        return self.scores(text)[1]
+
+    def scores(self, text: str) -> Tuple[float, float]:
+        """(polarity, subjectivity) from one backend pass."""
+        return self._cached("scores", text, self._score)
+
+    # -----------------------------------------
+    # Batch API (repeated texts are scored once)
+    # -----------------------------------------
+    @staticmethod
+    def _many(texts: Iterable[str], score) -> list:
+        seen = {}
+        out = []
+        for text in texts:
+            value = seen.get(text)
+            if value is None:
+                value = seen[text] = score(text)
+            out.append(value)
+        return out
+
+    def polarity_many(self, texts: Iterable[str]) -> List[float]:
+        return self._many(texts, self.polarity)
+
+    def scores_many(self, texts: Iterable[str]) -> List[Tuple[float, float]]:
+        return self._many(texts, self.scores)
@@ -0,0 +1,164 @@
+# tone_module/state_store.py
+"""
+Bounded per-utterance state map.
+
+Utterances are normally dropped when END_GRAMMAR / finalize arrives; ones
+that never finish (dropped connections) would otherwise stay forever.
+UtteranceStore is a dict-like map that caps the number of live utterances
+(LRU eviction) and expires those idle for longer than ttl seconds.
+
+Entries are kept in last-access order, so both the oldest and the most
+idle entry sit at the front: eviction and expiry pop from the front and
+cost O(1) amortized, never a full scan.
+
+The store is safe to share between threads: every operation, including
+the eviction it triggers, runs under one lock.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Iterator, MutableMapping, Optional, TypeVar
+
+V = TypeVar("V")
+
+# reasons passed to on_evict
+EXPIRED = "expired"
+EVICTED = "evicted"
+
+_MISSING = object()
+
+
+class UtteranceStore(MutableMapping[str, V], Generic[V]):
+    """
+    max_size: live utterances kept; the least recently used is evicted first.
+    ttl: seconds an utterance may stay idle (not read or written) before it
+         expires. Expiry is checked whenever the store is used, or via expire().
+    on_evict: called as on_evict(key, value, reason) for every entry dropped
+         by the store itself (not for del / pop), with the store's lock held.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[str, V, str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be > 0")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.clock = clock
+        # key -> [value, last access time], in last-access order
+        self._data: "OrderedDict[str, list]" = OrderedDict()
+        self.evicted = 0
+        self.expired = 0
+        # reentrant: on_evict may use the store
+        self._lock = threading.RLock()
+
+    # -----------------------------------------
+    # Dropping entries
+    # -----------------------------------------
+    def _drop_oldest(self, reason: str):
+        key, (value, _) = self._data.popitem(last=False)
+        if reason == EXPIRED:
+            self.expired += 1
+        else:
+            self.evicted += 1
+        if self.on_evict is not None:
+            self.on_evict(key, value, reason)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop every entry idle for longer than ttl; returns how many."""
+        if self.ttl is None or not self._data:
+            return 0
+        with self._lock:
+            deadline = (self.clock() if now is None else now) - self.ttl
+            data = self._data
+            dropped = 0
+            while data and next(iter(data.values()))[1] <= deadline:
+                self._drop_oldest(EXPIRED)
+                dropped += 1
+            return dropped
+
+    def _shrink(self):
+        if self.max_size is not None:
+            while len(self._data) > self.max_size:
+                self._drop_oldest(EVICTED)
+
+    # -----------------------------------------
+    # Mapping API (reads and writes count as activity)
+    # -----------------------------------------
+    def __getitem__(self, key: str) -> V:
+        with self._lock:
+            self.expire()
+            entry = self._data[key]
+            entry[1] = self.clock()
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def __setitem__(self, key: str, value: V):
+        with self._lock:
+            now = self.clock()
+            self.expire(now)
+            entry = self._data.get(key)
+            if entry is None:
+                self._data[key] = [value, now]
+                self._shrink()
+            else:
+                entry[0] = value
+                entry[1] = now
+                self._data.move_to_end(key)
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            del self._data[key]
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            self.expire()
+            return key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self.expire()
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.expire()
+            return len(self._data)
+
+    def pop(self, key: str, default: Any = _MISSING) -> V:
+        """Remove key and return its value; default (or KeyError) if missing."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        if entry is not None:
+            return entry[0]
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def peek(self, key: str) -> Optional[V]:
+        """Value for key without counting as activity (None if missing)."""
+        entry = self._data.get(key)
+        return None if entry is None else entry[0]
+
+    def get_or_create(self, key: str, factory: Callable[[], V]) -> V:
+        """Value for key (touching it), creating it with factory() if missing."""
+        with self._lock:
+            try:
+                return self[key]
+            except KeyError:
+                value = factory()
+                self[key] = value
+                return value
+
+    # -----------------------------------------
+    # Metrics
+    # -----------------------------------------
+    def stats(self) -> Dict[str, int]:
+        return {"live": len(self), "evicted": self.evicted, "expired": self.expired}
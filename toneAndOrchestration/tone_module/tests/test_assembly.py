@@ -0,0 +1,64 @@
+# tone_module/tests/test_assembly.py
+import random
+
+from tone_module.rule_engine import ToneRuleSet
+from tone_module.transformer import ToneTransformer
+
+MODES = ["formal", "casual", "concise", "neutral"]
+
+
+def _full(t: ToneTransformer, chunks):
+    return t._tone_transform(" ".join(chunks).strip())
+
+
+def test_assembly_out_of_order_chunks():
+    chunks = ["we do", "not kind", "of need", "your assistance, thank", "you"]
+    for mode in MODES:
+        t = ToneTransformer(mode=mode)
+        asm = t.start_assembly()
+        for i in [3, 1, 4, 0, 2]:
+            asm.add(i, t.transform_chunk(chunks[i]))
+        assert asm.result() == _full(t, chunks)
+
+
+def test_assembly_revised_chunk_rebuilds():
+    t = ToneTransformer(mode="casual")
+    asm = t.start_assembly()
+    asm.add(0, t.transform_chunk("we do"))
+    asm.add(1, t.transform_chunk("need help"))
+    asm.add(2, t.transform_chunk("thank you"))
+    asm.add(1, t.transform_chunk("not need assistance"))  # ASR revision
+    assert asm.result() == "we don't need help thanks"
+
+
+def test_assembly_blank_and_padded_chunks_mirror_outer_strip():
+    chunks = ["", "  you r", " ", "to cause ", "r ", "", " "]
+    t = ToneTransformer(mode="formal")
+    assert t.assemble([t.transform_chunk(c) for c in chunks]) == _full(t, chunks)
+
+
+def test_assembly_matches_full_transform_with_overlapping_rules():
+    # chained overlapping rules make the scan position depend on everything
+    # to the left; splitting must still give the full-text result
+    rules = ToneRuleSet(
+        formal_expansions={"a b": "X", "b a": "Y", "a b c d": "Z"},
+        casual_simplifications={"a b": "1", "b a": "2", "b": "3"},
+        hedges=["a b a", "b a b"],
+        intensifiers=["very"],
+    )
+    rng = random.Random(0)
+    vocab = ["a", "b", "c", "d", "a b", "b a", "very", ""]
+    for mode in ["formal", "casual", "concise"]:
+        t = ToneTransformer(mode=mode, rules=rules)
+        for _ in range(300):
+            chunks = [" ".join(rng.choice(vocab) for _ in range(rng.randint(0, 3))) for _ in range(rng.randint(1, 6))]
+            assert t.assemble([t.transform_chunk(c) for c in chunks]) == _full(t, chunks)
+
+
+def test_assembly_add_after_result_rebuilds():
+    t = ToneTransformer(mode="casual")
+    asm = t.start_assembly()
+    asm.add(0, t.transform_chunk("I do"))
+    assert asm.result() == "I do"
+    asm.add(1, t.transform_chunk("not know"))
+    assert asm.result() == "I don't know"
@@ -0,0 +1,80 @@
+# tone_module/tests/test_cache.py
+import threading
+
+import pytest
+
+from tone_module.cache import TransformCache
+from tone_module.rule_engine import ToneRuleSet
+from tone_module.tone_rules import CASUAL_SIMPLIFICATIONS, FORMAL_EXPANSIONS, HEDGES, INTENSIFIERS
+from tone_module.transformer import ToneTransformer
+
+
+def test_cache_lru_counters():
+    cache = TransformCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    with pytest.raises(ValueError):
+        TransformCache(max_size=0)
+
+
+def test_cached_transformer_matches_uncached():
+    texts = ["thanks, i'm gonna go now", "Thank you.", "  I think this is really good ", "Thank you."] * 3
+    plain = ToneTransformer(mode="formal")
+    cached = ToneTransformer(mode="formal", cache=TransformCache())
+
+    for text in texts:
+        assert cached._tone_transform(text) == plain._tone_transform(text)
+        assert cached.transform_chunk(text).stages == plain.transform_chunk(text).stages
+    assert cached.tone_transform("I will help you", mode="casual") == plain.tone_transform("I will help you", mode="casual")
+
+    assert cached.cache.hits > cached.cache.misses
+    # whole utterances above max_text_len bypass the cache
+    size = len(cached.cache)
+    cached._tone_transform("thanks " * 100)
+    assert len(cached.cache) == size
+
+
+def test_cache_invalidated_when_rules_change():
+    cache = TransformCache()
+    tt = ToneTransformer(mode="formal", cache=cache)
+    assert tt._tone_transform("thanks for coming") == "thank you for coming"
+
+    tt.rules = ToneRuleSet(
+        formal_expansions={**FORMAL_EXPANSIONS, "thanks": "many thanks"},
+        casual_simplifications=CASUAL_SIMPLIFICATIONS,
+        hedges=HEDGES,
+        intensifiers=INTENSIFIERS,
+    )
+    assert tt._tone_transform("thanks for coming") == "many thanks for coming"
+
+
+def test_cache_shared_between_threads():
+    cache = TransformCache(max_size=8)
+    texts = [f"thanks {i}, i'm gonna go" for i in range(20)]
+    expected = ToneTransformer(mode="formal").transform_many(texts)
+    errors = []
+
+    def worker(seed):
+        tt = ToneTransformer(mode="formal", cache=cache)
+        for n in range(500):
+            i = (seed * 7 + n) % len(texts)
+            if tt._tone_transform(texts[i]) != expected[i]:
+                errors.append(i)
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(cache) <= 8
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 8 * 500
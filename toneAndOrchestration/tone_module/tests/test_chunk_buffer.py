@@ -0,0 +1,55 @@
+# tone_module/tests/test_chunk_buffer.py
+import random
+
+from tone_module.chunk_buffer import ChunkBuffer
+
+
+def _reference(chunks):
+    return " ".join(chunks[i] for i in sorted(chunks))
+
+
+def test_chunk_buffer_orders_out_of_order_chunks():
+    buf = ChunkBuffer()
+    assert buf.add(1, "world") == 0
+    assert buf.add(3, "again") == 0
+    assert buf.prefix_text() == ""
+    assert buf.joined() == "world again"
+
+    assert buf.add(0, "hello") == 2  # 0 and the waiting 1
+    assert buf.next_index == 2
+    assert buf.prefix_text() == "hello world"
+    assert buf.add(2, "hello") == 2
+    assert buf.joined() == "hello world hello again"
+    assert list(buf) == [0, 1, 2, 3]
+    assert dict(buf) == {0: "hello", 1: "world", 2: "hello", 3: "again"}
+
+
+def test_chunk_buffer_revisions_update_the_running_prefix():
+    buf = ChunkBuffer()
+    for i, text in enumerate(["a", "b", "c"]):
+        buf.add(i, text)
+    assert buf.prefix_text() == "a b c"
+
+    assert buf.add(1, "B!") == 0
+    assert buf.prefix_text() == "a B! c"
+    buf.add(0, "")
+    buf.add(3, "d")
+    assert buf.prefix_text() == " B! c d"
+    assert len(buf) == 4 and 3 in buf and 4 not in buf and "x" not in buf
+
+
+def test_chunk_buffer_matches_sorted_join_fuzz():
+    rng = random.Random(5)
+    for _ in range(300):
+        buf = ChunkBuffer()
+        ref = {}
+        for _ in range(rng.randint(0, 30)):
+            index = rng.randint(-2, 20)
+            text = rng.choice(["", "x", "hello there", " pad ", "y"])
+            buf.add(index, text)
+            ref[index] = text
+            if rng.random() < 0.3:
+                assert buf.joined() == _reference(ref)
+        assert buf.joined() == _reference(ref)
+        assert dict(buf) == ref
+        assert list(buf) == sorted(ref)
@@ -0,0 +1,88 @@
+# tone_module/tests/test_contractions.py
+import pytest
+
+from tone_module.rule_engine import ContractionExpander, ToneRuleSet
+from tone_module.tone_rules import CONTRACTIONS
+from tone_module.utils import expand_contractions
+
+# Same output as contractions.fix
+CORPUS = [
+    "I'm gonna join later, thanks!",
+    "We're sure it's fine, don't worry",
+    "She's said they'd've called if they couldn't make it",
+    "You'll see what's wrong when it's done",
+    "Don't you think that's odd? Isn't it?",
+    "he wasn't there and we weren't either",
+    "Let's go, y'all",
+    "There's a meeting at five o'clock",
+    "I've got to say I'd rather not",
+    "It'd be nice if you'd wanna come",
+    "kinda late, gotta run, lemme know",
+    "Who's there? Where'd they go? How's it going?",
+    "You shouldn't've done that, ma'am",
+    "it’s fine, we’ll manage, don’t worry",  # typographic apostrophes
+    "John's car isn't here",  # possessive left alone
+    "no contractions in this sentence at all",
+    "",
+]
+
+# Intended differences: the library lowercases "I" after a lowercase
+# "i'm", keeps shouting in upper case, and expands apostrophe-less forms
+# that double as real words ("shell" -> "she will"). Case follows
+# utils.apply_mapping here.
+DIFFERENCES = [
+    ("i'm here", "I am here"),
+    ("DON'T", "Do not"),
+    ("we shell out", "we shell out"),
+    ("u r late", "u r late"),
+]
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_matches_contractions_fix(text):
+    contractions = pytest.importorskip("contractions")
+    assert ContractionExpander().sub(text) == contractions.fix(text)
+
+
+@pytest.mark.parametrize("text, expected", DIFFERENCES)
+def test_known_differences(text, expected):
+    assert ContractionExpander().sub(text) == expected
+
+
+def test_case_follows_apply_mapping():
+    expander = ContractionExpander({"can't": "cannot", "i'm": "I am"})
+    assert expander.sub("can't, Can't, CAN'T") == "cannot, Cannot, Cannot"
+    assert expander.sub("i'm, I'm, I’M") == "I am, I am, I am"
+    assert expander.sub("scan'tly 'can't'") == "scan'tly 'cannot'"
+
+
+def test_one_compiled_table():
+    assert len(ContractionExpander()) == 2 * sum("'" in k for k in CONTRACTIONS) + sum(
+        "'" not in k for k in CONTRACTIONS
+    )
+    assert expand_contractions("I'm sure it's OK") == "I am sure it is OK"
+    assert ToneRuleSet.shared().contractions.guard.joins_cleanly("we're", "here")
+
+
+def test_library_fallback():
+    contractions = pytest.importorskip("contractions")
+    text = "I'm sure it'll be fine, it's the dasn't that worries me"
+    plain = ContractionExpander({"i'm": "I am"})
+    assert plain.sub(text) == "I am sure it'll be fine, it's the dasn't that worries me"
+    fallback = ContractionExpander({"i'm": "I am"}, fallback=True)
+    assert fallback.sub(text) == contractions.fix(text, slang=False)
+
+
+def test_fallback_rules_reach_sharded_workers():
+    pytest.importorskip("contractions")
+    from orchestrator.sharded_orchestrator import ShardedOrchestrator
+    from schemas.pipeline_message import PipelineMessage
+
+    messages = [
+        PipelineMessage(id="u", chunk_index=0, text="it's the dasn't that worries me", event="PART"),
+        PipelineMessage(id="u", chunk_index=-1, text="", event="END_GRAMMAR", is_final=True),
+    ]
+    sharded = ShardedOrchestrator(tone_mode="formal", num_workers=2,
+                                  rules=ToneRuleSet.from_tables(contractions_fallback=True))
+    [final] = [m for m in sharded.process_stream(messages) if m.event == "END_TONE"]
+    assert final.text == "it is the dare not that worries me."
@@ -0,0 +1,88 @@
+# tone_module/tests/test_rule_engine.py
+from tone_module.rule_engine import FunctionRewrite, PhraseMatcher, ToneRuleSet
+
+
+def test_phrase_matcher_longest_match_first():
+    m = PhraseMatcher({"thank": "THANK", "thank you": "THANKS", "thank you for": "TYF"})
+    assert m.sub("thank you for coming") == "TYF coming"
+    assert m.sub("thank you all") == "THANKS all"
+    assert m.sub("thank them") == "THANK them"
+
+
+def test_phrase_matcher_respects_word_boundaries():
+    m = PhraseMatcher({"ok": "okay"})
+    assert m.sub("ok, then") == "okay, then"
+    assert m.sub("okra is ok") == "okra is okay"
+
+
+def test_phrase_matcher_literal_punctuation_keys():
+    m = PhraseMatcher({"ok": "okay", "ok?": "okay?", "yes.": "yeah."})
+    assert m.sub("ok? sure") == "okay? sure"
+    assert m.sub("yes.") == "yeah."
+    # "." is literal, not a regex wildcard
+    assert m.sub("yes a") == "yes a"
+
+
+def test_phrase_matcher_case_insensitive_exact_lookup_first():
+    m = PhraseMatcher({"yes.": "yeah.", "Yes.": "Yeah."})
+    assert m.sub("Yes. yes. YES.") == "Yeah. yeah. yeah."
+
+
+def test_phrase_matcher_single_pass_no_chaining():
+    m = PhraseMatcher({"a": "b", "b": "c"})
+    assert m.sub("a b") == "b c"
+
+
+def test_phrase_matcher_empty_table_is_identity():
+    m = PhraseMatcher({})
+    assert len(m) == 0
+    assert m.sub("anything at all") == "anything at all"
+
+
+def test_phrase_matcher_large_table():
+    table = {f"word{i} phrase{i}": f"w{i}" for i in range(5000)}
+    m = PhraseMatcher(table)
+    assert m.sub("say word4999 phrase4999 and word12 phrase12") == "say w4999 and w12"
+
+
+def test_rule_set_from_tables():
+    rules = ToneRuleSet.from_tables()
+    assert rules.hedges.sub("I think it is kind of done").split() == ["it", "is", "done"]
+    assert rules.intensifiers.sub("a Really very good day").split() == ["a", "good", "day"]
+    # only whole tokens are intensifiers
+    assert rules.intensifiers.sub("really. very-good") == "really. very-good"
+
+
+def test_span_guard_detects_multi_word_rule_across_join():
+    m = PhraseMatcher({"kind of": "", "thank you": "thanks", "ok": "okay"})
+    assert m.guard.crossing("it is kind", "of nice") == len("kind ")
+    assert m.guard.crossing("well, thank", "You all") > 0
+    assert m.guard.crossing("it is kind", "nice") == 0
+    assert m.guard.crossing("it is ok", "ok then") == 0
+    assert m.guard.crossing("", "") == 0
+
+
+def test_span_guard_reports_matches_starting_before_previous_chunk():
+    guard = PhraseMatcher({"a b c": "x"}).guard
+    # "a" and "b" were separate chunks; "c" completes the phrase
+    assert guard.crossing("a b", "c") == len("a b ")
+
+
+def test_function_rewrite_guard():
+    assert FunctionRewrite(str.upper, None).guard is None
+    step = FunctionRewrite(str.upper, ["x y", "z"])
+    assert step.sub("abc") == "ABC"
+    assert step.guard.crossing("a x", "y") > 0
+    assert step.guard.crossing("a", "b") == 0
+
+
+def test_rule_set_plain_data_round_trip():
+    import json
+
+    rules = ToneRuleSet.from_tables()
+    restored = ToneRuleSet.from_data(json.loads(json.dumps(rules.to_data())))
+    text = "I'm gonna purchase it, honestly it's really good, thank you for coming"
+    for name in ToneRuleSet._STEPS:
+        step, copy = getattr(rules, name), getattr(restored, name)
+        assert (type(copy), copy.sub(text), len(copy)) == (type(step), step.sub(text), len(step))
+        assert copy.guard.crossing("thank", "you for") == step.guard.crossing("thank", "you for")
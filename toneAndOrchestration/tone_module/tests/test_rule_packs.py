@@ -0,0 +1,154 @@
+# tone_module/tests/test_rule_packs.py
+import json
+import os
+import pickle
+import time
+
+import pytest
+
+from orchestrator.orchestrator import PipelineOrchestrator
+from schemas.pipeline_message import PipelineMessage
+from tone_module import rule_packs
+from tone_module.rule_engine import ToneRuleSet
+from tone_module.rule_packs import RulePackReloader, load_rule_pack
+from tone_module.transformer import ToneTransformer
+
+
+def _write(path, pack):
+    path.write_text(json.dumps(pack), encoding="utf-8")
+    # make sure the change is visible to an mtime check
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    return str(path)
+
+
+def test_json_pack_replaces_only_given_sections(tmp_path):
+    path = _write(tmp_path / "pack.json", {"casual_simplifications": {"purchase": "buy"}})
+    tt = ToneTransformer(mode="casual", rules=load_rule_pack(path, cache_dir=None))
+    assert tt.tone_transform("purchase it, I am glad") == "buy it, I am glad"
+    # built-in intensifiers still there
+    assert tt.tone_transform("really good", mode="concise") == "good"
+
+
+def test_yaml_pack(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "pack.yaml"
+    path.write_text("hedges:\n  - honestly\n", encoding="utf-8")
+    tt = ToneTransformer(mode="concise", rules=load_rule_pack(str(path), cache_dir=None))
+    assert tt.tone_transform("honestly it works") == "it works"
+
+
+@pytest.mark.parametrize("pack", [[1], {"slang": {}}, {"hedges": "maybe"}, {"formal_expansions": {"a": 1}}])
+def test_invalid_packs_are_rejected(tmp_path, pack):
+    with pytest.raises(ValueError):
+        load_rule_pack(_write(tmp_path / "bad.json", pack), cache_dir=None)
+
+
+def test_compiled_pack_is_cached_on_disk(tmp_path, monkeypatch):
+    pack = {"formal_expansions": {f"phrase {i}": f"p{i}" for i in range(200)}}
+    path = _write(tmp_path / "pack.json", pack)
+    first = load_rule_pack(path)
+    [cached] = os.listdir(tmp_path / "__rulecache__")
+
+    def no_compile(_):
+        raise AssertionError("compiled again instead of read from the cache")
+
+    monkeypatch.setattr(rule_packs, "rule_set_from_pack", no_compile)
+    warm = load_rule_pack(path)
+    text = "phrase 12 and phrase 199 then phrase 7"
+    assert warm.formal.sub(text) == first.formal.sub(text) == "p12 and p199 then p7"
+    assert warm.formal.guard.crossing("and phrase", "3 x") == first.formal.guard.crossing("and phrase", "3 x")
+
+    # a corrupt cache file is rebuilt, not trusted
+    (tmp_path / "__rulecache__" / cached).write_bytes(b"not json")
+    monkeypatch.undo()
+    assert load_rule_pack(path).formal.sub(text) == "p12 and p199 then p7"
+
+
+class _MakesDir:
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return os.mkdir, (self.path,)  # runs if anything unpickles the cache
+
+
+def _payloads(tmp_path):
+    data = json.dumps(load_rule_pack(_write(tmp_path / "ref.json", {}), cache_dir=None).to_data())
+    broken_regex = json.loads(data)
+    broken_regex["hedges"]["pattern"] = "(unclosed"
+    return [
+        b"",
+        data[:-3].encode(),  # truncated
+        json.dumps({"not": "rules"}).encode(),
+        json.dumps(broken_regex).encode(),
+        pickle.dumps(_MakesDir(str(tmp_path / "pwned"))),
+    ]
+
+
+@pytest.mark.parametrize("case", range(5))
+def test_corrupted_cache_is_replaced(tmp_path, case):
+    payload = _payloads(tmp_path)[case]
+    path = _write(tmp_path / "pack.json", {"hedges": ["honestly"]})
+    load_rule_pack(path)
+    [cached] = (tmp_path / "__rulecache__").iterdir()
+    cached.write_bytes(payload)
+    rules = load_rule_pack(path)
+    assert isinstance(rules, ToneRuleSet)
+    assert ToneTransformer(mode="concise", rules=rules).tone_transform("honestly it works") == "it works"
+    assert not (tmp_path / "pwned").exists()  # the cache is data, never code
+    # rewritten with the rebuilt rules, so the next load is warm again
+    assert json.loads(cached.read_bytes())["hedges"]["mapping"] == {"honestly": ""}
+    assert rule_packs._read_cache(str(cached)) is not None
+
+
+def test_reloader_swaps_rules_and_keeps_them_on_bad_packs(tmp_path):
+    path = _write(tmp_path / "pack.json", {"casual_simplifications": {"purchase": "buy"}})
+    tt = ToneTransformer(mode="casual")
+    reloader = RulePackReloader(path, [tt])
+    reloader.reload()
+    assert tt.tone_transform("purchase") == "buy"
+    assert reloader.check() is False  # unchanged
+
+    _write(tmp_path / "pack.json", {"casual_simplifications": {"purchase": "get"}})
+    assert reloader.check() is True
+    assert (tt.tone_transform("purchase"), reloader.version) == ("get", 2)
+
+    _write(tmp_path / "pack.json", {"hedges": 3})
+    assert reloader.check() is False
+    assert isinstance(reloader.last_error, ValueError)
+    assert tt.tone_transform("purchase") == "get"
+
+
+def test_reloader_polls_in_background(tmp_path):
+    path = _write(tmp_path / "pack.json", {"casual_simplifications": {"purchase": "buy"}})
+    tt = ToneTransformer(mode="casual")
+    reloader = RulePackReloader(path, [tt]).start(interval=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while tt.tone_transform("purchase") != "buy" and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        reloader.stop()
+    assert tt.tone_transform("purchase") == "buy"
+
+
+def test_in_flight_utterances_keep_their_rules(tmp_path):
+    orch = PipelineOrchestrator(tone_mode="casual")
+
+    def part(utt_id, i, text):
+        return orch.process_message(PipelineMessage(id=utt_id, chunk_index=i, text=text, event="PART"))
+
+    def end(utt_id):
+        return orch.process_message(PipelineMessage(id=utt_id, chunk_index=0, text="", event="END_GRAMMAR",
+                                                    is_final=True, end_of_speech_time=time.time()))
+
+    part("old", 0, "we purchase")
+    path = _write(tmp_path / "pack.json", {"casual_simplifications": {"purchase": "buy"}})
+    RulePackReloader(path, [orch.tone_transformer]).reload()
+    part("old", 1, "and purchase assistance")
+    part("new", 0, "we purchase assistance")
+
+    # "old" started on the built-in table and stays on it
+    assert end("old").text == "we purchase and purchase help."
+    assert end("new").text == "we buy assistance."
@@ -1,5 +1,7 @@
 # tone_module/tests/test_sentiment.py
-from tone_module.sentiment import SentimentAnalyzer
+import pytest
+
+from tone_module.sentiment import BACKENDS, SentimentAnalyzer, _load_backends
 
 def test_sentiment_polarity_neutral():
     sa = SentimentAnalyzer()
@@ -11,3 +13,29 @@ def test_sentiment_polarity_positive_negative():
     n = sa.polarity("This was terrible and I hate it.")
     assert p >= 0
     assert n <= 0
+
+def test_heuristic_scorer_matches_whole_words():
+    sa = SentimentAnalyzer(backend="heuristic")
+    assert sa.backend == "heuristic"
+    assert sa.polarity("great, thanks!") == pytest.approx(0.45)
+    assert sa.polarity("happy happy happy") == pytest.approx(0.2)  # once per keyword
+    assert sa.polarity("a crusade for thanksgiving") == 0.0       # no substring hits
+    assert sa.scores("this is bad") == (pytest.approx(-0.2), 0.5)
+
+def test_sentiment_cache_and_batch_api():
+    sa = SentimentAnalyzer(backend="heuristic", cache_size=2)
+    texts = ["good", "bad", "good", "great", "good"]
+    assert sa.polarity_many(texts) == [sa.polarity(t) for t in texts]
+    assert sa.scores_many(["good", "good"]) == [sa.scores("good")] * 2
+    assert sa.cache.stats()["hits"] > 0
+    assert len(sa.cache) <= 2
+    assert SentimentAnalyzer(backend="heuristic", cache_size=0).polarity("good") == pytest.approx(0.2)
+
+def test_sentiment_backend_selection():
+    with pytest.raises(ValueError):
+        SentimentAnalyzer(backend="nope")
+    sa = SentimentAnalyzer().warmup()
+    assert sa.backend in BACKENDS
+    if not _load_backends()["textblob"]:
+        with pytest.raises(ImportError):
+            SentimentAnalyzer(backend="textblob").warmup()
@@ -0,0 +1,85 @@
+# tone_module/tests/test_state_store.py
+import tracemalloc
+
+import pytest
+
+from tone_module.state_store import EVICTED, EXPIRED, UtteranceStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_store_evicts_least_recently_used():
+    dropped = []
+    store = UtteranceStore(max_size=2, on_evict=lambda k, v, why: dropped.append((k, v, why)))
+    store["a"] = 1
+    store["b"] = 2
+    assert store["a"] == 1  # touch: "b" is now the oldest
+    store["c"] = 3
+
+    assert dropped == [("b", 2, EVICTED)]
+    assert set(store) == {"a", "c"}
+    assert store.stats() == {"live": 2, "evicted": 1, "expired": 0}
+
+
+def test_store_expires_idle_entries():
+    clock = FakeClock()
+    dropped = []
+    store = UtteranceStore(ttl=10, clock=clock, on_evict=lambda k, v, why: dropped.append((k, why)))
+    store["a"] = 1
+    clock.now = 5
+    store["b"] = 2
+    clock.now = 9
+    store["a"]  # still alive, touched at t=9
+
+    clock.now = 16
+    assert "b" not in store
+    assert "a" in store
+    assert dropped == [("b", EXPIRED)]
+
+    clock.now = 100
+    assert store.expire() == 1
+    assert store.stats() == {"live": 0, "evicted": 0, "expired": 2}
+
+
+def test_store_del_and_pop_do_not_call_on_evict():
+    dropped = []
+    store = UtteranceStore(max_size=10, on_evict=lambda *a: dropped.append(a))
+    store["a"] = 1
+    store["b"] = 2
+    del store["a"]
+    assert store.pop("b") == 2
+    assert store == {}
+    assert dropped == []
+
+
+def test_store_rejects_bad_limits():
+    with pytest.raises(ValueError):
+        UtteranceStore(max_size=0)
+    with pytest.raises(ValueError):
+        UtteranceStore(ttl=0)
+
+
+def test_store_memory_stays_flat_with_abandoned_utterances():
+    clock = FakeClock()
+    store = UtteranceStore(max_size=1000, ttl=30, clock=clock)
+
+    tracemalloc.start()
+    try:
+        for i in range(100_000):
+            clock.now = i * 0.001
+            store.get_or_create(f"utt_{i}", dict)[0] = "abandoned chunk"
+            if i == 10_000:
+                early, _ = tracemalloc.get_traced_memory()
+        late, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(store) == 1000
+    assert store.evicted + store.expired == 99_000
+    assert late < early * 1.1
@@ -28,3 +28,22 @@ def test_streaming_final_assembly():
     final = t.finalize("u1")
 
     assert final.text == "I am going to join later thank you."
+
+def test_assemble_matches_full_transform_across_chunk_boundaries():
+    # multi-word rules split over chunk joins: "kind | of", "thank | you", "do | not"
+    chunks = ["I kind", "of think so, thank", "you. We do", "not know", "", "  really  "]
+    for mode in ["formal", "casual", "concise", "neutral"]:
+        t = ToneTransformer(mode=mode)
+        tones = [t.transform_chunk(c) for c in chunks]
+        assert [x.text for x in tones] == [t._tone_transform(c) for c in chunks]
+        assert t.assemble(tones) == t._tone_transform(" ".join(chunks).strip())
+
+
+def test_streaming_final_assembly_rule_spanning_chunks():
+    t = ToneTransformer(mode="casual")
+    t.process_chunk(PipelineMessage(id="u2", chunk_index=0, text="we do", event="PART"))
+    t.process_chunk(PipelineMessage(id="u2", chunk_index=1, text="not need assistance", event="PART"))
+
+    final = t.finalize("u2")
+
+    assert final.text == "we don't need help."
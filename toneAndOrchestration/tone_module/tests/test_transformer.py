@@ -1,7 +1,7 @@
 # tone_module/tests/test_transformer.py
 import time
 from tone_module.transformer import ToneTransformer
-from schemas.pipeline_message import PipelineMessage
+from schemas.pipeline_message import FastMessage, PipelineMessage
 
 def test_tone_transformer_concise_mode():
     tt = ToneTransformer(mode="concise")
@@ -34,3 +34,67 @@ def test_tone_transformer_neutral_mode_single_call():
     tt = ToneTransformer(mode="neutral")
     out = tt.tone_transform("this is a sample sentence without punctuation", mode="neutral")
     assert out[0].isupper() or out.endswith(".") or len(out) > 0
+
+def test_transform_many_matches_tone_transform():
+    tt = ToneTransformer(mode="neutral")
+    texts = ["thanks, i'm gonna go now", "I think this is really very good", "  ", "I do not need assistance."]
+    for mode in ["formal", "casual", "concise", "neutral"]:
+        expected = [tt.tone_transform(t, mode=mode) for t in texts]
+        assert tt.transform_many(texts, mode=mode) == expected
+        assert list(tt.iter_transform_many(iter(texts), mode=mode)) == expected
+    assert tt.mode == "neutral"  # batch API never swaps the mode
+
+
+def test_transform_many_process_pool():
+    tt = ToneTransformer(mode="formal")
+    texts = [f"thanks {i}, i'm gonna go" for i in range(50)]
+    assert tt.transform_many(texts, workers=2, chunksize=7) == tt.transform_many(texts)
+    assert tt.transform_many(texts, mode="FORMAL", workers=2) == tt.transform_many(texts, mode="Formal")
+
+
+def test_process_batch_streams_and_finalizes():
+    tt = ToneTransformer(mode="formal")
+    msgs = [
+        PipelineMessage(id="b1", chunk_index=0, text="I'm gonna join", event="PART"),
+        PipelineMessage(id="b2", chunk_index=0, text="thanks", event="PART"),
+        PipelineMessage(id="b1", chunk_index=1, text="later thanks", event="PART"),
+        PipelineMessage(id="b1", chunk_index=-1, text="", event="END_GRAMMAR", is_final=True),
+        PipelineMessage(id="b2", chunk_index=-1, text="", event="END_CLEAN", is_final=True),
+    ]
+    out = tt.process_batch(msgs)
+    assert [m.event for m in out] == ["PART", "PART", "PART", "END_TONE"]
+    assert out[-1].text == "I am going to join later thank you."
+    assert "b1" not in tt.buffers and "b2" in tt.buffers
+
+
+
+def test_finalize_answers_in_the_type_of_the_input():
+    tt = ToneTransformer(mode="formal")
+    out = tt.process_batch([
+        FastMessage(id="f", chunk_index=0, text="i'm gonna join", event="PART"),
+        FastMessage(id="f", chunk_index=-1, text="", event="END_GRAMMAR", is_final=True),
+        FastMessage(id="e", chunk_index=-1, text="", event="END_GRAMMAR", is_final=True),
+    ])
+    assert [(type(m), m.event) for m in out] == [(FastMessage, "PART"), (FastMessage, "END_TONE"),
+                                                 (FastMessage, "END_TONE")]
+    assert out[1].text == "I am going to join."
+    # called directly: the type of the utterance's chunks
+    tt.process_chunk(FastMessage(id="g", chunk_index=0, text="thanks", event="PART"))
+    assert type(tt.finalize("g")) is FastMessage
+    assert type(tt.finalize("none")) is PipelineMessage
+    assert tt.message_cls_by_id == {}
+
+def test_per_message_tone_mode_without_touching_self_mode():
+    tt = ToneTransformer(mode="neutral")
+    assert tt.rules is ToneTransformer(mode="formal").rules  # compiled once, shared
+    assert tt.tone_transform("i'm gonna go", mode="formal") == "I am going to go"
+    assert tt.mode == "neutral"
+
+    formal = tt.process_chunk(PipelineMessage(id="a", chunk_index=0, text="i'm gonna go", event="PART", tone_mode="formal"))
+    plain = tt.process_chunk(PipelineMessage(id="b", chunk_index=0, text="i'm gonna go", event="PART"))
+    # later chunks keep the utterance's mode
+    tt.process_chunk(PipelineMessage(id="a", chunk_index=1, text="thanks", event="PART"))
+    assert (formal.text, formal.tone_mode) == ("I am going to go", "formal")
+    assert (plain.text, plain.tone_mode) == ("i'm gonna go", "neutral")
+    assert tt.finalize("a").text == "I am going to go thank you."
+    assert tt.mode == "neutral"
@@ -14,3 +14,20 @@ def test_apply_mapping_case_preserve():
 def test_normalize_whitespace():
     s = "this   has   extra   spaces"
     assert normalize_whitespace(s) == "this has extra spaces"
+
+def test_matchers_are_compiled_once_per_table():
+    from tone_module import utils
+    assert utils.mapping_matcher({"ok": "okay"}) is utils.mapping_matcher(dict(ok="okay"))
+    assert utils.word_remover(["just", "maybe"]) is utils.word_remover(("just", "maybe"))
+    assert utils.word_remover(["just"]) is not utils.intensifier_reducer(["just"])
+    assert apply_mapping("Ok, ok", {"ok": "okay"}) == "Okay, okay"
+    assert utils.remove_words("I just maybe go", {"maybe", "just"}) == "I   go"
+    assert utils.reduce_intensifiers("really very good", ["very", "really"]) == "good"
+
+def test_matcher_cache_is_bounded(monkeypatch):
+    from tone_module import utils
+    from tone_module.cache import TransformCache
+    monkeypatch.setattr(utils, "_MATCHERS", TransformCache(max_size=2))
+    for i in range(5):
+        assert apply_mapping(f"w{i}", {f"w{i}": "x"}) == "x"
+    assert len(utils._MATCHERS) == 2
@@ -5,12 +5,48 @@ Keep these lists/dicts small and editable for rapid iteration.
 """
 from typing import Dict, List
 
+# Contractions and spoken shortenings -> full forms, for formal mode and
+# utils.expand_contractions (compiled once by rule_engine.ContractionExpander).
+# Keys are lowercase; each also matches with a typographic apostrophe (’).
+CONTRACTIONS: Dict[str, str] = {
+    "i'm": "I am", "i've": "I have", "i'll": "I will", "i'd": "I would", "i'll've": "I will have",
+    "i'd've": "I would have",
+    "you're": "you are", "you've": "you have", "you'll": "you will", "you'd": "you would",
+    "you'd've": "you would have", "y'all": "you all",
+    "he's": "he is", "he'll": "he will", "he'd": "he would", "he'd've": "he would have",
+    "she's": "she is", "she'll": "she will", "she'd": "she would", "she'd've": "she would have",
+    "it's": "it is", "it'll": "it will", "it'd": "it would", "it'd've": "it would have",
+    "'tis": "it is", "'twas": "it was",
+    "we're": "we are", "we've": "we have", "we'll": "we will", "we'd": "we would",
+    "we'd've": "we would have", "they're": "they are", "they've": "they have",
+    "they'll": "they will", "they'd": "they would", "they'd've": "they would have",
+    "that's": "that is", "that'll": "that will", "that'd": "that would", "there's": "there is",
+    "there're": "there are", "there'll": "there will", "there'd": "there would",
+    "here's": "here is", "this'll": "this will", "let's": "let us", "everyone's": "everyone is",
+    "someone's": "someone is", "somebody's": "somebody is", "something's": "something is",
+    "what's": "what is", "what're": "what are", "what'll": "what will", "what'd": "what did",
+    "what've": "what have", "who's": "who is", "who're": "who are", "who'll": "who will",
+    "who'd": "who would", "who've": "who have", "where's": "where is", "where'd": "where did",
+    "where're": "where are", "where've": "where have", "when's": "when is", "why's": "why is",
+    "why'd": "why did", "why're": "why are", "how's": "how is", "how'd": "how did",
+    "how're": "how are", "how'll": "how will",
+    "isn't": "is not", "aren't": "are not", "wasn't": "was not", "weren't": "were not",
+    "ain't": "are not", "don't": "do not", "doesn't": "does not", "didn't": "did not",
+    "haven't": "have not", "hasn't": "has not", "hadn't": "had not", "can't": "cannot",
+    "couldn't": "could not", "won't": "will not", "wouldn't": "would not", "shan't": "shall not",
+    "shouldn't": "should not", "mightn't": "might not", "mustn't": "must not",
+    "needn't": "need not", "oughtn't": "ought not",
+    "could've": "could have", "would've": "would have", "should've": "should have",
+    "might've": "might have", "must've": "must have", "couldn't've": "could not have",
+    "wouldn't've": "would not have", "shouldn't've": "should not have",
+    "'cause": "because", "'em": "them", "ma'am": "madam", "o'clock": "of the clock",
+    "gonna": "going to", "wanna": "want to", "gotta": "got to", "kinda": "kind of",
+    "gimme": "give me", "lemme": "let me", "dunno": "do not know",
+}
+
 # Casual -> Formal (examples; expand as needed)
+# (contractions are expanded before these, from CONTRACTIONS)
 FORMAL_EXPANSIONS: Dict[str, str] = {
-    "wanna": "want to",
-    "gonna": "going to",
-    "gotta": "have to",
-    "kinda": "somewhat",
     "sorta": "somewhat",
     "yeah": "yes",
     "yep": "yes",
@@ -18,12 +54,6 @@ FORMAL_EXPANSIONS: Dict[str, str] = {
     "ok?": "okay?",
     "thanks": "thank you",
     "thanks!": "thank you!",
-    "i'm": "I am",
-    "it's": "It is",
-    "don't": "do not",
-    "can't": "cannot",
-    "we're": "we are",
-    "i'll": "I will",
 }
 
 # Formal -> Casual (examples)
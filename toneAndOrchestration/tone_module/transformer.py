@@ -1,27 +1,127 @@
 # tone_module/transformer.py
+import itertools
 import re
-from typing import Dict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
 import time
 
-import contractions
-
-from schemas.pipeline_message import PipelineMessage
+from schemas.pipeline_message import AnyMessage, model_class
 from interfaces.tone_interface import ToneInterface
-from tone_module.tone_rules import (
-    FORMAL_EXPANSIONS,
-    CASUAL_SIMPLIFICATIONS,
-    INTENSIFIERS,
-    HEDGES,
-)
+from tone_module.assembly import ChunkTone, ToneAssembly, run_steps
+from tone_module.cache import TransformCache
+from tone_module.chunk_buffer import ChunkBuffer
+from tone_module.rule_engine import RewriteStep, ToneRuleSet
+from tone_module.state_store import UtteranceStore
+from tone_module.utils import normalize_whitespace
+
+
+# Rewrite steps per mode (applied in order), built on a mode's first use
+_PIPELINES: Dict[str, Callable[[ToneRuleSet], Tuple[RewriteStep, ...]]] = {
+    # NEUTRAL — NO CHANGES
+    "neutral": lambda rules: (),
+    # FORMAL — expand contractions/slang, formal phrasing, drop intensifiers
+    "formal": lambda rules: (rules.contractions, rules.formal, rules.intensifiers),
+    # CASUAL — simplify formal phrasing
+    "casual": lambda rules: (rules.casual,),
+    # CONCISE — remove hedging phrases and intensifiers
+    "concise": lambda rules: (rules.hedges, rules.intensifiers),
+}
+MODES: Tuple[str, ...] = tuple(_PIPELINES)
+
+# Bumped whenever a transformer gets new rules; part of every cache key
+_RULES_VERSION = itertools.count()
+
+
+class CompiledRules:
+    """
+    Immutable snapshot of a rule set and the rewrite steps built from it.
+    Assigning ToneTransformer.rules swaps in a new snapshot in one step;
+    utterances already assembling keep the one they started with.
+    """
+
+    __slots__ = ("version", "rules", "pipelines")
+
+    def __init__(self, rules: ToneRuleSet):
+        self.version = next(_RULES_VERSION)
+        self.rules = rules
+        # filled per mode on first use; building twice under a race is harmless
+        self.pipelines: Dict[str, Tuple[RewriteStep, ...]] = {}
+
+    def steps(self, mode: str) -> Tuple[RewriteStep, ...]:
+        steps = self.pipelines.get(mode)
+        if steps is None:
+            build = _PIPELINES.get(mode)
+            if build is None:
+                return ()
+            steps = self.pipelines[mode] = build(self.rules)
+        return steps
 
 
 class ToneTransformer(ToneInterface):
-    def __init__(self, mode: str = "neutral"):
+    def __init__(
+        self,
+        mode: str = "neutral",
+        rules: Optional[ToneRuleSet] = None,
+        max_utterances: Optional[int] = None,
+        utterance_ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[str, ChunkBuffer, str], None]] = None,
+        cache: Optional[TransformCache] = None,
+        metrics=None,
+    ):
         self.mode = (mode or "neutral").lower()
-        # For streaming use: id -> {chunk_index: text}
-        self.buffers: Dict[str, Dict[int, str]] = {}
+        # Optional sink with record(stage, ns), e.g. orchestrator's LatencyMetrics
+        self.metrics = metrics
+        # Optional memo of per-chunk results, may be shared between transformers
+        self.cache = cache
+        # Rule tables compiled once per process and shared read-only by every
+        # transformer; each mode is then a single regex pass
+        self.rules = rules if rules is not None else ToneRuleSet.shared()
+        # For streaming use: id -> chunks in index order. Bounded for utterances
+        # that never get finalize(); on_evict(id, chunks, reason) sees each drop.
+        self._on_evict = on_evict
+        self.buffers: UtteranceStore[ChunkBuffer] = UtteranceStore(
+            max_size=max_utterances, ttl=utterance_ttl, on_evict=self._drop_utterance
+        )
+        # Per-chunk tone results reused by finalize: id -> ToneAssembly
+        self.assembly_by_id: Dict[str, ToneAssembly] = {}
         # Optional end_of_speech_time tracking
         self.end_of_speech_time_by_id: Dict[str, float] = {}
+        # Message type of each utterance's chunks: finalize answers in kind
+        self.message_cls_by_id: Dict[str, Type[AnyMessage]] = {}
+
+    @property
+    def rules(self) -> ToneRuleSet:
+        return self.compiled.rules
+
+    @rules.setter
+    def rules(self, rules: ToneRuleSet):
+        # Built first, then published by one assignment: readers see the old
+        # snapshot or the new one, never a mix. The new version also keeps
+        # cached results of the previous rules from being hit.
+        self.compiled = CompiledRules(rules)
+
+    # -----------------------------------------
+    # Rewrite steps per mode (applied in order)
+    # -----------------------------------------
+    def _steps(self, mode: str) -> Tuple[RewriteStep, ...]:
+        return self.compiled.steps(mode)
+
+    def warmup(self, modes: Optional[Iterable[str]] = None) -> "ToneTransformer":
+        """
+        Build the steps of modes (default: self.mode) and run them once, so
+        their imports and first-call costs are paid now, not on the first
+        chunk. Optional: without it every mode loads on first use.
+        """
+        for mode in modes or (self.mode,):
+            for step in self._steps(mode):
+                step.sub("warm up")
+        return self
+
+    def _drop_utterance(self, uid: str, chunks: ChunkBuffer, reason: str):
+        self.assembly_by_id.pop(uid, None)
+        self.end_of_speech_time_by_id.pop(uid, None)
+        self.message_cls_by_id.pop(uid, None)
+        if self._on_evict is not None:
+            self._on_evict(uid, chunks, reason)
 
     # -----------------------------------------
     # Minimal normalization (no grammar)
@@ -33,95 +133,123 @@ class ToneTransformer(ToneInterface):
     # FINAL CLEANUP: remove double spaces
     # -----------------------------------------
     def _final_cleanup(self, text: str) -> str:
-        text = re.sub(r"\s+", " ", text).strip()
-        return text
+        return normalize_whitespace(text)
 
     # -----------------------------------------
     # MAIN TONE TRANSFORMATION (single string)
     # -----------------------------------------
-    def _tone_transform(self, text: str) -> str:
-        mode = self.mode
-        original_text = text
-
+    def _tone_transform(
+        self, text: str, mode: Optional[str] = None, compiled: Optional[CompiledRules] = None
+    ) -> str:
+        if self.cache is not None and len(text) <= self.cache.max_text_len:
+            return self.transform_chunk(text, mode, compiled).text
         text = self._normalize(text)
+        for step in (compiled or self.compiled).steps(mode or self.mode):
+            text = step.sub(text)
+        return self._final_cleanup(text)
 
-        # NEUTRAL — NO CHANGES
-        if mode == "neutral":
-            return self._final_cleanup(original_text)
-
-        # FORMAL MODE
-        if mode == "formal":
-            text = contractions.fix(text)
-            for k, v in FORMAL_EXPANSIONS.items():
-                text = re.sub(rf"\b{k}\b", v, text, flags=re.IGNORECASE)
-            words = text.split()
-            filtered = [w for w in words if w.lower() not in INTENSIFIERS]
-            text = " ".join(filtered)
-            return self._final_cleanup(text)
-
-        # CASUAL MODE
-        if mode == "casual":
-            text = original_text
-            for k, v in CASUAL_SIMPLIFICATIONS.items():
-                text = re.sub(rf"\b{k}\b", v, text, flags=re.IGNORECASE)
-            return self._final_cleanup(text)
-
-        # CONCISE MODE
-        if mode == "concise":
-            text = original_text
-             # remove hedging phrases
-            for h in HEDGES:
-                text = re.sub(rf"\b{re.escape(h)}\b", "", text, flags=re.IGNORECASE)
-
-            # remove intensifiers  
-            words = text.split()
-            filtered = [w for w in words if w.lower() not in INTENSIFIERS]
-            text = " ".join(filtered)
-            return self._final_cleanup(text)
-
-        return self._final_cleanup(original_text)
+    # -----------------------------------------
+    # INCREMENTAL: per-chunk results + splice
+    # -----------------------------------------
+    def transform_chunk(
+        self, text: str, mode: Optional[str] = None, compiled: Optional[CompiledRules] = None
+    ) -> ChunkTone:
+        """
+        Tone-transform one chunk, keeping intermediate results for assembly.
+        ChunkTone.text equals _tone_transform(text, mode). Results are memoized
+        in self.cache, if set; a ChunkTone is never modified once built.
+        mode defaults to self.mode, compiled to the current rules (pass an
+        assembly's .rules to keep an utterance on the rules it started with).
+        """
+        mode = mode or self.mode
+        compiled = compiled or self.compiled
+        cache = self.cache
+        if cache is None or len(text) > cache.max_text_len:
+            return self._transform_chunk(text, mode, compiled)
+        key = (compiled.version, mode, text)
+        tone = cache.get(key)
+        if tone is None:
+            tone = self._transform_chunk(text, mode, compiled)
+            cache.put(key, tone)
+        return tone
+
+    def _transform_chunk(self, text: str, mode: str, compiled: CompiledRules) -> ChunkTone:
+        steps = compiled.steps(mode)
+        # stages keep the raw chunk: inner spacing matters once chunks are joined
+        stages = run_steps(steps, text)
+        stripped = self._normalize(text)
+        last = stages[-1] if stripped == text else run_steps(steps, stripped)[-1]
+        return ChunkTone(mode, stages, self._final_cleanup(last))
+
+    def start_assembly(self, mode: Optional[str] = None) -> ToneAssembly:
+        """
+        Empty incremental assembly for one utterance in mode (default
+        self.mode), pinned to the current rules (assembly.rules).
+        """
+        mode = mode or self.mode
+        compiled = self.compiled
+        return ToneAssembly(compiled.steps(mode), mode, compiled)
+
+    def assemble(self, tones: Sequence[ChunkTone]) -> str:
+        """
+        Same result as _tone_transform(" ".join(chunk texts).strip()), built
+        from cached per-chunk results (see tone_module.assembly).
+        """
+        assembly = self.start_assembly()
+        for i, tone in enumerate(tones):
+            assembly.add(i, tone)
+        return assembly.result()
 
     # -----------------------------------------
     # PUBLIC API 1: process one streaming chunk
     # -----------------------------------------
-    def process_chunk(self, message: PipelineMessage) -> PipelineMessage:
+    def process_chunk(self, message: AnyMessage) -> AnyMessage:
         """
         Store chunk text for this utterance and return a non-final
         preview with tone applied only to this chunk.
+        Accepts PipelineMessage or FastMessage and answers in kind.
+        The utterance keeps the tone_mode of its first chunk (or self.mode).
         """
         uid = message.id
         if uid not in self.buffers:
-            self.buffers[uid] = {}
-        self.buffers[uid][message.chunk_index] = message.text
+            self.buffers[uid] = ChunkBuffer()
+            self.assembly_by_id[uid] = self.start_assembly(message.tone_mode)
+            self.message_cls_by_id[uid] = type(message)
+        self.buffers[uid].add(message.chunk_index, message.text)
 
         if message.end_of_speech_time:
             self.end_of_speech_time_by_id[uid] = message.end_of_speech_time
 
-        preview_text = self._tone_transform(message.text)
+        assembly = self.assembly_by_id[uid]
+        tone = self.transform_chunk(message.text, assembly.mode, assembly.rules)
+        assembly.add(message.chunk_index, tone)
+        preview_text = tone.text
 
-        return PipelineMessage(
+        return type(message)(
             id=uid,
             chunk_index=message.chunk_index,
             text=preview_text,
             event="PART",
             is_final=False,
             end_of_speech_time=message.end_of_speech_time,
+            tone_mode=assembly.mode,
         )
 
     # -----------------------------------------
     # PUBLIC API 2: finalize after END_GRAMMAR
     # -----------------------------------------
-    def finalize(self, utterance_id: str) -> PipelineMessage:
+    def finalize(self, utterance_id: str, cls: Optional[Type[AnyMessage]] = None) -> AnyMessage:
         """
         Assemble buffered chunks for this utterance in order,
         apply final tone transform, compute latency if possible,
-        and emit an END_TONE message.
+        and emit an END_TONE message of type cls (default: the type of the
+        utterance's chunks, or PipelineMessage if it has none).
         """
-        chunks = self.buffers.get(utterance_id, {})
-        if chunks:
-            ordered = [chunks[i] for i in sorted(chunks.keys())]
-            joined = " ".join(ordered)
-            final_text = self._tone_transform(joined)
+        metrics = self.metrics
+        t0 = time.perf_counter_ns() if metrics is not None else 0
+        assembly = self.assembly_by_id.get(utterance_id)
+        if assembly is not None:
+            final_text = assembly.result()
             # ensure final period for full utterance
             if final_text and not re.search(r"[.!?]$", final_text):
                 final_text += "."
@@ -129,23 +257,27 @@ class ToneTransformer(ToneInterface):
             final_text = ""
 
         eos = self.end_of_speech_time_by_id.get(utterance_id)
-        # Optional latency calculation (logged elsewhere if you want)
-        if eos is not None:
-            now = time.time()
-            # assume eos is seconds
-            _latency_ms = int((now - eos) * 1000)
+        if metrics is not None:
+            metrics.record("final_transform", time.perf_counter_ns() - t0)
+            # eos is epoch seconds (time.time()), as set by ASR
+            if eos is not None:
+                metrics.record("end_to_end", time.time_ns() - int(eos * 1e9))
 
         # cleanup
         self.buffers.pop(utterance_id, None)
+        self.assembly_by_id.pop(utterance_id, None)
         self.end_of_speech_time_by_id.pop(utterance_id, None)
+        chunk_cls = self.message_cls_by_id.pop(utterance_id, None)
+        cls = cls or chunk_cls or model_class()
 
-        return PipelineMessage(
+        return cls(
             id=utterance_id,
             chunk_index=0,
             text=final_text,
             event="END_TONE",
             is_final=True,
             end_of_speech_time=eos,
+            tone_mode=assembly.mode if assembly is not None else None,
         )
 
     # -----------------------------------------
@@ -153,14 +285,62 @@ class ToneTransformer(ToneInterface):
     # -----------------------------------------
     def tone_transform(self, text: str, mode: str | None = None) -> str:
         """
-        Convenience non-streaming API for unit tests / CLI:
-        temporarily switch mode, transform, then restore.
+        Convenience non-streaming API for unit tests / CLI.
+        mode applies to this call only; self.mode is never touched, so one
+        transformer can serve every mode from many threads.
+        """
+        return self._tone_transform(text, mode.lower() if mode else None)
+
+    # -----------------------------------------
+    # PUBLIC API 4: batch processing
+    # -----------------------------------------
+    def iter_transform_many(self, texts: Iterable[str], mode: str | None = None) -> Iterator[str]:
+        """
+        Lazily tone-transform many texts with one mode. The rewrite steps are
+        looked up once per batch and self.mode is never touched, so memory
+        stays flat for arbitrarily long inputs.
+        """
+        steps = self._steps(mode.lower() if mode else self.mode)
+        cleanup = normalize_whitespace
+        for text in texts:
+            text = text.strip()
+            for step in steps:
+                text = step.sub(text)
+            yield cleanup(text)
+
+    def transform_many(
+        self,
+        texts: Iterable[str],
+        mode: str | None = None,
+        workers: Optional[int] = None,
+        chunksize: int = 512,
+    ) -> List[str]:
+        """
+        Batch version of tone_transform: same output as calling it per text.
+        With workers > 1 the batch is spread over a process pool
+        (see tone_module.batch).
+        """
+        mode = mode.lower() if mode else self.mode
+        if workers and workers > 1:
+            from tone_module.batch import transform_many_parallel
+
+            return list(transform_many_parallel(
+                texts, mode, workers=workers, chunksize=chunksize, rules=self.rules
+            ))
+        return list(self.iter_transform_many(texts, mode))
+
+    def process_batch(self, messages: Iterable[AnyMessage]) -> List[AnyMessage]:
+        """
+        Run many messages through the streaming API in one call:
+        PART -> process_chunk preview, END_GRAMMAR -> finalize.
+        Other events are ignored.
         """
-        prev_mode = self.mode
-        if mode:
-            self.mode = mode.lower()
-        try:
-            out = self._tone_transform(text)
-        finally:
-            self.mode = prev_mode
+        out: List[AnyMessage] = []
+        for msg in messages:
+            if msg.event == "PART":
+                out.append(self.process_chunk(msg))
+            elif msg.event == "END_GRAMMAR":
+                if msg.end_of_speech_time is not None:
+                    self.end_of_speech_time_by_id[msg.id] = msg.end_of_speech_time
+                out.append(self.finalize(msg.id, type(msg)))
         return out
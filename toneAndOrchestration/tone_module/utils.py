@@ -1,28 +1,10 @@
 # tone_module/utils.py
 import re
-from typing import Dict
-
-
-_contraction_expansions: Dict[str, str] = {
-    "don't": "do not",
-    "can't": "cannot",
-    "i'm": "I am",
-    "it's": "It is",
-    "we're": "we are",
-    "i'll": "I will",
-    "you're": "you are",
-    "they're": "they are",
-    "that's": "that is",
-    "there's": "there is",
-    "isn't": "is not",
-    "aren't": "are not",
-    "wasn't": "was not",
-    "weren't": "were not",
-    "doesn't": "does not",
-    "didn't": "did not",
-    "won't": "will not",
-    "wouldn't": "would not",
-}
+from typing import Callable, Dict, Hashable, Iterable, Mapping, Tuple
+
+from tone_module.cache import TransformCache
+from tone_module.rule_engine import ToneRuleSet
+
 
 _whitespace_re = re.compile(r"\s+")
 _punct_re = re.compile(r"([^\w\s'])")  # capture punctuation (leave apostrophes)
@@ -31,33 +13,104 @@ def normalize_whitespace(text: str) -> str:
     return _whitespace_re.sub(" ", text).strip()
 
 def expand_contractions(text: str) -> str:
-    # Lowercase matching but try to preserve capitalization later.
-    def replace(match):
-        k = match.group(0).lower()
-        return _contraction_expansions.get(k, k)
-    pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in _contraction_expansions.keys()) + r")\b", flags=re.IGNORECASE)
-    return pattern.sub(replace, text)
+    # Compiled once with the tone rules; capitalization handled like apply_mapping
+    return ToneRuleSet.shared().contractions.sub(text)
 
-def apply_mapping(text: str, mapping: Dict[str, str]) -> str:
+
+# -----------------------------------------
+# Compiled matchers, built once per table
+# -----------------------------------------
+class MappingMatcher:
     """
-    Apply simple token/phrase mapping. Lowercase-aware but preserves case of first char if needed.
+    apply_mapping compiled for one mapping: keys longest first, matched
+    case-insensitively between word boundaries. Get one from
+    mapping_matcher() to reuse it across calls.
     """
-    if not mapping:
-        return text
-    # Replace longer keys first to avoid partial matches
-    keys = sorted(mapping.keys(), key=lambda x: -len(x))
-    def repl(m):
+
+    __slots__ = ("mapping", "_pattern")
+
+    def __init__(self, mapping: Mapping[str, str]):
+        self.mapping: Dict[str, str] = dict(mapping)
+        # Replace longer keys first to avoid partial matches
+        keys = sorted(self.mapping, key=lambda x: -len(x))
+        self._pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in keys) + r")\b", flags=re.IGNORECASE)
+
+    def _replace(self, m: "re.Match[str]") -> str:
         k = m.group(0)
         # find mapping by lowercase
-        mapped = mapping.get(k, mapping.get(k.lower()))
+        mapped = self.mapping.get(k, self.mapping.get(k.lower()))
         if mapped is None:
             return k
         # preserve capitalization of first letter
         if k and k[0].isupper():
             return mapped[0].upper() + mapped[1:]
         return mapped
-    pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in keys) + r")\b", flags=re.IGNORECASE)
-    return pattern.sub(repl, text)
+
+    def sub(self, text: str) -> str:
+        return self._pattern.sub(self._replace, text)
+
+
+class WordRemover:
+    """
+    Deletes standalone words/phrases (case-insensitive). longest_first sorts
+    the words as remove_words does; otherwise they are tried in the given
+    order. trailing_space also eats the whitespace after each match.
+    """
+
+    __slots__ = ("words", "_pattern")
+
+    def __init__(self, words: Iterable[str], longest_first: bool = True, trailing_space: bool = False):
+        self.words: Tuple[str, ...] = tuple(words)
+        keys = sorted(self.words, key=lambda x: -len(x)) if longest_first else self.words
+        tail = r"\s*" if trailing_space else ""
+        self._pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in keys) + r")\b" + tail, flags=re.IGNORECASE)
+
+    def sub(self, text: str) -> str:
+        return self._pattern.sub("", text)
+
+
+# Matchers by table content, so equal tables share one compiled pattern
+# however they are passed in. LRU-bounded: callers building throwaway
+# tables cannot grow it without limit.
+MATCHER_CACHE_SIZE = 256
+_MATCHERS = TransformCache(max_size=MATCHER_CACHE_SIZE)
+
+
+def _memoized(key: Hashable, build: Callable[[], object]):
+    matcher = _MATCHERS.get(key)
+    if matcher is None:
+        matcher = build()
+        _MATCHERS.put(key, matcher)
+    return matcher
+
+
+def mapping_matcher(mapping: Mapping[str, str]) -> MappingMatcher:
+    return _memoized(("mapping", tuple(mapping.items())), lambda: MappingMatcher(mapping))
+
+
+def word_remover(words: Iterable[str]) -> WordRemover:
+    words = tuple(words)
+    return _memoized(("remove", words), lambda: WordRemover(words))
+
+
+def intensifier_reducer(intensifiers: Iterable[str]) -> WordRemover:
+    words = tuple(intensifiers)
+    return _memoized(("reduce", words), lambda: WordRemover(words, longest_first=False, trailing_space=True))
+
+
+# -----------------------------------------
+# Helpers (thin wrappers over the matchers above)
+# -----------------------------------------
+def apply_mapping(text: str, mapping: Dict[str, str]) -> str:
+    """
+    Apply simple token/phrase mapping. Lowercase-aware but preserves case of first char if needed.
+    """
+    if not mapping:
+        return text
+    return mapping_matcher(mapping).sub(text)
+
+_sentence_end_re = re.compile(r"[.!?]\s*$")
+_sentence_split_re = re.compile(r"([.!?]\s+)")
 
 def simple_sentence_split_and_capitalize(text: str) -> str:
     """
@@ -68,10 +121,10 @@ def simple_sentence_split_and_capitalize(text: str) -> str:
     if not text:
         return text
     # Ensure punctuation at sentence ends: if long chunk with no punctuation, add a '.' 
-    if len(text) > 40 and not re.search(r"[.!?]\s*$", text):
+    if len(text) > 40 and not _sentence_end_re.search(text):
         text = text + "."
     # Split on sentence terminators, preserve terminator
-    parts = re.split(r'([.!?]\s+)', text)
+    parts = _sentence_split_re.split(text)
     out = []
     for i in range(0, len(parts), 2):
         sent = parts[i]
@@ -91,19 +144,19 @@ def remove_words(text: str, words):
     """
     if not words:
         return text
-    keys = sorted(words, key=lambda x: -len(x))
-    pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in keys) + r")\b", flags=re.IGNORECASE)
-    return pattern.sub("", text)
+    return word_remover(words).sub(text)
 
 def reduce_intensifiers(text: str, intensifiers):
     if not intensifiers:
         return text
-    pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in intensifiers) + r")\b\s*", flags=re.IGNORECASE)
-    return pattern.sub("", text)
+    return intensifier_reducer(intensifiers).sub(text)
+
+_blanks_re = re.compile(r"[ \t]+")
+_dots_re = re.compile(r"[.]{2,}")
 
 def safe_strip_punctuation(text: str) -> str:
     # collapse multiple punctuation, trim leading/trailing punctuation
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"[.]{2,}", ".", text)
+    text = _blanks_re.sub(" ", text)
+    text = _dots_re.sub(".", text)
     text = text.strip()
     return text